@@ -1,13 +1,19 @@
 """Flask application initialization."""
 
+import os
+
 from flask import Flask
 from flask_cors import CORS
 
 def create_app():
     """Create and configure the Flask application."""
     app = Flask(__name__)
-    CORS(app)
-    
+    CORS(app, expose_headers=['Server-Timing', 'X-Columns', 'X-Row-Count'])
+    # Opt-in per-request sampling profiler (?profile=1)
+    app.config['PROFILING'] = os.environ.get('API_PROFILING') == '1'
+
+    from . import instrumentation
+    instrumentation.init_app(app)
 
     # Register blueprints
     from .routes import api_bp
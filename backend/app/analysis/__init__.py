@@ -0,0 +1,53 @@
+"""Statistical engines shared by the API and the analysis scripts."""
+
+from .changepoint import (
+    NIGPrior,
+    ChangePointPosterior,
+    fit_single_changepoint,
+    summary_table,
+    impact_table,
+)
+from .bocpd import OnlineChangepointDetector
+from .diagnostics import trace_summary
+from .event_study import event_window_impact
+from .intervals import IntervalIndex
+from .posterior import PosteriorSummary, summarize
+from .rolling import RollingWindow
+from .sampling import GibbsChangepointSampler, SamplerConfig, run_chains
+from .sweep import SweepConfig, expand_grid, run_sweep
+from .volatility import GarchModel, KalmanVolatility
+from .segmentation import (
+    Segmentation,
+    pelt,
+    binary_segmentation,
+    crops,
+    segment_table,
+)
+
+__all__ = [
+    'NIGPrior',
+    'ChangePointPosterior',
+    'fit_single_changepoint',
+    'summary_table',
+    'impact_table',
+    'OnlineChangepointDetector',
+    'trace_summary',
+    'event_window_impact',
+    'IntervalIndex',
+    'PosteriorSummary',
+    'summarize',
+    'RollingWindow',
+    'GibbsChangepointSampler',
+    'SamplerConfig',
+    'run_chains',
+    'SweepConfig',
+    'expand_grid',
+    'run_sweep',
+    'GarchModel',
+    'KalmanVolatility',
+    'Segmentation',
+    'pelt',
+    'binary_segmentation',
+    'crops',
+    'segment_table',
+]
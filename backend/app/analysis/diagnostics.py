@@ -0,0 +1,165 @@
+"""
+Convergence diagnostics for multi-chain MCMC output.
+
+Implements split R-hat and the autocorrelation-based effective sample size
+(Gelman et al., BDA3, ch. 11) directly on (chains, draws) arrays, so traces
+from the chunked sampler can be summarized without ArviZ. Both accept
+leading batch axes, so all parameters of a trace are diagnosed in one
+vectorized pass over their stacked (variables, chains, draws) array.
+"""
+
+from typing import Dict, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _split(chains: np.ndarray) -> np.ndarray:
+    """Splits each chain in half so within-chain trends inflate R-hat."""
+    half = chains.shape[-1] // 2
+    return np.concatenate([chains[..., :half], chains[..., -half:]], axis=-2)
+
+
+def split_rhat(chains: np.ndarray) -> Union[float, np.ndarray]:
+    """
+    Potential scale reduction factor over split chains.
+
+    Args:
+        chains: Array of shape (chains, draws), or (..., chains, draws) to
+            compute one value per leading index.
+
+    Returns:
+        R-hat; values near 1 indicate the chains agree.
+    """
+    chains = _split(np.asarray(chains, dtype=np.float64))
+    n = chains.shape[-1]
+    within = chains.var(axis=-1, ddof=1).mean(axis=-1)
+    between = n * chains.mean(axis=-1).var(axis=-1, ddof=1)
+    var_plus = (n - 1) / n * within + between / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rhat = np.sqrt(var_plus / within)
+    rhat = np.where(within == 0, np.where(between == 0, 1.0, np.inf), rhat)
+    return float(rhat) if rhat.ndim == 0 else rhat
+
+
+def effective_sample_size(chains: np.ndarray) -> Union[float, np.ndarray]:
+    """
+    Effective sample size from the combined chain autocorrelation.
+
+    Autocorrelations come from one FFT over all chains (and leading axes)
+    and are summed in pairs until the first negative pair (Geyer's initial
+    positive sequence).
+
+    Args:
+        chains: Array of shape (chains, draws), or (..., chains, draws) to
+            compute one value per leading index.
+
+    Returns:
+        Estimated number of independent draws.
+    """
+    chains = _split(np.asarray(chains, dtype=np.float64))
+    m, n = chains.shape[-2:]
+    centred = chains - chains.mean(axis=-1, keepdims=True)
+    spectrum = np.fft.rfft(centred, n=2 * n, axis=-1)
+    acov = np.fft.irfft(spectrum * np.conj(spectrum), axis=-1)[..., :n] / n
+    within = (acov[..., 0] * n / (n - 1)).mean(axis=-1)
+    var_plus = within * (n - 1) / n + chains.mean(axis=-1).var(axis=-1, ddof=1)
+    constant = var_plus == 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rho = 1.0 - (within[..., None] - acov.mean(axis=-2)) / var_plus[..., None]
+    rho[..., 0] = 1.0
+    pairs = rho[..., :n - n % 2:2] + rho[..., 1:n - n % 2:2]
+    # Keep the pairs before the first negative one, monotonically decreasing
+    positive = np.logical_and.accumulate(pairs >= 0, axis=-1)
+    pairs = np.where(positive, np.minimum.accumulate(np.where(positive, pairs, np.inf), axis=-1), 0.0)
+    tau = np.maximum(-1.0 + 2.0 * pairs.sum(axis=-1), 1.0 / np.log10(m * n))
+    ess = np.where(constant, float(m * n), m * n / np.where(constant, 1.0, tau))
+    return float(ess) if ess.ndim == 0 else ess
+
+
+def sorted_quantiles(sorted_draws: np.ndarray, q: Sequence[float]) -> np.ndarray:
+    """
+    Linear-interpolated quantiles (as np.quantile) of already sorted rows.
+
+    Args:
+        sorted_draws: Array of shape (variables, draws), sorted along axis 1.
+        q: Probabilities.
+
+    Returns:
+        Array of shape (variables, len(q)).
+    """
+    n = sorted_draws.shape[1]
+    position = np.asarray(q, dtype=np.float64) * (n - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, n - 1)
+    frac = position - lower
+    return sorted_draws[:, lower] + frac * (sorted_draws[:, upper] - sorted_draws[:, lower])
+
+
+def sorted_hdi(sorted_draws: np.ndarray, prob: float = 0.94) -> np.ndarray:
+    """
+    Highest-density intervals (as changepoint.hdi) of already sorted rows.
+
+    Returns:
+        Array of shape (variables, 2) with the lower and upper bounds.
+    """
+    n = sorted_draws.shape[1]
+    width = int(np.floor(prob * n))
+    if width < 1 or width >= n:
+        return sorted_draws[:, [0, -1]]
+    start = (sorted_draws[:, width:] - sorted_draws[:, :n - width]).argmin(axis=1)
+    rows = np.arange(len(sorted_draws))
+    return np.stack([sorted_draws[rows, start], sorted_draws[rows, start + width]], axis=1)
+
+
+def summary_frame(stacked: np.ndarray, sorted_draws: np.ndarray, var_names: Sequence[str],
+                  prob: float = 0.94) -> pd.DataFrame:
+    """
+    Builds the az.summary table for all variables at once.
+
+    Args:
+        stacked: Draws of shape (variables, chains, draws).
+        sorted_draws: The same draws flattened per variable and sorted,
+            shape (variables, chains * draws); shared with other summaries.
+        var_names: Row labels, in the order of the leading axis.
+        prob: HDI probability mass.
+
+    Returns:
+        DataFrame indexed by parameter name.
+    """
+    flat = stacked.reshape(len(stacked), -1)
+    sd = flat.std(axis=1, ddof=1)
+    ess_bulk = effective_sample_size(stacked)
+    # Tail ESS: the worse of the 5% and 95% quantile indicators
+    q05, q95 = sorted_quantiles(sorted_draws, [0.05, 0.95]).T
+    tails = np.concatenate([stacked <= q05[:, None, None], stacked >= q95[:, None, None]])
+    ess_tail = effective_sample_size(tails).reshape(2, -1).min(axis=0)
+    bounds = sorted_hdi(sorted_draws, prob)
+    tail = 100 * (1 - prob) / 2
+    return pd.DataFrame({
+        'mean': flat.mean(axis=1),
+        'sd': sd,
+        f'hdi_{tail:g}%': bounds[:, 0],
+        f'hdi_{100 - tail:g}%': bounds[:, 1],
+        'mcse_mean': sd / np.sqrt(ess_bulk),
+        'mcse_sd': sd / np.sqrt(2 * np.maximum(ess_bulk - 1, 1)),
+        'ess_bulk': ess_bulk,
+        'ess_tail': ess_tail,
+        'r_hat': split_rhat(stacked),
+    }, index=list(var_names)).round(3)
+
+
+def trace_summary(draws: Dict[str, np.ndarray], var_names: Sequence[str]) -> pd.DataFrame:
+    """
+    Summarizes sampled parameters in the layout of az.summary.
+
+    Args:
+        draws: Parameter name to (chains, draws) array.
+        var_names: Parameters to report, in row order.
+
+    Returns:
+        DataFrame indexed by parameter name.
+    """
+    stacked = np.stack([np.asarray(draws[name], dtype=np.float64) for name in var_names])
+    return summary_frame(stacked, np.sort(stacked.reshape(len(stacked), -1), axis=1), var_names)
@@ -0,0 +1,103 @@
+"""
+Batch event study of geopolitical events on daily log returns.
+
+For every event and every window size at once, compares the `w` trading
+days before the event with the `w` trading days from the event on, and
+measures the abnormal return over the post-event window against a
+constant-mean model fitted on an estimation window that ends where the
+pre-event window starts:
+
+    ... [ estimation (L days) ][ pre (w) ] E [ post (w) ] ...
+
+Event positions come from one searchsorted over the sorted dates and all
+window statistics from prefix sums, broadcast over (events x windows).
+"""
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+# Window sizes in trading days: about a week, a month and a quarter
+DEFAULT_WINDOWS = (5, 20, 60)
+# Trading days used to estimate normal returns (about one year)
+DEFAULT_ESTIMATION_DAYS = 250
+
+
+def _window_stats(s1: np.ndarray, s2: np.ndarray, start: np.ndarray, end: np.ndarray):
+    """Count, sum, mean and sample std of x[start:end] from prefix sums (NaN if < 2 points)."""
+    n = (end - start).astype(np.float64)
+    total = s1[end] - s1[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(n > 0, total / n, np.nan)
+        var = np.where(n > 1, (s2[end] - s2[start] - n * mean * mean) / (n - 1), np.nan)
+    return n, total, mean, np.sqrt(np.maximum(var, 0.0))
+
+
+def event_window_impact(dates: Sequence, log_returns: Sequence[float], events: pd.DataFrame,
+                        windows: Sequence[int] = DEFAULT_WINDOWS,
+                        estimation_days: int = DEFAULT_ESTIMATION_DAYS) -> pd.DataFrame:
+    """
+    Computes pre/post window statistics and abnormal returns for every event.
+
+    Args:
+        dates: Sorted dates of the return series.
+        log_returns: Daily log returns aligned with `dates`.
+        events: Frame with at least 'Date' and 'Event' columns ('Category' is kept if present).
+        windows: Window sizes in trading days.
+        estimation_days: Length of the estimation window for normal returns.
+
+    Returns:
+        DataFrame with one row per (event, window). Windows cut short by the
+        ends of the series use the available days; statistics that need at
+        least two observations are NaN otherwise.
+    """
+    day_index = np.asarray(dates).astype('datetime64[D]')
+    x = np.asarray(log_returns, dtype=np.float64)
+    n_obs = len(x)
+    s1 = np.concatenate([[0.0], np.cumsum(x)])
+    s2 = np.concatenate([[0.0], np.cumsum(x * x)])
+
+    event_dates = pd.to_datetime(events['Date']).to_numpy().astype('datetime64[D]')
+    # First trading day on or after each event
+    position = np.searchsorted(day_index, event_dates, side='left')[:, None]
+    w = np.asarray(windows, dtype=np.int64)[None, :]
+
+    pre_start = np.clip(position - w, 0, n_obs)
+    post_end = np.clip(position + w, 0, n_obs)
+    est_start = np.clip(pre_start - estimation_days, 0, n_obs)
+    pre_n, _, pre_mean, pre_vol = _window_stats(s1, s2, pre_start, position)
+    post_n, post_sum, post_mean, post_vol = _window_stats(s1, s2, position, post_end)
+    _, _, est_mean, est_vol = _window_stats(s1, s2, est_start, pre_start)
+
+    # Cumulative abnormal return over the post window and its t-statistic
+    car = post_sum - post_n * est_mean
+    with np.errstate(invalid='ignore', divide='ignore'):
+        car_t = car / (est_vol * np.sqrt(post_n))
+        vol_change = (post_vol - pre_vol) / pre_vol * 100
+
+    n_events, n_windows = len(events), w.shape[1]
+    table = pd.DataFrame({
+        'Event': np.repeat(events['Event'].to_numpy(), n_windows),
+        'Date': np.repeat(pd.to_datetime(events['Date']).dt.strftime('%Y-%m-%d').to_numpy(), n_windows),
+    })
+    if 'Category' in events:
+        table['Category'] = np.repeat(events['Category'].to_numpy(), n_windows)
+    columns = {
+        'Window': np.broadcast_to(w, (n_events, n_windows)),
+        'Pre Observations': pre_n,
+        'Post Observations': post_n,
+        'Pre Mean Return': pre_mean,
+        'Post Mean Return': post_mean,
+        'Mean Change': post_mean - pre_mean,
+        'Pre Volatility': pre_vol,
+        'Post Volatility': post_vol,
+        'Volatility Change (%)': vol_change,
+        'CAR': car,
+        'CAR t-stat': car_t,
+    }
+    for name, values in columns.items():
+        table[name] = np.asarray(values).ravel()
+    table[['Window', 'Pre Observations', 'Post Observations']] = \
+        table[['Window', 'Pre Observations', 'Post Observations']].astype(np.int64)
+    return table
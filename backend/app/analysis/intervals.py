@@ -0,0 +1,70 @@
+"""
+Sorted-interval index for joining dated points (events) to intervals
+(change point credible intervals).
+
+Intervals are sorted by start, with a running maximum of their ends. For a
+query [lo, hi] every candidate lies between two binary searches: intervals
+after the first whose running max end reaches lo, up to the last one that
+starts by hi. Queries for all points are answered together, so a join of m
+points against n intervals costs O((n + m) log n) plus the size of the
+output when the intervals do not nest (as for successive breaks).
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+class IntervalIndex:
+    """
+    Static index over closed intervals [start, end].
+
+    Args:
+        starts: Interval starts (any orderable numeric type, e.g. epoch days).
+        ends: Interval ends, aligned with `starts`.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray) -> None:
+        starts = np.asarray(starts)
+        ends = np.asarray(ends)
+        if starts.shape != ends.shape:
+            raise ValueError("starts and ends must have the same length")
+        if np.any(ends < starts):
+            raise ValueError("Every interval needs start <= end")
+        self.order = np.argsort(starts, kind='stable')
+        self.starts = starts[self.order]
+        self.ends = ends[self.order]
+        self.max_end = np.maximum.accumulate(self.ends) if len(ends) else self.ends
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def query(self, lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds every (query, interval) pair that overlaps.
+
+        Args:
+            lo: Query starts.
+            hi: Query ends (a point query has lo == hi).
+
+        Returns:
+            (query_positions, interval_positions), where interval positions
+            refer to the order the intervals were given in.
+        """
+        lo = np.asarray(lo)
+        hi = np.asarray(hi)
+        # Intervals before `first` all end before lo; those from `last` on start after hi
+        first = np.searchsorted(self.max_end, lo, side='left')
+        last = np.searchsorted(self.starts, hi, side='right')
+        counts = np.maximum(last - first, 0)
+        query_pos = np.repeat(np.arange(len(lo)), counts)
+        # Candidate offsets first[q] + 0..counts[q]-1 for each query q
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidate = np.repeat(first, counts) + offsets
+        overlaps = self.ends[candidate] >= lo[query_pos]
+        return query_pos[overlaps], self.order[candidate[overlaps]]
+
+    def stab(self, points: np.ndarray, window: float = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """Pairs each point with the intervals within `window` of it."""
+        points = np.asarray(points)
+        return self.query(points - window, points + window)
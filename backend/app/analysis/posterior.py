@@ -0,0 +1,165 @@
+"""
+One-pass summaries of change point posterior draws.
+
+summarize() stacks every parameter's draws into one (variables, chains,
+draws) array, sorts it once and derives everything the scripts, reports
+and API show from that: the az.summary table (mean, HDI, ESS, R-hat), the
+mode and 95% interval of tau, P(mean increased) and the distributions of
+the mean and volatility changes, with histograms ready for plotting. The
+result is plain data, so it can be saved next to the trace (see
+app.trace.cached_summary) and reused instead of recomputed.
+"""
+
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .diagnostics import sorted_hdi, sorted_quantiles, summary_frame
+
+# Parameters of the single change point model; the derived quantities need all of them
+CHANGEPOINT_VARS = ('tau', 'mu_before', 'mu_after', 'sigma_before', 'sigma_after')
+
+# Quantiles reported for the derived change distributions
+CHANGE_QUANTILES = (0.025, 0.5, 0.975)
+
+
+def histogram(values: np.ndarray, bins: int) -> Dict[str, List[float]]:
+    """Histogram of all draws; integer-valued variables get one bin per value when that is fewer."""
+    flat = np.asarray(values).ravel()
+    lo, hi = float(flat.min()), float(flat.max())
+    if np.all(flat == np.round(flat)) and hi - lo + 1 <= bins:
+        edges = np.arange(lo - 0.5, hi + 1.5)
+    else:
+        edges = np.histogram_bin_edges(flat, bins=bins)
+    counts, edges = np.histogram(flat, bins=edges)
+    return {'edges': edges.tolist(), 'counts': counts.tolist()}
+
+
+@dataclass
+class PosteriorSummary:
+    """
+    Everything reported about a posterior, computed together by summarize().
+
+    Attributes:
+        table: az.summary layout, indexed by parameter.
+        chains, draws: Shape of the summarized draws.
+        prob: HDI probability mass of the table.
+        means: Unrounded posterior mean per parameter.
+        histograms: Parameter (or 'mean_change', 'volatility_change_pct')
+            to histogram edges and counts.
+        tau_mode: Most frequent change point index.
+        tau_interval: Equal-tailed 95% interval of tau, as indices.
+        prob_increase: P(mu_after > mu_before).
+        mean_change: mu_after - mu_before: mean, sd, quantiles and HDI.
+        volatility_change_pct: (sigma_after / sigma_before - 1) * 100:
+            mean, sd, quantiles and HDI.
+    """
+    table: pd.DataFrame
+    chains: int
+    draws: int
+    prob: float
+    means: Dict[str, float] = field(default_factory=dict)
+    histograms: Dict[str, Dict[str, List[float]]] = field(default_factory=dict)
+    tau_mode: Optional[int] = None
+    tau_interval: Optional[List[int]] = None
+    prob_increase: Optional[float] = None
+    mean_change: Optional[Dict[str, float]] = None
+    volatility_change_pct: Optional[Dict[str, float]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready form; the table becomes records with a 'parameter' column, non-finite values None."""
+        data = asdict(self)
+        table = self.table.astype(object).where(np.isfinite(self.table), None)
+        data['table'] = table.rename_axis('parameter').reset_index().to_dict(orient='records')
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> 'PosteriorSummary':
+        """Inverse of to_dict(); keys that are not fields are ignored."""
+        data = {key: data[key] for key in cls.__dataclass_fields__}
+        data['table'] = pd.DataFrame.from_records(data['table']).set_index('parameter').rename_axis(None)
+        return cls(**data)
+
+    def save(self, path: str, **extra: Any) -> None:
+        """Writes the summary as JSON (atomically), with any `extra` top-level keys."""
+        # A temporary file of its own per writer, so concurrent saves cannot interleave
+        with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(path) or '.', prefix=os.path.basename(path),
+                                         suffix='.tmp', delete=False) as f:
+            try:
+                json.dump(dict(self.to_dict(), **extra), f)
+            except BaseException:
+                f.close()
+                os.remove(f.name)
+                raise
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'PosteriorSummary':
+        """Reads a summary written by save(), ignoring extra keys."""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def _distribution(values: np.ndarray, sorted_values: np.ndarray, prob: float) -> Dict[str, float]:
+    """Mean, sd, CHANGE_QUANTILES and HDI of one derived quantity."""
+    quantiles = sorted_quantiles(sorted_values[None], CHANGE_QUANTILES)[0]
+    lower, upper = sorted_hdi(sorted_values[None], prob)[0]
+    summary = {'mean': float(values.mean()), 'sd': float(values.std(ddof=1))}
+    summary.update({f'q{100 * q:g}': float(v) for q, v in zip(CHANGE_QUANTILES, quantiles)})
+    summary.update(hdi_lower=float(lower), hdi_upper=float(upper))
+    return summary
+
+
+def summarize(draws: Mapping[str, np.ndarray], var_names: Optional[Sequence[str]] = None,
+              prob: float = 0.94, bins: int = 50) -> PosteriorSummary:
+    """
+    Summarizes posterior draws in one pass over their stacked array.
+
+    Args:
+        draws: Parameter name to (chains, draws) array; all the same shape.
+        var_names: Parameters to summarize, in row order (default: all).
+        prob: HDI probability mass of the table.
+        bins: Maximum histogram bins per parameter.
+
+    Returns:
+        PosteriorSummary; the change point fields are set when every
+        parameter in CHANGEPOINT_VARS is summarized.
+    """
+    names = list(var_names or draws)
+    stacked = np.stack([np.asarray(draws[name], dtype=np.float64) for name in names])
+    if stacked.ndim != 3:
+        raise ValueError("draws must be (chains, draws) arrays")
+    flat = stacked.reshape(len(names), -1)
+    sorted_draws = np.sort(flat, axis=1)
+    row = {name: i for i, name in enumerate(names)}
+
+    summary = PosteriorSummary(
+        table=summary_frame(stacked, sorted_draws, names, prob),
+        chains=stacked.shape[1],
+        draws=stacked.shape[2],
+        prob=prob,
+        means={name: float(mean) for name, mean in zip(names, flat.mean(axis=1))},
+        histograms={name: histogram(sorted_draws[row[name]], bins) for name in names},
+    )
+    if not set(CHANGEPOINT_VARS) <= set(names):
+        return summary
+
+    tau = flat[row['tau']].astype(np.int64)
+    summary.tau_mode = int(np.bincount(tau - tau.min()).argmax() + tau.min())
+    summary.tau_interval = [int(q) for q in sorted_quantiles(sorted_draws[[row['tau']]], [0.025, 0.975])[0]]
+
+    mu_before, mu_after = flat[row['mu_before']], flat[row['mu_after']]
+    sigma_before, sigma_after = flat[row['sigma_before']], flat[row['sigma_after']]
+    changes = np.stack([mu_after - mu_before, (sigma_after - sigma_before) / sigma_before * 100])
+    sorted_changes = np.sort(changes, axis=1)
+    summary.prob_increase = float((changes[0] > 0).mean())
+    summary.mean_change = _distribution(changes[0], sorted_changes[0], prob)
+    summary.volatility_change_pct = _distribution(changes[1], sorted_changes[1], prob)
+    summary.histograms['mean_change'] = histogram(sorted_changes[0], bins)
+    summary.histograms['volatility_change_pct'] = histogram(sorted_changes[1], bins)
+    return summary
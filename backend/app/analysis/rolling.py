@@ -0,0 +1,144 @@
+"""
+Rolling-window statistics with O(1) updates.
+
+RollingWindow fills a whole history in one vectorized pass (prefix sums for
+the window mean and variance, a linear filter for the exponentially
+weighted moments) and leaves behind running state: a ring buffer of the
+last `window` values with their mean and sum of squared deviations
+(sliding Welford), plus the EWMA mean and variance. Each appended value
+then updates every statistic in constant time.
+
+Conventions match pandas: rolling std uses ddof=1 and is NaN until a full
+window is available; the EWMA is ewm(span=span, adjust=False).mean(). The
+exponentially weighted variance is the incremental form of West (1979) /
+Finch (2009), starting from zero.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from scipy.signal import lfilter
+
+ROLLING_STATS = ('mean', 'std', 'ewma', 'ewm_std')
+# Longest window accepted; the ring buffer holds `window` float64 values
+MAX_WINDOW = 100_000
+
+
+class RollingWindow:
+    """
+    Running rolling statistics for one series.
+
+    Args:
+        window: Number of observations in the rolling mean and std.
+        span: EWMA span; alpha = 2 / (span + 1). Defaults to `window`.
+    """
+
+    def __init__(self, window: int, span: Optional[int] = None) -> None:
+        if not 2 <= window <= MAX_WINDOW:
+            raise ValueError(f"window must be between 2 and {MAX_WINDOW}")
+        self.window = window
+        self.span = span or window
+        self.alpha = 2.0 / (self.span + 1)
+        self._reset()
+
+    def _reset(self) -> None:
+        self.buffer = np.zeros(self.window)
+        self.pos = 0          # next slot to overwrite, i.e. the oldest value once full
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0         # sum of squared deviations from the window mean
+        self.ewma = np.nan
+        self.ewm_var = 0.0
+
+    def current(self) -> Dict[str, float]:
+        """Statistics after the most recent value."""
+        full = self.count == self.window
+        return {
+            'mean': self.mean if full else np.nan,
+            'std': float(np.sqrt(max(self.m2, 0.0) / (self.window - 1))) if full else np.nan,
+            'ewma': self.ewma,
+            'ewm_std': float(np.sqrt(self.ewm_var)),
+        }
+
+    def fill(self, values: Sequence[float]) -> Dict[str, np.ndarray]:
+        """
+        Computes every statistic over a full history and resets the state to its end.
+
+        Args:
+            values: Observations in time order.
+
+        Returns:
+            Dict of ROLLING_STATS arrays aligned with `values`.
+        """
+        x = np.asarray(values, dtype=np.float64)
+        n, w, a = len(x), self.window, self.alpha
+        self._reset()
+        if n == 0:
+            return {name: np.empty(0) for name in ROLLING_STATS}
+
+        # Window moments from prefix sums, shifted by x[0] for conditioning
+        shifted = x - x[0]
+        s1 = np.concatenate([[0.0], np.cumsum(shifted)])
+        s2 = np.concatenate([[0.0], np.cumsum(shifted * shifted)])
+        mean = np.full(n, np.nan)
+        std = np.full(n, np.nan)
+        if n >= w:
+            win_sum = s1[w:] - s1[:-w]
+            win_mean = win_sum / w
+            mean[w - 1:] = win_mean + x[0]
+            std[w - 1:] = np.sqrt(np.maximum(s2[w:] - s2[:-w] - win_sum * win_mean, 0.0) / (w - 1))
+
+        # m_t = a x_t + (1 - a) m_{t-1} with m_0 = x_0
+        ewma = np.empty(n)
+        ewma[0] = x[0]
+        ewma[1:] = lfilter([a], [1.0, a - 1.0], x[1:], zi=[(1.0 - a) * x[0]])[0]
+        # s_t = (1 - a) (s_{t-1} + a d_t^2), d_t = x_t - m_{t-1}, s_0 = 0
+        ewm_var = np.zeros(n)
+        d = x[1:] - ewma[:-1]
+        ewm_var[1:] = lfilter([(1.0 - a) * a], [1.0, a - 1.0], d * d)
+
+        # Running state at the end of the history
+        tail = x[-w:]
+        self.count = len(tail)
+        self.buffer[:self.count] = tail
+        self.pos = self.count % w
+        self.mean = float(tail.mean())
+        self.m2 = float(np.sum((tail - self.mean) ** 2))
+        self.ewma, self.ewm_var = float(ewma[-1]), float(ewm_var[-1])
+        return {'mean': mean, 'std': std, 'ewma': ewma, 'ewm_std': np.sqrt(ewm_var)}
+
+    def update(self, value: float) -> Dict[str, float]:
+        """
+        Absorbs one new observation in O(1).
+
+        Returns:
+            Statistics including the new value.
+        """
+        x = float(value)
+        if self.count < self.window:
+            # Growing window: plain Welford
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+        else:
+            # Full window: the new value replaces the oldest
+            old = self.buffer[self.pos]
+            old_mean = self.mean
+            self.mean += (x - old) / self.window
+            self.m2 += (x - old) * (x - self.mean + old - old_mean)
+        self.buffer[self.pos] = x
+        self.pos = (self.pos + 1) % self.window
+
+        if np.isnan(self.ewma):
+            self.ewma = x
+        else:
+            d = x - self.ewma
+            self.ewma += self.alpha * d
+            self.ewm_var = (1.0 - self.alpha) * (self.ewm_var + self.alpha * d * d)
+        return self.current()
+
+    def extend(self, values: Sequence[float]) -> Dict[str, np.ndarray]:
+        """Applies update() to each value; returns the statistics as arrays."""
+        rows = [self.update(v) for v in np.asarray(values, dtype=np.float64)]
+        return {name: np.array([row[name] for row in rows], dtype=np.float64) for name in ROLLING_STATS}
@@ -0,0 +1,271 @@
+"""
+Multiple change point detection for changes in mean and volatility.
+
+Segments are scored with the Gaussian cost -2 log L evaluated at the
+segment's own mean and variance. Costs of arbitrary segments come from
+prefix sums of x and x^2, so every candidate split at a given time is
+scored in one vectorized expression.
+
+PELT (Killick et al., 2012) finds the exact penalized optimum and prunes
+candidates that can never be optimal again, which keeps the search close
+to linear in the series length. CROPS (Haynes et al., 2017) reuses PELT to
+recover every optimal segmentation over a range of penalties, so analysts
+can sweep the number of breaks instead of guessing one penalty.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Variance floor that keeps the cost finite on flat segments
+MIN_VARIANCE = 1e-12
+
+
+class SegmentCost:
+    """Gaussian mean/variance segment cost backed by prefix sums."""
+
+    def __init__(self, x: Sequence[float]) -> None:
+        x = np.asarray(x, dtype=np.float64)
+        # Centering keeps the sum-of-squares identity well conditioned
+        x = x - x.mean()
+        self.n = len(x)
+        self.s1 = np.concatenate([[0.0], np.cumsum(x)])
+        self.s2 = np.concatenate([[0.0], np.cumsum(x * x)])
+
+    def __call__(self, start, end):
+        """
+        Cost of x[start:end]; `start` and `end` may be arrays.
+
+        Returns:
+            n * (log(2 pi var) + 1), i.e. -2 log L at the segment MLE.
+        """
+        n = end - start
+        mean = (self.s1[end] - self.s1[start]) / n
+        var = np.maximum((self.s2[end] - self.s2[start]) / n - mean * mean, MIN_VARIANCE)
+        return n * (np.log(2.0 * np.pi * var) + 1.0)
+
+
+@dataclass(frozen=True)
+class Segmentation:
+    """
+    Optimal segmentation for one penalty.
+
+    Attributes:
+        changepoints: Sorted start indices of every segment after the first.
+        penalty: Penalty per change point.
+        cost: Unpenalized total cost of the segments.
+    """
+    changepoints: List[int]
+    penalty: float
+    cost: float
+
+    @property
+    def n_changepoints(self) -> int:
+        return len(self.changepoints)
+
+
+def default_penalty(n: int) -> float:
+    """BIC penalty: mean, variance and location for each new segment."""
+    return 3.0 * np.log(n)
+
+
+def _backtrack(last: np.ndarray, n: int) -> List[int]:
+    """Recovers change points from the last-split array."""
+    changepoints = []
+    t = n
+    while t > 0:
+        s = int(last[t])
+        if s > 0:
+            changepoints.append(s)
+        t = s
+    return changepoints[::-1]
+
+
+def pelt(x: Sequence[float], penalty: Optional[float] = None, min_size: int = 5,
+         cost: Optional[SegmentCost] = None) -> Segmentation:
+    """
+    Finds the exact penalized optimal segmentation with PELT.
+
+    Args:
+        x: Observations in time order (e.g. daily log returns).
+        penalty: Cost added per change point; defaults to default_penalty(n).
+        min_size: Minimum number of observations per segment (>= 2).
+        cost: Precomputed SegmentCost for `x`, to share across runs.
+
+    Returns:
+        Segmentation with the optimal change points.
+    """
+    cost = cost or SegmentCost(x)
+    n = cost.n
+    if min_size < 2:
+        raise ValueError("min_size must be at least 2")
+    if n < 2 * min_size:
+        return Segmentation([], float(penalty or 0.0), float(cost(0, n)) if n else 0.0)
+    if penalty is None:
+        penalty = default_penalty(n)
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    last = np.zeros(n + 1, dtype=np.int64)
+    candidates = np.array([0], dtype=np.int64)
+    # Candidates found worse than the optimum at t, dropped once t can end a segment
+    pending: Dict[int, np.ndarray] = {}
+
+    for t in range(min_size, n + 1):
+        s_new = t - min_size
+        if s_new >= min_size:
+            candidates = np.append(candidates, s_new)
+        dropped = pending.pop(s_new, None)
+        if dropped is not None and len(dropped):
+            candidates = candidates[~np.isin(candidates, dropped)]
+        values = best[candidates] + cost(candidates, t)
+        i = int(values.argmin())
+        best[t] = values[i] + penalty
+        last[t] = candidates[i]
+        # A candidate worse than the optimum at t loses to a change at t for every
+        # later end, but only from t + min_size on, when t may be the last change
+        pending[t] = candidates[values > best[t]]
+
+    changepoints = _backtrack(last, n)
+    bounds = np.array([0] + changepoints + [n])
+    total = float(cost(bounds[:-1], bounds[1:]).sum())
+    return Segmentation(changepoints, float(penalty), total)
+
+
+def binary_segmentation(x: Sequence[float], penalty: Optional[float] = None, min_size: int = 5,
+                        max_changepoints: Optional[int] = None) -> Segmentation:
+    """
+    Approximate segmentation by greedy binary splitting.
+
+    Each step splits the segment whose best split lowers the cost the most,
+    and stops when no split gains more than the penalty. Much cheaper than
+    PELT for a handful of breaks on very long series, but not exact.
+
+    Args:
+        x: Observations in time order.
+        penalty: Minimum cost reduction for a split; defaults to default_penalty(n).
+        min_size: Minimum number of observations per segment.
+        max_changepoints: Optional cap on the number of splits.
+
+    Returns:
+        Segmentation with the selected change points.
+    """
+    cost = SegmentCost(x)
+    n = cost.n
+    if penalty is None:
+        penalty = default_penalty(n)
+
+    def best_split(start: int, end: int):
+        splits = np.arange(start + min_size, end - min_size + 1)
+        if len(splits) == 0:
+            return 0.0, None
+        gains = cost(start, end) - cost(start, splits) - cost(splits, end)
+        i = int(gains.argmax())
+        return float(gains[i]), int(splits[i])
+
+    segments = {(0, n): best_split(0, n)}
+    changepoints: List[int] = []
+    while max_changepoints is None or len(changepoints) < max_changepoints:
+        (start, end), (gain, split) = max(segments.items(), key=lambda item: item[1][0])
+        if split is None or gain <= penalty:
+            break
+        del segments[(start, end)]
+        changepoints.append(split)
+        segments[(start, split)] = best_split(start, split)
+        segments[(split, end)] = best_split(split, end)
+
+    changepoints.sort()
+    bounds = np.array([0] + changepoints + [n])
+    return Segmentation(changepoints, float(penalty), float(cost(bounds[:-1], bounds[1:]).sum()))
+
+
+def crops(x: Sequence[float], penalty_min: float, penalty_max: float,
+          min_size: int = 5, max_segmentations: Optional[int] = None) -> List[Segmentation]:
+    """
+    Finds every optimal segmentation for penalties in [penalty_min, penalty_max].
+
+    Only O(number of distinct segmentations) PELT runs are needed: the next
+    penalty to try is where the cost lines of two known solutions intersect.
+
+    Args:
+        x: Observations in time order.
+        penalty_min: Smallest penalty of interest (most change points).
+        penalty_max: Largest penalty of interest (fewest change points).
+        min_size: Minimum number of observations per segment.
+        max_segmentations: If given, refuse ranges whose end points differ
+            by more change points than this, before the path is searched
+            (the path has at most one segmentation per count in between,
+            and about twice as many PELT runs).
+
+    Returns:
+        Segmentations ordered by decreasing number of change points.
+
+    Raises:
+        ValueError: If the penalty range is invalid or too wide.
+    """
+    if not 0 < penalty_min <= penalty_max:
+        raise ValueError("Require 0 < penalty_min <= penalty_max")
+    cost = SegmentCost(x)
+    found = {}
+    for penalty in (penalty_min, penalty_max):
+        found[penalty] = pelt(x, penalty, min_size, cost)
+    spread = found[penalty_min].n_changepoints - found[penalty_max].n_changepoints + 1
+    if max_segmentations is not None and spread > max_segmentations:
+        raise ValueError(f"Penalty range spans {found[penalty_max].n_changepoints} to "
+                         f"{found[penalty_min].n_changepoints} change points; narrow it to at most "
+                         f"{max_segmentations} segmentations")
+
+    pending = [(penalty_min, penalty_max)]
+    while pending:
+        low, high = pending.pop()
+        a, b = found[low], found[high]
+        if a.n_changepoints <= b.n_changepoints + 1:
+            continue
+        # Penalty at which both solutions have equal penalized cost
+        penalty = (b.cost - a.cost) / (a.n_changepoints - b.n_changepoints)
+        if penalty in found or not low < penalty < high:
+            continue
+        found[penalty] = pelt(x, penalty, min_size, cost)
+        if found[penalty].n_changepoints != b.n_changepoints:
+            pending.extend([(low, penalty), (penalty, high)])
+
+    # Keep the first (lowest) penalty reaching each number of change points
+    unique = {}
+    for penalty in sorted(found):
+        unique.setdefault(found[penalty].n_changepoints, found[penalty])
+    return [unique[k] for k in sorted(unique, reverse=True)]
+
+
+def segment_table(x: Sequence[float], dates: Sequence, changepoints: Sequence[int]) -> pd.DataFrame:
+    """
+    Per-segment mean return and volatility.
+
+    Args:
+        x: Observations used for the segmentation.
+        dates: Date of each observation.
+        changepoints: Segment start indices, as in Segmentation.changepoints.
+
+    Returns:
+        DataFrame with one row per segment.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    dates = pd.to_datetime(pd.Series(dates)).reset_index(drop=True)
+    bounds = np.array([0] + list(changepoints) + [len(x)])
+    starts, ends = bounds[:-1], bounds[1:]
+    s1 = np.concatenate([[0.0], np.cumsum(x)])
+    s2 = np.concatenate([[0.0], np.cumsum(x * x)])
+    n = ends - starts
+    mean = (s1[ends] - s1[starts]) / n
+    # Sample (ddof=1) variance from the same prefix sums
+    var = np.maximum((s2[ends] - s2[starts]) - n * mean * mean, 0.0) / np.maximum(n - 1, 1)
+    return pd.DataFrame({
+        'Segment': np.arange(1, len(n) + 1),
+        'Start Date': dates[starts].dt.strftime('%Y-%m-%d').values,
+        'End Date': dates[ends - 1].dt.strftime('%Y-%m-%d').values,
+        'Observations': n,
+        'Mean Return': mean,
+        'Volatility': np.sqrt(var),
+        'Annualized Volatility': np.sqrt(var * 252),
+    })
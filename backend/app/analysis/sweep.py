@@ -0,0 +1,225 @@
+"""
+Parallel sensitivity sweeps over change point model configurations.
+
+A sweep is a list of SweepConfig: a model variant, the start date of the
+modeled returns and its prior or penalty settings. expand_grid() builds
+one from a grid of values. run_sweep() fans the configurations out over a
+process pool. The prepared series (one per distinct start date) are sent
+to each worker once when it starts, not with every task, so the study
+takes about as long as its slowest runs rather than their sum. The result
+is one table row per configuration; a failing configuration reports its
+error in that row instead of aborting the sweep.
+"""
+
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .changepoint import NIGPrior, fit_single_changepoint
+from .diagnostics import split_rhat
+from .sampling import GibbsChangepointSampler
+from .segmentation import pelt
+
+logger = logging.getLogger(__name__)
+
+# 'analytic': exact single change point posterior; 'gibbs': the same model
+# sampled by MCMC (regimes not integrated out); 'pelt': multiple change points
+SWEEP_MODELS = ('analytic', 'gibbs', 'pelt')
+
+# SweepConfig fields each model reads besides model and start_date
+MODEL_PARAMETERS = {
+    'analytic': ('mu0', 'kappa0', 'alpha0', 'beta0', 'seed'),
+    'gibbs': ('mu0', 'kappa0', 'alpha0', 'beta0', 'draws', 'tune', 'chains', 'seed'),
+    'pelt': ('penalty', 'min_size'),
+}
+
+# Prepared input of one start date: (dates, log returns)
+SweepSeries = Tuple[np.ndarray, np.ndarray]
+
+# Series for the configurations of a pool worker, set by _init_worker
+_worker_series: Dict[Optional[str], SweepSeries] = {}
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """
+    One model configuration of a sweep.
+
+    Attributes:
+        model: One of SWEEP_MODELS.
+        start_date: First date of the modeled returns, or None for all.
+        mu0, kappa0, alpha0, beta0: Normal-Inverse-Gamma prior of both
+            regimes (analytic and gibbs; defaults as in NIGPrior).
+        penalty: PELT penalty per change point (default: BIC).
+        min_size: PELT minimum segment length.
+        draws, tune, chains, seed: Gibbs sampling settings; chains run
+            one after another inside the configuration's worker.
+    """
+    model: str = 'analytic'
+    start_date: Optional[str] = '2012-01-01'
+    mu0: float = NIGPrior.mu0
+    kappa0: float = NIGPrior.kappa0
+    alpha0: float = NIGPrior.alpha0
+    beta0: float = NIGPrior.beta0
+    penalty: Optional[float] = None
+    min_size: int = 5
+    draws: int = 1000
+    tune: int = 500
+    chains: int = 2
+    seed: int = 42
+
+    def __post_init__(self) -> None:
+        if self.model not in SWEEP_MODELS:
+            raise ValueError(f"model must be one of {', '.join(SWEEP_MODELS)}")
+        if self.kappa0 <= 0 or self.alpha0 <= 0 or self.beta0 <= 0:
+            raise ValueError("kappa0, alpha0 and beta0 must be positive")
+
+    @property
+    def prior(self) -> NIGPrior:
+        return NIGPrior(self.mu0, self.kappa0, self.alpha0, self.beta0)
+
+
+def expand_grid(grid: Mapping[str, Sequence[Any]], base: Optional[SweepConfig] = None) -> List[SweepConfig]:
+    """
+    Builds every distinct combination of the grid's values.
+
+    Grid values a model does not read (e.g. penalties for the analytic
+    model, priors for PELT) are left at the base settings, so each model
+    is fitted once per combination of its own parameters.
+
+    Args:
+        grid: SweepConfig field name to the values to try.
+        base: Settings for fields not in the grid.
+
+    Returns:
+        Configurations in row-major order of the grid, without duplicates.
+
+    Raises:
+        ValueError: If a key is not a SweepConfig field or a value is invalid.
+    """
+    names = {f.name for f in fields(SweepConfig)}
+    unknown = set(grid) - names
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+    base = base or SweepConfig()
+    keys = list(grid)
+    configs: Dict[SweepConfig, None] = {}
+    for values in itertools.product(*(grid[key] for key in keys)):
+        config = replace(base, **dict(zip(keys, values)))
+        unused = names - {'model', 'start_date', *MODEL_PARAMETERS[config.model]}
+        config = replace(config, **{name: getattr(base, name) for name in unused})
+        configs.setdefault(config)
+    return list(configs)
+
+
+def _date(dates: np.ndarray, i: int) -> str:
+    return str(np.datetime64(dates[i], 'D'))
+
+
+def evaluate(config: SweepConfig, dates: np.ndarray, x: np.ndarray) -> Dict[str, Any]:
+    """
+    Fits one configuration.
+
+    Returns:
+        Result columns: observation count, the change point (posterior
+        mode and 95% interval) with regime means and volatilities for the
+        single change point models, or the change point dates for PELT.
+    """
+    row: Dict[str, Any] = {'n_obs': len(x)}
+    if config.model == 'pelt':
+        result = pelt(x, config.penalty, config.min_size)
+        row.update(penalty_used=result.penalty, n_changepoints=result.n_changepoints,
+                   changepoints=' '.join(_date(dates, i) for i in result.changepoints))
+        return row
+
+    if config.model == 'analytic':
+        posterior = fit_single_changepoint(x, config.prior)
+        means = posterior.expected()
+        samples = posterior.sample(4000, config.seed)
+        tau_mode, lower, upper = (posterior.tau_mode(), posterior.tau_quantile(0.025),
+                                  posterior.tau_quantile(0.975))
+        row.update(log_evidence=posterior.log_evidence)
+    else:
+        sampler = GibbsChangepointSampler(x, config.prior)
+        chains = []
+        for chain in range(config.chains):
+            rng = np.random.default_rng([config.seed, chain])
+            draws, _ = sampler.sample(sampler.initial_state(rng), config.tune + config.draws, rng)
+            chains.append({name: values[config.tune:] for name, values in draws.items()})
+        stacked = {name: np.stack([c[name] for c in chains]) for name in sampler.var_names}
+        samples = {name: values.ravel() for name, values in stacked.items()}
+        means = {name: float(values.mean()) for name, values in samples.items()}
+        tau = samples['tau'].astype(np.int64)
+        tau_mode = int(np.bincount(tau).argmax())
+        lower, upper = (int(q) for q in np.quantile(tau, [0.025, 0.975]))
+        row.update(r_hat_tau=split_rhat(stacked['tau']) if config.chains > 1 else np.nan)
+
+    row.update(
+        tau=tau_mode,
+        change_date=_date(dates, tau_mode),
+        date_lower=_date(dates, lower),
+        date_upper=_date(dates, upper),
+        mu_before=means['mu_before'],
+        mu_after=means['mu_after'],
+        sigma_before=means['sigma_before'],
+        sigma_after=means['sigma_after'],
+        prob_mean_increased=float((samples['mu_after'] > samples['mu_before']).mean()),
+    )
+    return row
+
+
+def _init_worker(series: Dict[Optional[str], SweepSeries]) -> None:
+    global _worker_series
+    _worker_series = series
+
+
+def _run_config(config: SweepConfig) -> Dict[str, Any]:
+    """Evaluates a configuration on the worker's series, timing it and capturing errors."""
+    start = time.perf_counter()
+    try:
+        dates, x = _worker_series[config.start_date]
+        row = evaluate(config, dates, x)
+        row['error'] = None
+    except Exception as e:
+        row = {'error': f"{type(e).__name__}: {e}"}
+    row['seconds'] = time.perf_counter() - start
+    return row
+
+
+def run_sweep(configs: Sequence[SweepConfig], series: Mapping[Optional[str], SweepSeries],
+              workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Runs every configuration, in parallel when more than one worker is used.
+
+    Args:
+        configs: Configurations to fit.
+        series: Prepared (dates, log returns) per start date used by `configs`.
+        workers: Worker processes; None uses every available core.
+
+    Returns:
+        One row per configuration, in input order: its settings followed by
+        the results of evaluate(), 'error' (None on success) and 'seconds'.
+    """
+    missing = {c.start_date for c in configs} - set(series)
+    if missing:
+        raise ValueError(f"No prepared series for start dates: {sorted(missing, key=str)}")
+    series = {key: series[key] for key in {c.start_date for c in configs}}
+    workers = min(workers or os.cpu_count() or 1, len(configs))
+
+    if workers <= 1:
+        _init_worker(series)
+        rows = [_run_config(config) for config in configs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(series,)) as pool:
+            rows = list(pool.map(_run_config, configs))
+    failed = sum(row['error'] is not None for row in rows)
+    logger.info(f"Sweep of {len(configs)} configurations finished on {max(workers, 1)} workers ({failed} failed).")
+    table = pd.DataFrame([dict(asdict(config), **row) for config, row in zip(configs, rows)])
+    return table[[c for c in table.columns if c not in ('error', 'seconds')] + ['error', 'seconds']]
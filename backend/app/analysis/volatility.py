@@ -0,0 +1,254 @@
+"""
+Fast daily volatility estimators.
+
+Two alternatives to the per-day latent random walk sampled with NUTS in
+notebooks/03_volatility_forecasting.ipynb, both fitted in well under a
+second on the 2012-2022 series:
+
+- KalmanVolatility: the same random-walk log-volatility model in its
+  linear state-space form on log squared returns (Harvey, Ruiz and
+  Shephard, 1994). The log chi-square noise is replaced by a Gaussian
+  with matching mean and variance, the state noise is estimated by
+  quasi-maximum likelihood, and the path is smoothed with RTS.
+- GarchModel: GARCH(1,1) by maximum likelihood. The variance recursion is
+  a first-order linear filter of squared returns, so it is evaluated with
+  scipy.signal.lfilter instead of a Python loop.
+
+Both keep the state needed to absorb new days one at a time via update().
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+from scipy.optimize import minimize, minimize_scalar
+from scipy.signal import lfilter
+
+# Estimators selectable by name (API `method` parameter, scripts)
+VOLATILITY_METHODS = ('garch', 'kalman')
+
+# Mean and variance of log(chi^2_1), the noise in log squared returns
+LOG_CHI2_MEAN = -1.2703628454614782
+LOG_CHI2_VAR = np.pi ** 2 / 2
+# Offset added to squared returns (as a fraction of their mean) so zero returns stay finite
+SQUARED_RETURN_OFFSET = 0.001
+
+
+class KalmanVolatility:
+    """
+    Random-walk log-variance model filtered on log squared returns.
+
+        y_t = log(r_t^2 + c) - LOG_CHI2_MEAN = h_t + e_t,   e_t ~ N(0, pi^2 / 2)
+        h_t = h_{t-1} + u_t,                                u_t ~ N(0, q)
+
+    Args:
+        q: State noise variance; estimated by fit() when None.
+        offset: The constant c; defaults to a fraction of the mean squared return.
+    """
+
+    def __init__(self, q: Optional[float] = None, offset: Optional[float] = None) -> None:
+        self.q = q
+        self.offset = offset
+        self.mu = 0.0         # mean return removed before squaring
+        self.mean = 0.0       # filtered E[h_t]
+        self.var = 1.0        # filtered Var[h_t]
+        self.n_observed = 0
+
+    def _observations(self, returns: np.ndarray) -> np.ndarray:
+        return np.log(returns ** 2 + self.offset) - LOG_CHI2_MEAN
+
+    @staticmethod
+    def _filter(y: np.ndarray, q: float, mean: float, var: float):
+        """Kalman filter; returns predicted/filtered moments and the log likelihood."""
+        n = len(y)
+        pred_mean, pred_var = np.empty(n), np.empty(n)
+        filt_mean, filt_var = np.empty(n), np.empty(n)
+        log_lik = 0.0
+        for t in range(n):
+            var += q
+            pred_mean[t], pred_var[t] = mean, var
+            innovation_var = var + LOG_CHI2_VAR
+            innovation = y[t] - mean
+            gain = var / innovation_var
+            mean += gain * innovation
+            var *= 1.0 - gain
+            filt_mean[t], filt_var[t] = mean, var
+            log_lik -= 0.5 * (np.log(2 * np.pi * innovation_var) + innovation * innovation / innovation_var)
+        return pred_mean, pred_var, filt_mean, filt_var, log_lik
+
+    def fit(self, returns: Sequence[float]) -> np.ndarray:
+        """
+        Estimates q (if not given), filters and smooths the whole series.
+
+        Args:
+            returns: Daily (log) returns.
+
+        Returns:
+            Smoothed daily volatility (standard deviation) for each return.
+        """
+        r = np.asarray(returns, dtype=np.float64)
+        self.mu = float(r.mean())
+        r = r - self.mu
+        if self.offset is None:
+            self.offset = SQUARED_RETURN_OFFSET * float(np.mean(r ** 2))
+        y = self._observations(r)
+        start_mean = float(y[:20].mean())
+
+        if self.q is None:
+            def neg_log_lik(log_q: float) -> float:
+                return -self._filter(y, np.exp(log_q), start_mean, 1.0)[4]
+            self.q = float(np.exp(minimize_scalar(neg_log_lik, bounds=(-12.0, 0.0), method='bounded').x))
+
+        pred_mean, pred_var, filt_mean, filt_var, _ = self._filter(y, self.q, start_mean, 1.0)
+        self.mean, self.var = float(filt_mean[-1]), float(filt_var[-1])
+        self.n_observed = len(y)
+
+        # Rauch-Tung-Striebel smoother (random walk transition, so F = 1)
+        smooth = filt_mean.copy()
+        for t in range(len(y) - 2, -1, -1):
+            gain = filt_var[t] / pred_var[t + 1]
+            smooth[t] = filt_mean[t] + gain * (smooth[t + 1] - pred_mean[t + 1])
+        return np.exp(smooth / 2)
+
+    def update(self, returns: Sequence[float]) -> np.ndarray:
+        """
+        Filters new days after fit(); earlier estimates are not revised.
+
+        Returns:
+            Filtered daily volatility for each new return.
+        """
+        if self.q is None or self.offset is None:
+            raise RuntimeError("Call fit() before update()")
+        y = self._observations(np.asarray(returns, dtype=np.float64) - self.mu)
+        _, _, filt_mean, filt_var, _ = self._filter(y, self.q, self.mean, self.var)
+        if len(y):
+            self.mean, self.var = float(filt_mean[-1]), float(filt_var[-1])
+            self.n_observed += len(y)
+        return np.exp(filt_mean / 2)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Returns the parameters and filter state as a JSON-serializable dict."""
+        return dict(vars(self))
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'KalmanVolatility':
+        """Rebuilds a model from to_state() output."""
+        model = cls(state['q'], state['offset'])
+        for name in ('mu', 'mean', 'var', 'n_observed'):
+            setattr(model, name, state[name])
+        return model
+
+
+def garch_variance(returns: np.ndarray, omega: float, alpha: float, beta: float,
+                   initial: float) -> np.ndarray:
+    """
+    Conditional variances sigma_t^2 = omega + alpha * r_{t-1}^2 + beta * sigma_{t-1}^2.
+
+    Args:
+        returns: Demeaned returns.
+        omega, alpha, beta: GARCH(1,1) parameters.
+        initial: sigma_0^2.
+
+    Returns:
+        sigma_t^2 for t = 0..n-1, computed as one linear filter pass.
+    """
+    drive = np.empty_like(returns)
+    drive[0] = initial
+    drive[1:] = omega + alpha * returns[:-1] ** 2
+    # Zero initial filter state, so the first output is exactly `initial`
+    return lfilter([1.0], [1.0, -beta], drive)
+
+
+@dataclass
+class GarchModel:
+    """
+    Fitted GARCH(1,1) with Gaussian innovations.
+
+    Attributes:
+        mu: Mean return.
+        omega, alpha, beta: Variance parameters.
+        log_likelihood: Maximized log likelihood.
+        initial_variance: Variance assumed for the first day of the fit.
+        last_return: Most recent demeaned return, for the next variance.
+        last_variance: Conditional variance of the most recent day.
+    """
+    mu: float
+    omega: float
+    alpha: float
+    beta: float
+    log_likelihood: float
+    initial_variance: float
+    last_return: float
+    last_variance: float
+
+    @classmethod
+    def fit(cls, returns: Sequence[float]) -> 'GarchModel':
+        """
+        Maximum likelihood fit.
+
+        Args:
+            returns: Daily (log) returns.
+
+        Returns:
+            The fitted model.
+        """
+        r = np.asarray(returns, dtype=np.float64)
+        mu = float(r.mean())
+        x = r - mu
+        sample_var = float(x.var())
+
+        def unpack(theta: np.ndarray):
+            # alpha and beta via a softmax with a slack term keep alpha + beta < 1
+            weights = np.exp(np.append(theta[1:], 0.0))
+            alpha, beta = weights[:2] / weights.sum()
+            return np.exp(theta[0]), alpha, beta
+
+        def neg_log_lik(theta: np.ndarray) -> float:
+            omega, alpha, beta = unpack(theta)
+            var = garch_variance(x, omega, alpha, beta, sample_var)
+            return 0.5 * float(np.sum(np.log(2 * np.pi * var) + x * x / var))
+
+        # Start near typical daily estimates: alpha 0.05, beta 0.9
+        start = np.array([np.log(0.05 * sample_var), 0.0, np.log(0.9 / 0.05)])
+        result = minimize(neg_log_lik, start, method='L-BFGS-B')
+        omega, alpha, beta = unpack(result.x)
+        var = garch_variance(x, omega, alpha, beta, sample_var)
+        return cls(mu, float(omega), float(alpha), float(beta), -float(result.fun),
+                   sample_var, float(x[-1]), float(var[-1]))
+
+    def volatility(self, returns: Sequence[float]) -> np.ndarray:
+        """Conditional daily volatility over the returns the model was fitted on."""
+        x = np.asarray(returns, dtype=np.float64) - self.mu
+        return np.sqrt(garch_variance(x, self.omega, self.alpha, self.beta, self.initial_variance))
+
+    def update(self, returns: Sequence[float]) -> np.ndarray:
+        """
+        Absorbs new days without refitting the parameters.
+
+        Returns:
+            Conditional daily volatility for each new return.
+        """
+        x = np.asarray(returns, dtype=np.float64) - self.mu
+        if len(x) == 0:
+            return np.empty(0)
+        first = self.omega + self.alpha * self.last_return ** 2 + self.beta * self.last_variance
+        var = garch_variance(x, self.omega, self.alpha, self.beta, first)
+        self.last_return, self.last_variance = float(x[-1]), float(var[-1])
+        return np.sqrt(var)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Returns the parameters and last variance as a JSON-serializable dict."""
+        return asdict(self)
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'GarchModel':
+        """Rebuilds a model from to_state() output."""
+        return cls(**state)
+
+    def forecast(self, horizon: int) -> np.ndarray:
+        """Expected daily volatility for the next `horizon` days."""
+        persistence = self.alpha + self.beta
+        long_run = self.omega / (1 - persistence)
+        next_var = self.omega + self.alpha * self.last_return ** 2 + self.beta * self.last_variance
+        steps = persistence ** np.arange(horizon)
+        return np.sqrt(long_run + (next_var - long_run) * steps)
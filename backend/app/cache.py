@@ -0,0 +1,181 @@
+"""Process-wide in-memory cache for parsed datasets."""
+
+import os
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Memory budget shared by every cached dataset (all price series included)
+DEFAULT_MAX_BYTES = int(os.environ.get('API_DATASET_CACHE_MB', 1024)) * 2 ** 20
+
+# (st_mtime_ns, st_size) identifies one version of a file on disk
+Signature = Tuple[int, int]
+
+# Marks a cache miss (None is a valid cached value)
+_MISSING = object()
+
+
+def file_signature(path: str) -> Optional[Signature]:
+    """
+    Returns the (mtime, size) signature of a file.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        Tuple of modification time in nanoseconds and size in bytes,
+        or None if the file cannot be stat'ed.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def estimate_nbytes(value: Any) -> int:
+    """In-memory size of a frame or array; 0 for values that are not measured."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    return 0
+
+
+class DatasetCache:
+    """
+    Keeps parsed datasets in memory, keyed by file path.
+
+    Each entry remembers the signature of the file it was parsed from and is
+    reloaded only when the file's mtime or size changes. Cached values are
+    shared between callers and must be treated as read-only.
+
+    When the estimated size of all entries exceeds `max_bytes`, the least
+    recently used ones are dropped (the entry just loaded is always kept),
+    so any number of price series can be served within one memory budget.
+
+    Files are parsed outside the cache-wide lock, under a lock of their own
+    path: concurrent cold requests for one file trigger a single load, while
+    requests for other files (hits or loads) proceed meanwhile.
+
+    Args:
+        max_bytes: Memory budget, or None for no limit.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None) -> None:
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Tuple[Signature, Any, int]]' = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.RLock()
+        # One lock per path, held while that path is loaded
+        self._load_locks: Dict[str, threading.RLock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    def get(self, path: str, loader: Callable[[str], Any]) -> Any:
+        """
+        Returns the parsed contents of a file, loading it on first use or
+        when it has changed on disk.
+
+        Args:
+            path: Path to the source file.
+            loader: Callable that parses the file at `path`.
+
+        Returns:
+            The value produced by `loader`.
+        """
+        signature = file_signature(path)
+        value = self._hit(path, signature)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(path, threading.RLock())
+        with load_lock:
+            # Another thread may have loaded this version while we waited
+            signature = file_signature(path)
+            value = self._hit(path, signature)
+            if value is not _MISSING:
+                return value
+
+            value = loader(path)
+            with self._lock:
+                entry = self._entries.pop(path, None)
+                if entry is None:
+                    self.misses += 1
+                    logger.info(f"Dataset cache miss: {path}")
+                else:
+                    self.reloads += 1
+                    self._nbytes -= entry[2]
+                    logger.info(f"Dataset cache reload: {path}")
+                if signature is not None:
+                    nbytes = estimate_nbytes(value)
+                    self._entries[path] = (signature, value, nbytes)
+                    self._nbytes += nbytes
+                    self._evict()
+            return value
+
+    def _hit(self, path: str, signature: Optional[Signature]) -> Any:
+        """The cached value of `path` if it matches `signature`, otherwise _MISSING."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and signature is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            return _MISSING
+
+    def _evict(self) -> None:
+        """Drops least recently used entries until the budget is met."""
+        if self.max_bytes is None:
+            return
+        while self._nbytes > self.max_bytes and len(self._entries) > 1:
+            path, (_, _, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+            self.evictions += 1
+            logger.info(f"Dataset cache evicted {path} ({nbytes / 2 ** 20:.1f} MB)")
+
+    def cached(self, path: str) -> bool:
+        """Whether a version of `path` is in memory."""
+        with self._lock:
+            return path in self._entries
+
+    def signature(self, path: str) -> Optional[Signature]:
+        """Returns the signature of the cached version of `path`, if any."""
+        with self._lock:
+            entry = self._entries.get(path)
+            return entry[0] if entry is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss/reload/eviction counters, the number of cached entries and their size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'reloads': self.reloads,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._nbytes,
+            }
+
+    def clear(self) -> None:
+        """Drops all cached entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.reloads = 0
+            self.evictions = 0
+
+
+# Shared by every DataService call in this process
+dataset_cache = DatasetCache(DEFAULT_MAX_BYTES)
@@ -0,0 +1,101 @@
+"""Shape-preserving downsampling for chart payloads."""
+
+import numpy as np
+
+# Methods accepted by the `method` query parameter
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Selects points with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    selected point and the average of the next bucket.
+
+    Args:
+        x: Monotonic x coordinates (e.g. epoch days).
+        y: Values at each x.
+        n_out: Number of points to keep.
+
+    Returns:
+        Sorted integer indices into `x`/`y`.
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.linspace(0, n - 1, max(n_out, 0)).astype(np.int64)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket boundaries over the interior points [1, n - 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the following bucket (or the last point)
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Keeps the minimum and maximum of each bucket so spikes survive.
+
+    Args:
+        y: Values to downsample.
+        n_out: Approximate number of points to keep (two per bucket).
+
+    Returns:
+        Sorted, de-duplicated integer indices into `y`.
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    n_buckets = max(n_out // 2, 1)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+    y = np.asarray(y, dtype=np.float64)
+    # reduceat works per bucket without a Python loop
+    mins = np.minimum.reduceat(y, starts)
+    maxs = np.maximum.reduceat(y, starts)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    is_min = np.zeros(n, dtype=bool)
+    is_max = np.zeros(n, dtype=bool)
+    # First occurrence of each bucket's min/max
+    min_pos = np.flatnonzero(y == mins[bucket])
+    max_pos = np.flatnonzero(y == maxs[bucket])
+    is_min[min_pos[np.unique(bucket[min_pos], return_index=True)[1]]] = True
+    is_max[max_pos[np.unique(bucket[max_pos], return_index=True)[1]]] = True
+    return np.flatnonzero(is_min | is_max)
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, n_out: int, method: str = 'lttb') -> np.ndarray:
+    """
+    Dispatches to a downsampling method.
+
+    Args:
+        x: Monotonic x coordinates.
+        y: Values at each x.
+        n_out: Target number of points.
+        method: One of DOWNSAMPLE_METHODS.
+
+    Returns:
+        Sorted integer indices of the points to keep.
+    """
+    if method == 'lttb':
+        return lttb_indices(x, y, n_out)
+    if method == 'minmax':
+        return minmax_indices(y, n_out)
+    raise ValueError(f"Unknown downsampling method: {method}")
@@ -0,0 +1,250 @@
+"""
+Headless figure pipeline with content-hash caching.
+
+Each figure is a function registered on a FigurePipeline together with the
+names of the inputs it draws. Before rendering, the pipeline hashes those
+inputs with the function's source, its dpi and the style, and compares the
+hash with the one embedded in the existing PNG: figures whose inputs have
+not changed are not redrawn. Stale figures are drawn in worker processes on
+the non-interactive Agg backend and replace their PNG atomically.
+
+Long series should go through decimate() before plotting; a 300 dpi figure
+cannot show more points than it has pixels, and drawing them dominates the
+render time.
+"""
+
+import hashlib
+import inspect
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .downsample import downsample_indices
+
+logger = logging.getLogger(__name__)
+
+# PNG text chunk holding the hash of the inputs a figure was drawn from
+FIGURE_HASH_KEY = 'InputHash'
+
+# Default points kept by decimate(); about the pixel width of a wide 300 dpi figure
+DEFAULT_MAX_POINTS = 2000
+
+
+@dataclass(frozen=True)
+class FigureSpec:
+    """
+    A registered figure.
+
+    Attributes:
+        filename: PNG file name in the pipeline's output directory.
+        draw: Module-level function taking the inputs as keyword arguments
+            and returning a matplotlib Figure.
+        inputs: Names of the inputs passed to `draw`.
+        dpi: Resolution of the saved PNG.
+        bbox_inches: Passed to savefig ('tight' crops the margins).
+    """
+    filename: str
+    draw: Callable[..., Any]
+    inputs: Tuple[str, ...]
+    dpi: int = 300
+    bbox_inches: Optional[str] = 'tight'
+
+
+class RenderResult(NamedTuple):
+    """Outcome of one figure: 'cached', 'rendered' or 'failed' (with the error)."""
+    status: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def decimate(x: np.ndarray, y: np.ndarray, max_points: int = DEFAULT_MAX_POINTS,
+             method: str = 'lttb') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Thins a series to at most max_points while keeping its visual shape.
+
+    Args:
+        x: Monotonic x values (numbers or datetime64).
+        y: Values at each x.
+        max_points: Points to keep.
+        method: 'lttb' or 'minmax' (see app.downsample).
+
+    Returns:
+        The kept (x, y).
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=np.float64)
+    if len(x) <= max_points:
+        return x, y
+    numeric = x.astype('datetime64[ns]').astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    keep = downsample_indices(numeric.astype(np.float64), y, max_points, method)
+    return x[keep], y[keep]
+
+
+def update_digest(digest: Any, value: Any) -> None:
+    """Feeds a value's type and content into a hash, recursing into containers."""
+    digest.update(type(value).__name__.encode())
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        labels = value.columns if isinstance(value, pd.DataFrame) else value.name
+        digest.update(repr(list(labels) if isinstance(value, pd.DataFrame) else labels).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(f"{value.dtype}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, Mapping):
+        for key in sorted(value, key=str):
+            digest.update(repr(key).encode())
+            update_digest(digest, value[key])
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        digest.update(str(len(value)).encode())
+        for item in value:
+            update_digest(digest, item)
+    else:
+        digest.update(repr(value).encode())
+
+
+def input_hash(spec: FigureSpec, inputs: Mapping[str, Any], style: Any = None) -> str:
+    """Hash of everything that determines a figure's pixels."""
+    import matplotlib
+
+    digest = hashlib.sha256()
+    for part in (spec.filename, inspect.getsource(spec.draw), spec.dpi, spec.bbox_inches, style,
+                 matplotlib.__version__):
+        digest.update(repr(part).encode())
+    for name in spec.inputs:
+        digest.update(name.encode())
+        update_digest(digest, inputs[name])
+    return digest.hexdigest()
+
+
+def stored_hash(path: str) -> Optional[str]:
+    """Input hash embedded in an existing PNG, if any."""
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            return image.text.get(FIGURE_HASH_KEY)
+    except (OSError, ValueError):
+        return None
+
+
+def _init_worker() -> None:
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render(spec: FigureSpec, inputs: Dict[str, Any], path: str, digest: str, style: Any) -> RenderResult:
+    """Draws one figure and saves it atomically with its input hash."""
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    try:
+        with plt.style.context(style or [], after_reset=True):
+            fig = spec.draw(**inputs)
+            tmp_path = f"{path}.tmp"
+            try:
+                fig.savefig(tmp_path, format='png', dpi=spec.dpi, bbox_inches=spec.bbox_inches,
+                            metadata={FIGURE_HASH_KEY: digest})
+            finally:
+                plt.close(fig)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        return RenderResult('failed', time.perf_counter() - start, f"{type(e).__name__}: {e}")
+    return RenderResult('rendered', time.perf_counter() - start)
+
+
+class FigurePipeline:
+    """
+    Registry of figures rendered into one directory.
+
+    Args:
+        output_dir: Directory the PNG files are written to.
+        style: Matplotlib style (name, rc dict or list of them) applied,
+            after a reset to defaults, to every figure.
+    """
+
+    def __init__(self, output_dir: str, style: Any = None) -> None:
+        self.output_dir = output_dir
+        self.style = style
+        self.specs: Dict[str, FigureSpec] = {}
+
+    def figure(self, filename: str, inputs: Sequence[str], dpi: int = 300,
+               bbox_inches: Optional[str] = 'tight') -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator registering a draw function (see FigureSpec)."""
+        def register(draw: Callable[..., Any]) -> Callable[..., Any]:
+            self.specs[filename] = FigureSpec(filename, draw, tuple(inputs), dpi, bbox_inches)
+            return draw
+        return register
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.output_dir, filename)
+
+    def stale(self, data: Mapping[str, Any], names: Optional[Sequence[str]] = None) -> Dict[str, str]:
+        """
+        Finds the figures whose PNG is missing or was drawn from other inputs.
+
+        Args:
+            data: Input name to value; must cover the inputs of `names`.
+            names: Figures to check (default: all registered).
+
+        Returns:
+            Figure name to its current input hash, for the stale figures.
+
+        Raises:
+            KeyError: If a figure is not registered or an input is missing.
+        """
+        stale = {}
+        for name in names or list(self.specs):
+            spec = self.specs[name]
+            missing = [key for key in spec.inputs if key not in data]
+            if missing:
+                raise KeyError(f"Figure {name} needs inputs {missing}")
+            digest = input_hash(spec, data, self.style)
+            if stored_hash(self.path(name)) != digest:
+                stale[name] = digest
+        return stale
+
+    def render(self, data: Mapping[str, Any], names: Optional[Sequence[str]] = None,
+               workers: Optional[int] = None, force: bool = False) -> Dict[str, RenderResult]:
+        """
+        Renders the stale figures, in parallel when more than one worker is used.
+
+        Args:
+            data: Input name to value (see stale()).
+            names: Figures to render (default: all registered).
+            workers: Worker processes; None uses every available core.
+            force: Redraw even figures whose inputs are unchanged.
+
+        Returns:
+            Figure name to its RenderResult, in `names` order. A failing
+            figure reports its error instead of aborting the others.
+        """
+        names = list(names or self.specs)
+        if force:
+            digests = {name: input_hash(self.specs[name], data, self.style) for name in names}
+        else:
+            digests = self.stale(data, names)
+        os.makedirs(self.output_dir, exist_ok=True)
+        tasks = [(self.specs[name], {key: data[key] for key in self.specs[name].inputs},
+                  self.path(name), digest, self.style) for name, digest in digests.items()]
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+
+        if workers <= 1:
+            rendered: List[RenderResult] = [_render(*task) for task in tasks]
+        else:
+            # Fork where available: the analysis scripts run at module level, and
+            # spawned workers would re-execute them on import
+            context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+                rendered = list(pool.map(_render, *zip(*tasks)))
+        results = dict(zip(digests, rendered))
+        for name, result in results.items():
+            if result.error:
+                logger.error(f"Figure {name} failed: {result.error}")
+        logger.info(f"Rendered {len(tasks)} of {len(names)} figures on {max(workers, 1)} workers.")
+        return {name: results.get(name, RenderResult('cached')) for name in names}
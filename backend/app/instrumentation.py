@@ -0,0 +1,178 @@
+"""
+Request timing, per-stage spans and Prometheus metrics for the API.
+
+Stages (DataService methods, file parsing, serialization) are wrapped in
+span() or @timed. Every span feeds a latency histogram; inside a request it
+is also added to the response's Server-Timing header, so browser dev tools
+show where the time went:
+
+    Server-Timing: total;dur=41.2, get_prices;dur=35.0, read_csv;dur=21.7, json_encode;dur=4.1
+
+Request latency per route and status, stage latency and the cache counters
+are exposed in the Prometheus text format by /api/metrics.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from flask import Flask, Response, g, has_request_context, request
+
+from .cache import dataset_cache
+from .profiler import SamplingProfiler
+from .response_cache import response_cache
+
+# Prometheus' default buckets, in seconds
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+# Stages are often sub-millisecond
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025) + REQUEST_BUCKETS
+
+
+class Histogram:
+    """
+    Labelled latency histogram with fixed buckets.
+
+    Args:
+        name: Metric name.
+        help_text: Description for the # HELP line.
+        label_names: Label names, given as keyword arguments to observe().
+        buckets: Upper bounds of the buckets, ascending.
+    """
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str],
+                 buckets: Sequence[float] = REQUEST_BUCKETS) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # label values -> (per-bucket counts with a final +Inf slot, [sum])
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[slot] += 1
+            total[0] += value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        """Lines of the text exposition format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total[0]) for key, (counts, total) in self._series.items()}
+        for key, (counts, total) in sorted(series.items()):
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, key))
+            prefix = labels + ',' if labels else ''
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ''
+            lines.append(f"{self.name}_sum{suffix} {total!r}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REQUEST_LATENCY = Histogram('api_request_duration_seconds', "API request latency.",
+                            ('endpoint', 'method', 'status'))
+STAGE_LATENCY = Histogram('api_stage_duration_seconds', "Time spent in instrumented stages.",
+                          ('stage',), STAGE_BUCKETS)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Times a stage; inside a request it is also reported in Server-Timing."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_LATENCY.observe(elapsed, stage=name)
+        if has_request_context():
+            spans = g.setdefault('spans', {})
+            spans[name] = spans.get(name, 0.0) + elapsed
+
+
+def timed(fn: Callable) -> Callable:
+    """Decorator running a function inside span(<function name>)."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span(fn.__name__):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def server_timing(total: float, spans: Dict[str, float]) -> str:
+    """Formats a Server-Timing header value (durations in milliseconds)."""
+    entries = [f"total;dur={total * 1000:.2f}"]
+    entries += [f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in spans.items()]
+    return ', '.join(entries)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = REQUEST_LATENCY.render() + STAGE_LATENCY.render()
+    caches = {'dataset': dataset_cache.stats(), 'response': response_cache.stats()}
+    for counter in ('hits', 'misses', 'reloads', 'evictions'):
+        name = f"api_cache_{counter}_total"
+        lines += [f"# HELP {name} Cache {counter} since the last clear.", f"# TYPE {name} counter"]
+        lines += [f'{name}{{cache="{cache}"}} {stats[counter]}'
+                  for cache, stats in caches.items() if counter in stats]
+    lines += ["# HELP api_cache_entries Entries currently cached.", "# TYPE api_cache_entries gauge"]
+    lines += [f'api_cache_entries{{cache="{cache}"}} {stats["entries"]}' for cache, stats in caches.items()]
+    lines += ["# HELP api_cache_bytes Estimated size of the cached datasets.", "# TYPE api_cache_bytes gauge",
+              f'api_cache_bytes{{cache="dataset"}} {caches["dataset"]["bytes"]}']
+    return '\n'.join(lines) + '\n'
+
+
+def _profiling_requested() -> bool:
+    return request.args.get('profile') == '1' or request.headers.get('X-Profile') == '1'
+
+
+def init_app(app: Flask) -> None:
+    """
+    Installs request timing on an app.
+
+    The sampling profiler stays off unless app.config['PROFILING'] is set;
+    then a request with ?profile=1 (or an X-Profile: 1 header) is answered
+    with its collapsed stack samples instead of the normal body.
+    """
+    app.config.setdefault('PROFILING', False)
+
+    @app.before_request
+    def start_timer() -> None:
+        g.request_start = time.perf_counter()
+        g.spans = {}
+        if app.config['PROFILING'] and _profiling_requested():
+            g.profiler = SamplingProfiler(threading.get_ident()).start()
+
+    @app.after_request
+    def record_timing(response: Response) -> Response:
+        start: Optional[float] = g.get('request_start')
+        if start is None:
+            return response
+        profiler: Optional[SamplingProfiler] = g.get('profiler')
+        if profiler is not None:
+            profiler.stop()
+            response = Response(profiler.collapsed(), mimetype='text/plain')
+            response.headers['X-Profile-Samples'] = str(profiler.samples)
+        elapsed = time.perf_counter() - start
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        REQUEST_LATENCY.observe(elapsed, endpoint=endpoint, method=request.method,
+                                status=str(response.status_code))
+        response.headers['Server-Timing'] = server_timing(elapsed, g.get('spans', {}))
+        return response
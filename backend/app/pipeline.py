@@ -0,0 +1,310 @@
+"""
+Dependency-tracked stage runner for the analysis workflow.
+
+A Pipeline is a set of stages, each a function registered with the files it
+reads and the files it writes, relative to the pipeline root. A stage
+depends on every stage that writes one of its inputs, which makes the
+stages a DAG. Running the pipeline walks that DAG: stages whose upstream
+stages have finished are started concurrently in a thread pool, and a
+failing stage blocks only its own descendants.
+
+Freshness is decided by content, not timestamps. After a stage runs, the
+SHA-256 of its inputs, its outputs and its source code are recorded in a
+JSON state file. A stage is skipped when all three still match, so a stage
+that reruns but writes identical outputs does not invalidate the stages
+below it. File digests are memoized by (mtime, size), so unchanged files
+are not rehashed. Every run appends its per-stage statuses and timings to a
+JSON-lines log next to the state file.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .cache import file_signature
+from .prep import file_digest
+
+logger = logging.getLogger(__name__)
+
+# Bump when the state layout changes so old records are ignored
+STATE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    A registered stage.
+
+    Attributes:
+        name: Unique stage name.
+        run: Function taking no arguments that writes the outputs.
+        inputs: Files or directories read, relative to the pipeline root.
+        outputs: Files written, relative to the pipeline root.
+    """
+    name: str
+    run: Callable[[], Any]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+
+
+class StageResult(NamedTuple):
+    """Outcome of one stage: 'fresh', 'ran', 'failed' or 'blocked' (by a failed upstream stage)."""
+    status: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def _execute(stage: Stage) -> Tuple[float, Optional[Exception]]:
+    """Runs a stage in a worker thread; returns its duration and error, if any."""
+    logger.info(f"Stage {stage.name} started")
+    start = time.perf_counter()
+    try:
+        stage.run()
+    except Exception as e:
+        return time.perf_counter() - start, e
+    return time.perf_counter() - start, None
+
+
+class Pipeline:
+    """
+    Registry of stages sharing one root directory and state file.
+
+    Args:
+        root: Directory the stage paths are relative to.
+        state_path: JSON file recording the digests of the last successful
+            run of every stage. The run log is written next to it.
+    """
+
+    def __init__(self, root: str, state_path: str) -> None:
+        self.root = root
+        self.state_path = state_path
+        self.log_path = f"{os.path.splitext(state_path)[0]}_runs.jsonl"
+        self.stages: Dict[str, Stage] = {}
+        self._digests: Dict[str, Tuple[Any, str]] = {}
+
+    def stage(self, name: str, inputs: Sequence[str] = (),
+              outputs: Sequence[str] = ()) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+        """Decorator registering a stage function (see Stage)."""
+        def register(run: Callable[[], Any]) -> Callable[[], Any]:
+            if name in self.stages:
+                raise ValueError(f"Stage {name} is already registered")
+            self.stages[name] = Stage(name, run, tuple(inputs), tuple(outputs))
+            return run
+        return register
+
+    def path(self, relative: str) -> str:
+        return os.path.join(self.root, relative)
+
+    def dependencies(self) -> Dict[str, Set[str]]:
+        """
+        Stage name to the names of the stages writing its inputs.
+
+        Raises:
+            ValueError: If two stages write the same file or the stages form a cycle.
+        """
+        writers: Dict[str, str] = {}
+        for stage in self.stages.values():
+            for output in stage.outputs:
+                if output in writers:
+                    raise ValueError(f"{output} is written by both {writers[output]} and {stage.name}")
+                writers[output] = stage.name
+        deps = {stage.name: {writers[path] for path in stage.inputs if path in writers} - {stage.name}
+                for stage in self.stages.values()}
+        self._order(deps)
+        return deps
+
+    def _order(self, deps: Dict[str, Set[str]]) -> List[str]:
+        """Stage names in a dependency-respecting order, registration order among equals."""
+        order: List[str] = []
+        done: Set[str] = set()
+        while len(order) < len(deps):
+            ready = [name for name in deps if name not in done and deps[name] <= done]
+            if not ready:
+                raise ValueError(f"Stages form a cycle: {sorted(set(deps) - done)}")
+            order.extend(ready)
+            done.update(ready)
+        return order
+
+    def select(self, targets: Optional[Sequence[str]] = None) -> List[str]:
+        """
+        Stages needed for `targets` (default: all), in run order.
+
+        Raises:
+            KeyError: If a target is not registered.
+        """
+        deps = self.dependencies()
+        if not targets:
+            return self._order(deps)
+        needed: Set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage {name}")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(deps[name])
+        return [name for name in self._order(deps) if name in needed]
+
+    def digest(self, relative: str) -> Optional[str]:
+        """Content hash of a file or directory, or None if it does not exist."""
+        path = self.path(relative)
+        if os.path.isdir(path):
+            digest = hashlib.sha256()
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d != '__pycache__')
+                for filename in sorted(filenames):
+                    if filename.startswith('.') or filename.endswith('.tmp'):
+                        continue
+                    file_path = os.path.join(dirpath, filename)
+                    digest.update(os.path.relpath(file_path, path).encode())
+                    digest.update(self._file_digest(file_path).encode())
+            return digest.hexdigest()
+        return self._file_digest(path) if os.path.isfile(path) else None
+
+    def _file_digest(self, path: str) -> str:
+        signature = file_signature(path)
+        entry = self._digests.get(path)
+        if entry is None or entry[0] != signature:
+            entry = (signature, file_digest(path))
+            self._digests[path] = entry
+        return entry[1]
+
+    def _code_digest(self, stage: Stage) -> str:
+        return hashlib.sha256(inspect.getsource(stage.run).encode()).hexdigest()
+
+    def _record(self, stage: Stage) -> Dict[str, Any]:
+        """Digests that decide whether `stage` is fresh."""
+        return {
+            'code': self._code_digest(stage),
+            'inputs': {path: self.digest(path) for path in stage.inputs},
+            'outputs': {path: self.digest(path) for path in stage.outputs},
+        }
+
+    def _is_fresh(self, stage: Stage, record: Dict[str, Any], state: Dict[str, Any]) -> bool:
+        saved = state.get(stage.name)
+        if saved is None or None in record['outputs'].values():
+            return False
+        return all(saved.get(key) == record[key] for key in ('code', 'inputs', 'outputs'))
+
+    def load_state(self) -> Dict[str, Any]:
+        """Stage name to its last successful run (digests, seconds, finished)."""
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if state.get('version') != STATE_VERSION:
+            return {}
+        for path, (signature, digest) in state.get('digests', {}).items():
+            self._digests.setdefault(self.path(path), (tuple(signature), digest))
+        return state.get('stages', {})
+
+    def _save_state(self, stages: Dict[str, Any]) -> None:
+        digests = {os.path.relpath(path, self.root): [list(signature), digest]
+                   for path, (signature, digest) in self._digests.items() if signature is not None}
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': STATE_VERSION, 'stages': stages, 'digests': digests}, f, indent=1)
+        os.replace(tmp_path, self.state_path)
+
+    def status(self, targets: Optional[Sequence[str]] = None) -> Dict[str, str]:
+        """
+        What run() would do without running anything.
+
+        Returns:
+            Stage name to 'fresh' or 'stale'. Stages below a stale stage are
+            'stale' too, although they will be skipped if it rewrites
+            identical outputs.
+        """
+        deps, state = self.dependencies(), self.load_state()
+        statuses: Dict[str, str] = {}
+        for name in self.select(targets):
+            stage = self.stages[name]
+            upstream_stale = any(statuses.get(dep) == 'stale' for dep in deps[name])
+            fresh = not upstream_stale and self._is_fresh(stage, self._record(stage), state)
+            statuses[name] = 'fresh' if fresh else 'stale'
+        return statuses
+
+    def run(self, targets: Optional[Sequence[str]] = None, workers: Optional[int] = None,
+            force: bool = False) -> Dict[str, StageResult]:
+        """
+        Runs the stale stages, independent ones concurrently.
+
+        Args:
+            targets: Stages to bring up to date, with their upstream stages
+                (default: all).
+            workers: Stages run at once; None uses every available core.
+            force: Rerun the targets (not their upstream stages) even when
+                they are fresh.
+
+        Returns:
+            Stage name to its StageResult, in run order. A failing stage
+            reports its error and blocks its descendants; the others still run.
+        """
+        started = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        deps, state = self.dependencies(), self.load_state()
+        order = self.select(targets)
+        forced = set(targets or order) if force else set()
+        pending = list(order)
+        results: Dict[str, StageResult] = {}
+        running: Dict[Future, Stage] = {}
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            while pending or running:
+                for name in [name for name in pending if deps[name] <= results.keys()]:
+                    pending.remove(name)
+                    stage = self.stages[name]
+                    failed = sorted(dep for dep in deps[name] if results[dep].status in ('failed', 'blocked'))
+                    if failed:
+                        results[name] = StageResult('blocked', error=f"upstream stage {failed[0]} did not finish")
+                    elif name not in forced and self._is_fresh(stage, self._record(stage), state):
+                        results[name] = StageResult('fresh')
+                    else:
+                        running[pool.submit(_execute, stage)] = stage
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    results[stage.name] = self._finish(stage, *future.result(), state)
+                    self._save_state(state)
+
+        results = {name: results[name] for name in order}
+        self._log_run(started, results)
+        return results
+
+    def _finish(self, stage: Stage, seconds: float, error: Optional[Exception],
+                state: Dict[str, Any]) -> StageResult:
+        """Records a completed stage in `state` and returns its result."""
+        record = self._record(stage)
+        missing = [path for path, digest in record['outputs'].items() if digest is None]
+        if error is None and missing:
+            error = FileNotFoundError(f"did not write {', '.join(missing)}")
+        if error is not None:
+            state.pop(stage.name, None)
+            logger.error(f"Stage {stage.name} failed after {seconds:.1f}s: {error}")
+            return StageResult('failed', seconds, f"{type(error).__name__}: {error}")
+
+        record.update(seconds=round(seconds, 3),
+                      finished=datetime.now(timezone.utc).isoformat(timespec='seconds'))
+        state[stage.name] = record
+        logger.info(f"Stage {stage.name} finished in {seconds:.1f}s")
+        return StageResult('ran', seconds)
+
+    def _log_run(self, started: str, results: Dict[str, StageResult]) -> None:
+        entry = {'started': started,
+                 'stages': {name: {'status': result.status, 'seconds': round(result.seconds, 3)}
+                            for name, result in results.items()}}
+        os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+        with open(self.log_path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
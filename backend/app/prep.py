@@ -0,0 +1,217 @@
+"""
+Shared data preparation for the modeling code.
+
+The API, the scripts and the notebooks all model the same series: prices
+sorted by date, restricted to a start date, turned into daily log returns
+with the first (undefined) return dropped. compute_returns() does that in
+one NumPy pass over the price column. ReturnsMemo stores each prepared
+series as an .npz file keyed by a content hash of the price source and the
+start date, so every consumer reuses one artifact until the data changes.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import Signature, file_signature
+
+logger = logging.getLogger(__name__)
+
+# Bump when compute_returns or the artifact names change so stale artifacts are not reused
+PREP_VERSION = 2
+
+# Prepared series kept in memory per ReturnsMemo, least recently used dropped first
+MEMO_MAX_SERIES = 32
+
+
+class ReturnsSeries(NamedTuple):
+    """Prepared log returns, aligned by row."""
+    dates: np.ndarray        # datetime64[D]
+    prices: np.ndarray       # price on each date
+    log_returns: np.ndarray  # log(price / previous price)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Date/Price/Log_Return frame, as the scripts and notebooks expect."""
+        return pd.DataFrame({
+            'Date': self.dates.astype('datetime64[s]'),
+            'Price': self.prices,
+            'Log_Return': self.log_returns,
+        })
+
+
+def normalize_date(value: Optional[str]) -> Optional[str]:
+    """
+    Canonical YYYY-MM-DD form of a date string, or None for no date.
+
+    Raises:
+        ValueError: If the string is not a date pandas can parse.
+    """
+    if not value:
+        return None
+    timestamp = pd.Timestamp(value)
+    if pd.isna(timestamp):
+        raise ValueError(f"Invalid date: {value!r}")
+    return timestamp.strftime('%Y-%m-%d')
+
+
+def compute_returns(dates: np.ndarray, prices: np.ndarray,
+                    start_date: Optional[str] = None) -> ReturnsSeries:
+    """
+    Prepares daily log returns from a date-sorted price series.
+
+    Args:
+        dates: Sorted observation dates (any datetime64 unit).
+        prices: Prices aligned with `dates`.
+        start_date: First date to keep, in any form normalize_date accepts
+            (e.g. 2012-01-01 or 2012/01/01), or None for all.
+
+    Returns:
+        ReturnsSeries starting one row after `start_date` (the first row has
+        no previous price), with non-finite returns removed.
+
+    Raises:
+        ValueError: If `start_date` is not a date.
+    """
+    start_date = normalize_date(start_date)
+    dates = np.asarray(dates).astype('datetime64[D]')
+    prices = np.asarray(prices, dtype=np.float64)
+    start = int(np.searchsorted(dates, np.datetime64(start_date, 'D'))) if start_date else 0
+    window = prices[start:]
+    log_returns = np.log(window[1:] / window[:-1])
+    keep = np.isfinite(log_returns)
+    return ReturnsSeries(dates[start + 1:][keep], window[1:][keep], log_returns[keep])
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ReturnsMemo:
+    """
+    Disk memo of prepared return series.
+
+    Artifacts are named after the source path, its content digest and the
+    start date, so a changed source simply misses and writes a new file; the
+    artifacts of the source's earlier contents (and of older PREP_VERSIONs)
+    are then deleted. Up to `max_series` series already read in this process
+    are also kept in memory, and source digests are recomputed only when the
+    file's mtime or size changes.
+
+    Args:
+        directory: Where the .npz artifacts are written.
+        max_series: Series kept in memory; least recently used are dropped.
+    """
+
+    def __init__(self, directory: str, max_series: int = MEMO_MAX_SERIES) -> None:
+        self.directory = directory
+        self.max_series = max_series
+        self._digests: Dict[str, Tuple[Signature, str]] = {}
+        self._series: 'OrderedDict[str, ReturnsSeries]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _digest(self, path: str) -> Optional[str]:
+        signature = file_signature(path)
+        if signature is None:
+            return None
+        entry = self._digests.get(path)
+        if entry is None or entry[0] != signature:
+            entry = (signature, file_digest(path))
+            self._digests[path] = entry
+        return entry[1]
+
+    @staticmethod
+    def _source_key(source: str) -> str:
+        """Short name of a source path, shared by all artifacts of that source."""
+        return hashlib.sha256(os.path.abspath(source).encode('utf-8')).hexdigest()[:12]
+
+    def artifact_path(self, source: str, digest: str, start_date: Optional[str]) -> str:
+        """File holding the series for one source version and (normalized) start date."""
+        start_date = normalize_date(start_date)
+        name = f"returns_v{PREP_VERSION}_{self._source_key(source)}_{digest[:16]}_{start_date or 'all'}.npz"
+        return os.path.join(self.directory, name)
+
+    def _prune(self, source: str, digest: str) -> None:
+        """Deletes artifacts of other contents of `source`, and any from other PREP_VERSIONs."""
+        current = f"returns_v{PREP_VERSION}_"
+        own = f"{current}{self._source_key(source)}_"
+        for name in os.listdir(self.directory):
+            if not name.startswith('returns_v') or not name.endswith('.npz'):
+                continue
+            stale_version = not name.startswith(current)
+            if stale_version or (name.startswith(own) and not name.startswith(own + digest[:16] + '_')):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    # Already removed by another process
+                    pass
+
+    def get(self, source: str, start_date: Optional[str],
+            load_prices: Callable[[], Tuple[np.ndarray, np.ndarray]]) -> ReturnsSeries:
+        """
+        Returns the prepared series, computing and storing it on a miss.
+
+        Args:
+            source: File the prices come from; its contents key the memo.
+            start_date: First date to keep, or None for all.
+            load_prices: Returns (dates, prices) when the series must be computed.
+
+        Returns:
+            The prepared ReturnsSeries.
+
+        Raises:
+            ValueError: If `start_date` is not a date.
+        """
+        # Spellings of the same date share one artifact
+        start_date = normalize_date(start_date)
+        with self._lock:
+            digest = self._digest(source)
+            if digest is None:
+                # Nothing on disk to key by; prepare without memoizing
+                return compute_returns(*load_prices(), start_date)
+            path = self.artifact_path(source, digest, start_date)
+            series = self._series.get(path)
+            if series is not None:
+                self._series.move_to_end(path)
+                return series
+
+            if os.path.isfile(path):
+                with np.load(path) as data:
+                    series = ReturnsSeries(data['dates'], data['prices'], data['log_returns'])
+            else:
+                series = compute_returns(*load_prices(), start_date)
+                os.makedirs(self.directory, exist_ok=True)
+                # A temporary file of its own per writer: API workers may prepare the same series at once
+                with tempfile.NamedTemporaryFile(dir=self.directory, prefix=os.path.basename(path),
+                                                 suffix='.tmp', delete=False) as f:
+                    try:
+                        np.savez(f, **series._asdict())
+                    except BaseException:
+                        f.close()
+                        os.remove(f.name)
+                        raise
+                os.replace(f.name, path)
+                logger.info(f"Prepared returns written: {path}")
+                self._prune(source, digest)
+            self._series[path] = series
+            self._series.move_to_end(path)
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+            return series
+
+    def clear(self) -> None:
+        """Forgets in-memory series and digests (artifacts stay on disk)."""
+        with self._lock:
+            self._digests.clear()
+            self._series.clear()
@@ -0,0 +1,103 @@
+"""Cache of pre-serialized API responses with strong ETags."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, NamedTuple, Tuple
+
+from flask import Response, request
+
+
+class CachedBody(NamedTuple):
+    """Encoded response body, its strong ETag and extra headers."""
+    body: bytes
+    etag: str
+    mimetype: str
+    headers: Tuple[Tuple[str, str], ...] = ()
+
+
+class ResponseCache:
+    """
+    LRU cache of encoded response bodies.
+
+    Keys must capture everything the body depends on (route, query string,
+    source file signatures), so entries never need explicit invalidation:
+    a changed source simply produces a new key and the stale entry ages out.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, CachedBody]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], bytes],
+                     mimetype: str = 'application/json',
+                     headers: Callable[[], Dict[str, str]] = dict) -> CachedBody:
+        """
+        Returns the cached body for `key`, encoding it with `build` on a miss.
+
+        Args:
+            key: Hashable cache key.
+            build: Callable returning the encoded body.
+            mimetype: Content type stored alongside the body.
+            headers: Callable returning extra headers describing the body,
+                evaluated after `build`.
+
+        Returns:
+            CachedBody with the bytes and their content-hash ETag.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        body = build()
+        entry = CachedBody(body, hashlib.sha256(body).hexdigest()[:32], mimetype,
+                           tuple(headers().items()))
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters and the number of cached bodies."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+    def clear(self) -> None:
+        """Drops all cached bodies and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def conditional_response(entry: CachedBody, max_age: int) -> Response:
+    """
+    Builds a response for a cached body, answering 304 when the client's
+    If-None-Match header matches the ETag.
+
+    Args:
+        entry: Cached body to serve.
+        max_age: Cache-Control max-age in seconds.
+
+    Returns:
+        A 200 response with the body or an empty 304 response.
+    """
+    response = Response(entry.body, mimetype=entry.mimetype)
+    response.headers.extend(entry.headers)
+    response.set_etag(entry.etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+
+# Shared by every API route in this process
+response_cache = ResponseCache()
@@ -1,24 +1,152 @@
 
-from flask import Blueprint, jsonify, Response
-from typing import Tuple, Union
+from flask import Blueprint, jsonify, Response, current_app, request
+from typing import Any, Callable, Dict, List, Tuple, Union
 import logging
+import pandas as pd
+from . import services
+from .cache import file_signature
+from .downsample import DOWNSAMPLE_METHODS
+from .instrumentation import render_metrics, span
+from .response_cache import response_cache, conditional_response
+from .analysis.rolling import MAX_WINDOW, ROLLING_STATS
+from .analysis.volatility import VOLATILITY_METHODS
 from .services import DataService
+from .wire import Columns, WIRE_FORMATS, encode_columns, negotiate_format
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+# Default Cache-Control max-age for API responses (seconds)
+DEFAULT_CACHE_MAX_AGE = 60
+
+def cached_json(sources: List[str], build: Callable[[], Any]) -> Tuple[Response, int]:
+    """
+    Serves a JSON payload from the response cache.
+
+    The cache key combines the request path, query string and the signatures
+    of the source files, so the payload is serialized once per data version.
+
+    Args:
+        sources: Files the payload is derived from.
+        build: Callable producing the JSON-serializable payload.
+
+    Returns:
+        A 200 response with a strong ETag, or 304 if the client copy is current.
+    """
+    def encode() -> bytes:
+        data = build()
+        with span('json_encode'):
+            return current_app.json.dumps(data).encode('utf-8')
+
+    return cached_body(sources, encode)
+
+def cached_columns(sources: List[str], build: Callable[[], Columns], fmt: str) -> Tuple[Response, int]:
+    """
+    Serves time-series columns from the response cache in a columnar format.
+
+    Args:
+        sources: Files the columns are derived from.
+        build: Callable producing the columns.
+        fmt: 'columnar', 'arrow' or 'f64'.
+
+    Returns:
+        Same as cached_json. Raw f64 bodies describe their layout in the
+        X-Columns and X-Row-Count headers.
+    """
+    layout: Dict[str, str] = {}
+
+    def encode() -> bytes:
+        columns = build()
+        layout['X-Columns'] = ','.join(columns)
+        layout['X-Row-Count'] = str(len(next(iter(columns.values()), [])))
+        with span(f'{fmt}_encode'):
+            return encode_columns(columns, fmt, current_app.json.dumps)
+
+    return cached_body(sources, encode, fmt, lambda: layout)
+
+def cached_body(sources: List[str], encode: Callable[[], bytes], fmt: str = 'json',
+                headers: Callable[[], Dict[str, str]] = dict) -> Tuple[Response, int]:
+    """Looks up or encodes a response body keyed by request and data version."""
+    key = (request.path, request.query_string, fmt,
+           tuple(file_signature(path) for path in sources))
+    entry = response_cache.get_or_build(key, encode, WIRE_FORMATS[fmt], headers)
+    response = conditional_response(entry, current_app.config.get('API_CACHE_MAX_AGE', DEFAULT_CACHE_MAX_AGE))
+    return response, response.status_code
+
+def parse_price_query() -> Dict[str, Any]:
+    """
+    Validates the /api/prices query parameters.
+
+    Returns:
+        Keyword arguments for DataService.get_prices.
+
+    Raises:
+        ValueError: If a parameter is malformed.
+    """
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    for value in (start_date, end_date):
+        if value:
+            pd.Timestamp(value)
+    max_points = request.args.get('max_points', type=int)
+    if 'max_points' in request.args and (max_points is None or max_points < 2):
+        raise ValueError("max_points must be an integer >= 2")
+    method = request.args.get('method', 'lttb')
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"method must be one of {', '.join(DOWNSAMPLE_METHODS)}")
+    return {'start_date': start_date, 'end_date': end_date,
+            'max_points': max_points, 'method': method}
+
 @api_bp.route('/prices', methods=['GET'])
 def get_prices() -> Tuple[Response, int]:
     """
     Endpoint: /api/prices
     Returns historical price data.
+
+    Query params:
+        start_date, end_date: Optional inclusive date range (YYYY-MM-DD)
+        max_points: Optional cap on points, downsampled to fit
+        method: Downsampling method, 'lttb' (default) or 'minmax'
+        format: 'json' (rows, default), 'columnar', 'arrow' or 'f64';
+            also negotiable through the Accept header
     """
+    return serve_prices(services.DEFAULT_SERIES)
+
+@api_bp.route('/series/<ticker>/prices', methods=['GET'])
+def get_series_prices(ticker: str) -> Tuple[Response, int]:
+    """
+    Endpoint: /api/series/<ticker>/prices
+    Returns one registered series' prices; same query params as /api/prices.
+    """
+    return serve_prices(ticker)
+
+def serve_prices(ticker: str) -> Tuple[Response, int]:
+    """Serves /api/prices for one series, or 404 if the ticker is unknown."""
+    try:
+        query = dict(parse_price_query(), ticker=ticker)
+        fmt = negotiate_format(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     try:
-        data = DataService.get_prices()
-        logger.info(f"Serving {len(data)} price records.")
-        return jsonify(data), 200
+        sources = [services.price_source(ticker)]
+    except KeyError as e:
+        return jsonify({'error': e.args[0]}), 404
+
+    try:
+        if fmt != 'json':
+            response, status = cached_columns(sources, lambda: DataService.get_price_columns(**query), fmt)
+        else:
+            def build() -> List[Any]:
+                data = DataService.get_prices(**query)
+                logger.info(f"Serializing {len(data)} {ticker} price records.")
+                return data
+            response, status = cached_json(sources, build)
+        response.vary.add('Accept')
+        return response, status
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 406
     except Exception as e:
         logger.error(f"Error serving prices: {e}")
         return jsonify({'error': str(e)}), 500
@@ -30,13 +158,70 @@ def get_events() -> Tuple[Response, int]:
     Returns geopolitical events.
     """
     try:
-        data = DataService.get_events()
-        logger.info(f"Serving {len(data)} events.")
-        return jsonify(data), 200
+        def build() -> List[Any]:
+            data = DataService.get_events()
+            logger.info(f"Serializing {len(data)} events.")
+            return data
+        return cached_json([services.EVENTS_FILE], build)
     except Exception as e:
         logger.error(f"Error serving events: {e}")
         return jsonify({'error': str(e)}), 500
 
+@api_bp.route('/events/impact', methods=['GET'])
+def get_event_impact() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/events/impact
+    Returns pre/post window returns, volatility and abnormal returns for every event.
+
+    Query params:
+        windows: Comma-separated window sizes in trading days (default: 5,20,60)
+        estimation_days: Trading days used to estimate normal returns (default: 250)
+    """
+    try:
+        windows = [int(w) for w in request.args.get('windows', '5,20,60').split(',') if w]
+        estimation_days = request.args.get('estimation_days', 250, type=int)
+        if not windows or min(windows) < 2:
+            raise ValueError("windows must be integers >= 2")
+        if estimation_days < 2:
+            raise ValueError("estimation_days must be at least 2")
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        return cached_json([services.price_source(), services.EVENTS_FILE],
+                           lambda: DataService.get_event_impact(windows, estimation_days))
+    except Exception as e:
+        logger.error(f"Error serving event impact: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/events/changepoints', methods=['GET'])
+def get_event_breaks() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/events/changepoints
+    Joins events to nearby change points with the lag between them.
+
+    Query params:
+        method: 'bayesian' (single change point and its HDI, default) or 'pelt'
+        window: Maximum distance in calendar days to a break interval (default: 90)
+        penalty: PELT penalty (default: BIC)
+    """
+    method = request.args.get('method', 'bayesian')
+    window = request.args.get('window', 90, type=int)
+    penalty = request.args.get('penalty', type=float)
+    if method not in ('bayesian', 'pelt'):
+        return jsonify({'error': "method must be 'bayesian' or 'pelt'"}), 400
+    if window < 0:
+        return jsonify({'error': "window must be a non-negative integer"}), 400
+    if penalty is not None and penalty <= 0:
+        return jsonify({'error': "penalty must be positive"}), 400
+
+    try:
+        sources = [services.price_source(), services.EVENTS_FILE, services.TRACE_SUMMARY_FILE]
+        return cached_json(sources, lambda: DataService.get_event_breaks(method, window, penalty))
+    except Exception as e:
+        logger.error(f"Error serving event/change point join: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @api_bp.route('/changepoint', methods=['GET'])
 def get_changepoint_summary() -> Tuple[Response, int]:
     """
@@ -44,9 +229,8 @@ def get_changepoint_summary() -> Tuple[Response, int]:
     Returns change point analysis summary.
     """
     try:
-        summary = DataService.get_changepoint_summary()
         logger.info("Serving changepoint summary.")
-        return jsonify(summary), 200
+        return cached_json([services.IMPACT_FILE], DataService.get_changepoint_summary)
     except Exception as e:
         logger.error(f"Error serving changepoint summary: {e}")
         return jsonify({'error': str(e)}), 500
@@ -58,23 +242,391 @@ def get_changepoint_trace() -> Tuple[Response, int]:
     Returns MCMC trace data.
     """
     try:
-        data = DataService.get_changepoint_trace()
-        logger.info(f"Serving {len(data)} trace records.")
-        return jsonify(data), 200
+        def build() -> List[Any]:
+            data = DataService.get_changepoint_trace()
+            logger.info(f"Serializing {len(data)} trace records.")
+            return data
+        return cached_json([services.TRACE_SUMMARY_FILE], build)
     except Exception as e:
         logger.error(f"Error serving changepoint trace: {e}")
         return jsonify({'error': str(e)}), 500
 
+def parse_var_names() -> List[str]:
+    """Reads variable names from repeated or comma-separated `var` parameters."""
+    return [name for value in request.args.getlist('var') for name in value.split(',') if name]
+
+def cached_trace(build: Callable[[], Any]) -> Tuple[Response, int]:
+    """Serves a payload derived from the full posterior trace, or 404 if there is none."""
+    source = services.trace_source()
+    if source is None:
+        return jsonify({'error': "No posterior trace available"}), 404
+    return cached_json([source], build)
+
+@api_bp.route('/changepoint/trace/draws', methods=['GET'])
+def get_trace_draws() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/changepoint/trace/draws
+    Returns posterior draws per chain, read lazily from the full trace.
+
+    Query params:
+        var: Variable name(s), repeated or comma-separated (default: all)
+        thin: Keep every thin-th draw (default: 1)
+    """
+    var_names = parse_var_names()
+    thin = request.args.get('thin', 1, type=int)
+    if thin < 1:
+        return jsonify({'error': "thin must be a positive integer"}), 400
+
+    try:
+        return cached_trace(lambda: DataService.get_trace_draws(var_names, thin))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error serving trace draws: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/changepoint/trace/histogram', methods=['GET'])
+def get_trace_histogram() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/changepoint/trace/histogram
+    Returns a histogram of one variable's draws (tau by default).
+
+    Query params:
+        var: Variable name (default: tau)
+        bins: Maximum number of bins (default: 50)
+    """
+    var_name = request.args.get('var', 'tau')
+    bins = request.args.get('bins', 50, type=int)
+    if bins < 1:
+        return jsonify({'error': "bins must be a positive integer"}), 400
+
+    try:
+        return cached_trace(lambda: DataService.get_trace_histogram(var_name, bins))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error serving trace histogram: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/changepoint/trace/hdi', methods=['GET'])
+def get_trace_hdi() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/changepoint/trace/hdi
+    Returns posterior means and highest-density intervals.
+
+    Query params:
+        var: Variable name(s), repeated or comma-separated (default: all)
+        prob: Interval probability mass (default: 0.94)
+    """
+    var_names = parse_var_names()
+    prob = request.args.get('prob', 0.94, type=float)
+    if not 0 < prob < 1:
+        return jsonify({'error': "prob must be between 0 and 1"}), 400
+
+    try:
+        return cached_trace(lambda: DataService.get_trace_hdi(var_names, prob))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error serving trace HDI: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/changepoint/trace/summary', methods=['GET'])
+def get_trace_summary() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/changepoint/trace/summary
+    Returns the posterior summary of the full trace: the az.summary table,
+    tau mode and interval, P(mean increased), the mean and volatility
+    change distributions and histograms. Cached next to the trace.
+
+    Query params:
+        prob: HDI probability mass (default: 0.94)
+    """
+    prob = request.args.get('prob', 0.94, type=float)
+    if not 0 < prob < 1:
+        return jsonify({'error': "prob must be between 0 and 1"}), 400
+
+    try:
+        return cached_trace(lambda: DataService.get_posterior_summary(prob))
+    except Exception as e:
+        logger.error(f"Error serving posterior summary: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/changepoints', methods=['GET'])
+def get_changepoints() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/changepoints
+    Returns multiple change points (PELT) with per-segment statistics.
+
+    Query params:
+        penalty: Penalty per change point (default: BIC)
+        min_size: Minimum segment length in trading days (default: 5)
+        start_date: First date of the series (default: 2012-01-01)
+        penalty_min, penalty_max: Optional CROPS penalty range; adds the
+            optimal segmentation for every penalty in the range (at most
+            services.CROPS_MAX_SEGMENTATIONS of them)
+    """
+    try:
+        query = {
+            'penalty': request.args.get('penalty', type=float),
+            'min_size': request.args.get('min_size', 5, type=int),
+            'start_date': request.args.get('start_date', '2012-01-01'),
+            'penalty_min': request.args.get('penalty_min', type=float),
+            'penalty_max': request.args.get('penalty_max', type=float),
+        }
+        query['start_date'] = pd.Timestamp(query['start_date']).strftime('%Y-%m-%d')
+        if query['min_size'] < 2:
+            raise ValueError("min_size must be at least 2")
+        if query['penalty'] is not None and query['penalty'] <= 0:
+            raise ValueError("penalty must be positive")
+        if (query['penalty_min'] is None) != (query['penalty_max'] is None):
+            raise ValueError("penalty_min and penalty_max must be given together")
+        if query['penalty_min'] is not None and not 0 < query['penalty_min'] <= query['penalty_max']:
+            raise ValueError("Require 0 < penalty_min <= penalty_max")
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        return cached_json([services.price_source()], lambda: DataService.get_changepoints(**query))
+    except ValueError as e:
+        # CROPS penalty ranges wider than services.CROPS_MAX_SEGMENTATIONS
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error serving changepoints: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/changepoint/online', methods=['GET'])
+def get_online_regime() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/changepoint/online
+    Returns the current regime probability from the streaming detector.
+
+    Query params:
+        window: Trading days considered recent for the change probability (default: 20)
+    """
+    window = request.args.get('window', 20, type=int)
+    if window < 1:
+        return jsonify({'error': "window must be a positive integer"}), 400
+
+    try:
+        return cached_json([services.price_source()], lambda: DataService.get_online_regime(window))
+    except Exception as e:
+        logger.error(f"Error serving online regime: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @api_bp.route('/volatility', methods=['GET'])
 def get_volatility() -> Tuple[Response, int]:
     """
     Endpoint: /api/volatility
     Returns volatility estimates.
+
+    Query params:
+        method: Optional fast estimator, 'garch' or 'kalman'; by default
+            stored estimates are returned
+        source: Stored estimates to return: 'mcmc' (default, the notebook's
+            NUTS fit) or 'filter' (saved by scripts/run_volatility.py)
+        format: 'json' (rows, default), 'columnar', 'arrow' or 'f64';
+            also negotiable through the Accept header
     """
     try:
-        data = DataService.get_volatility_data()
-        logger.info(f"Serving {len(data)} volatility records.")
-        return jsonify(data), 200
+        fmt = negotiate_format(request)
+        method = request.args.get('method')
+        if method is not None and method not in VOLATILITY_METHODS:
+            raise ValueError(f"method must be one of {', '.join(VOLATILITY_METHODS)}")
+        source = request.args.get('source', 'mcmc')
+        if source not in services.VOLATILITY_SOURCES:
+            raise ValueError(f"source must be one of {', '.join(services.VOLATILITY_SOURCES)}")
+        if method is not None and 'source' in request.args:
+            raise ValueError("give either method or source, not both")
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Fast estimates are derived from prices, stored ones from their CSV
+    sources = [services.VOLATILITY_SOURCES[source]] if method is None else [services.price_source()]
+
+    try:
+        if fmt != 'json':
+            response, status = cached_columns(sources, lambda: DataService.get_volatility_columns(method, source), fmt)
+        else:
+            def build() -> List[Any]:
+                data = DataService.get_volatility_data(method, source)
+                logger.info(f"Serializing {len(data)} volatility records.")
+                return data
+            response, status = cached_json(sources, build)
+        response.vary.add('Accept')
+        return response, status
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 406
     except Exception as e:
         logger.error(f"Error serving volatility: {e}")
         return jsonify({'error': str(e)}), 500
+
+def parse_rolling_query() -> Dict[str, Any]:
+    """
+    Validates the /api/rolling query parameters.
+
+    Returns:
+        Keyword arguments for DataService.get_rolling.
+
+    Raises:
+        ValueError: If a parameter is malformed.
+    """
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    for value in (start_date, end_date):
+        if value:
+            pd.Timestamp(value)
+    window = request.args.get('window', 20, type=int)
+    if not 2 <= window <= MAX_WINDOW:
+        raise ValueError(f"window must be an integer between 2 and {MAX_WINDOW}")
+    ewma_span = request.args.get('span', type=int)
+    if 'span' in request.args and (ewma_span is None or ewma_span < 1):
+        raise ValueError("span must be a positive integer")
+    stats = [name for name in request.args.get('stat', 'mean,std').split(',') if name]
+    if not stats or any(name not in ROLLING_STATS for name in stats):
+        raise ValueError(f"stat must be a comma-separated subset of {', '.join(ROLLING_STATS)}")
+    series = request.args.get('series', 'price')
+    if series not in services.ROLLING_SERIES:
+        raise ValueError(f"series must be one of {', '.join(services.ROLLING_SERIES)}")
+    return {'window': window, 'stats': stats, 'series': series, 'ewma_span': ewma_span,
+            'start_date': start_date, 'end_date': end_date}
+
+@api_bp.route('/rolling', methods=['GET'])
+def get_rolling() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/rolling
+    Returns rolling statistics of prices or log returns.
+
+    Query params:
+        window: Rolling window in trading days (default: 20)
+        stat: Comma-separated statistics from mean, std, ewma, ewm_std (default: mean,std)
+        series: 'price' (default) or 'returns'
+        span: EWMA span (default: window)
+        start_date, end_date: Optional inclusive date range (YYYY-MM-DD)
+        format: 'json' (rows, default), 'columnar', 'arrow' or 'f64';
+            also negotiable through the Accept header
+    """
+    return serve_rolling(services.DEFAULT_SERIES)
+
+@api_bp.route('/series/<ticker>/rolling', methods=['GET'])
+def get_series_rolling(ticker: str) -> Tuple[Response, int]:
+    """
+    Endpoint: /api/series/<ticker>/rolling
+    Returns rolling statistics of one registered series; same query params as /api/rolling.
+    """
+    return serve_rolling(ticker)
+
+def serve_rolling(ticker: str) -> Tuple[Response, int]:
+    """Serves /api/rolling for one series, or 404 if the ticker is unknown."""
+    try:
+        query = dict(parse_rolling_query(), ticker=ticker)
+        fmt = negotiate_format(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        sources = [services.price_source(ticker)]
+    except KeyError as e:
+        return jsonify({'error': e.args[0]}), 404
+
+    try:
+        if fmt != 'json':
+            response, status = cached_columns(sources, lambda: DataService.get_rolling_columns(**query), fmt)
+        else:
+            response, status = cached_json(sources, lambda: DataService.get_rolling(**query))
+        response.vary.add('Accept')
+        return response, status
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 406
+    except Exception as e:
+        logger.error(f"Error serving rolling statistics: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/series', methods=['GET'])
+def get_series_list() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/series
+    Lists the price series that can be requested by ticker.
+    """
+    try:
+        tickers = services.series_tickers()
+        # Directory signatures change when series files are added or removed
+        sources = [services.SERIES_RAW_DIR, services.SERIES_STORE_DIR]
+        sources += [services.price_source(ticker) for ticker in tickers]
+        return cached_json(sources, DataService.get_series_list)
+    except Exception as e:
+        logger.error(f"Error serving series list: {e}")
+        return jsonify({'error': str(e)}), 500
+
+def parse_aligned_query() -> Dict[str, Any]:
+    """
+    Validates the /api/series/prices query parameters.
+
+    Returns:
+        Keyword arguments for DataService.get_aligned.
+
+    Raises:
+        ValueError: If a parameter is malformed.
+    """
+    query = parse_price_query()
+    tickers = [name for value in request.args.getlist('tickers') for name in value.split(',') if name]
+    if not tickers:
+        raise ValueError("tickers must name at least one series")
+    field = request.args.get('field', 'price')
+    if field not in services.ALIGN_FIELDS:
+        raise ValueError(f"field must be one of {', '.join(services.ALIGN_FIELDS)}")
+    join = request.args.get('join', 'outer')
+    if join not in services.ALIGN_JOINS:
+        raise ValueError(f"join must be one of {', '.join(services.ALIGN_JOINS)}")
+    # Repeated tickers would collide as column names
+    return dict(query, tickers=list(dict.fromkeys(tickers)), field=field, join=join)
+
+@api_bp.route('/series/prices', methods=['GET'])
+def get_aligned_series() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/series/prices
+    Returns several series aligned on their dates in one response.
+
+    Query params:
+        tickers: Series to return, repeated or comma-separated (required)
+        field: 'price' (default) or 'returns' (daily log returns)
+        join: 'outer' (all dates, null where a series has none; default) or
+            'inner' (dates every series has)
+        start_date, end_date: Optional inclusive date range (YYYY-MM-DD)
+        max_points: Optional cap on points per series, downsampled to fit
+        method: Downsampling method, 'lttb' (default) or 'minmax'
+        format: 'json' (rows, default), 'columnar', 'arrow' or 'f64';
+            also negotiable through the Accept header
+    """
+    try:
+        query = parse_aligned_query()
+        fmt = negotiate_format(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        sources = [services.price_source(ticker) for ticker in query['tickers']]
+    except KeyError as e:
+        return jsonify({'error': e.args[0]}), 404
+
+    try:
+        if fmt != 'json':
+            response, status = cached_columns(sources, lambda: DataService.get_aligned_columns(**query), fmt)
+        else:
+            response, status = cached_json(sources, lambda: DataService.get_aligned(**query))
+        response.vary.add('Accept')
+        return response, status
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 406
+    except Exception as e:
+        logger.error(f"Error serving aligned series: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/metrics', methods=['GET'])
+def get_metrics() -> Tuple[Response, int]:
+    """
+    Endpoint: /api/metrics
+    Returns request and stage latency histograms and cache counters in the
+    Prometheus text exposition format.
+    """
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4'), 200
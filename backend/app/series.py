@@ -0,0 +1,117 @@
+"""
+Registry of the named price series the API can serve.
+
+Brent is built in (see services.series_source). Other series, such as WTI,
+Dubai or product cracks, are found by convention: a raw Date,Price CSV at
+<raw_dir>/<ticker>.csv, or a columnar store at <store_dir>/<ticker>/
+written by `scripts/ingest_prices.py --ticker`. Directories are rescanned
+on every lookup, so a new file is served without a restart. Nothing is
+parsed until a series is first requested; parsed series share the dataset
+cache and its memory budget.
+"""
+
+import os
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from .store import PriceStore
+
+# Tickers double as file and directory names, so keep them to a safe alphabet
+TICKER_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_-]{0,31}$')
+
+
+class SeriesSource(NamedTuple):
+    """Where one series' prices live."""
+    ticker: str
+    csv_path: str   # raw Date,Price CSV
+    store_dir: str  # columnar store, preferred once built
+
+    def source(self) -> str:
+        """
+        Returns the file backing the series.
+
+        The columnar store wins when it has been built; its metadata file
+        changes on every update, so it doubles as the cache signature.
+        """
+        store = PriceStore(self.store_dir)
+        return store.meta_path if store.exists() else self.csv_path
+
+
+class SeriesRegistry:
+    """
+    Named price series, registered explicitly or discovered on disk.
+
+    Args:
+        raw_dir: Directory scanned for <ticker>.csv files.
+        store_dir: Directory scanned for <ticker>/ columnar stores.
+    """
+
+    def __init__(self, raw_dir: str, store_dir: str) -> None:
+        self.raw_dir = raw_dir
+        self.store_dir = store_dir
+        self._registered: Dict[str, SeriesSource] = {}
+        self._lock = threading.Lock()
+
+    def register(self, ticker: str, csv_path: str, store_dir: Optional[str] = None) -> SeriesSource:
+        """
+        Adds a series whose files live outside the scanned directories.
+
+        Raises:
+            ValueError: If the ticker is not a valid name.
+        """
+        entry = self.locate(ticker)._replace(csv_path=csv_path)
+        if store_dir:
+            entry = entry._replace(store_dir=store_dir)
+        with self._lock:
+            self._registered[ticker] = entry
+        return entry
+
+    def discovered(self) -> Dict[str, SeriesSource]:
+        """Series found in the raw and store directories."""
+        found: Dict[str, SeriesSource] = {}
+        if os.path.isdir(self.raw_dir):
+            for filename in os.listdir(self.raw_dir):
+                ticker, ext = os.path.splitext(filename)
+                if ext == '.csv' and TICKER_PATTERN.match(ticker):
+                    found[ticker] = self.locate(ticker)
+        if os.path.isdir(self.store_dir):
+            for ticker in os.listdir(self.store_dir):
+                if TICKER_PATTERN.match(ticker) and PriceStore(os.path.join(self.store_dir, ticker)).exists():
+                    found[ticker] = self.locate(ticker)
+        return found
+
+    def tickers(self) -> List[str]:
+        """All known tickers, sorted."""
+        with self._lock:
+            registered = set(self._registered)
+        return sorted(registered | set(self.discovered()))
+
+    def get(self, ticker: str) -> SeriesSource:
+        """
+        Looks up a series.
+
+        Raises:
+            KeyError: If no series with that ticker is registered or on disk.
+        """
+        with self._lock:
+            entry = self._registered.get(ticker)
+        if entry is not None:
+            return entry
+        if TICKER_PATTERN.match(ticker):
+            entry = self.locate(ticker)
+            if os.path.isfile(entry.csv_path) or PriceStore(entry.store_dir).exists():
+                return entry
+        raise KeyError(f"Unknown series: {ticker}")
+
+    def locate(self, ticker: str) -> SeriesSource:
+        """
+        Conventional paths of a series in the scanned directories, whether or not they exist yet.
+
+        Raises:
+            ValueError: If the ticker is not a valid name.
+        """
+        if not TICKER_PATTERN.match(ticker):
+            raise ValueError(f"Invalid ticker: {ticker!r}")
+        return SeriesSource(ticker, os.path.join(self.raw_dir, f'{ticker}.csv'),
+                            os.path.join(self.store_dir, ticker))
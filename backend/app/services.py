@@ -1,10 +1,34 @@
 
+import functools
 import pandas as pd
+import numpy as np
 import os
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional, Sequence
+from .analysis.bocpd import OnlineChangepointDetector
+from .analysis.intervals import IntervalIndex
+from .analysis.rolling import ROLLING_STATS, RollingWindow
+from .analysis.event_study import DEFAULT_ESTIMATION_DAYS, DEFAULT_WINDOWS, event_window_impact
+from .analysis.segmentation import crops, pelt, segment_table
+from .analysis.volatility import VOLATILITY_METHODS, GarchModel, KalmanVolatility
+from .cache import dataset_cache, estimate_nbytes, file_signature
+from .prep import ReturnsMemo, ReturnsSeries
+from .instrumentation import span, timed
+from .series import SeriesRegistry, SeriesSource
+from .store import META_FILE, PriceStore, parse_dates
+from . import trace as trace_io
+from .downsample import downsample_indices
+from .wire import to_epoch_days
 
 # Configure logging
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -13,43 +37,259 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 RESULTS_DIR = os.path.join(BASE_DIR, 'results')
 
+# Source files behind each endpoint
+PRICES_FILE = os.path.join(DATA_DIR, 'raw', 'BrentOilPrices.csv')
+EVENTS_FILE = os.path.join(DATA_DIR, 'events', 'geopolitical_events.csv')
+IMPACT_FILE = os.path.join(RESULTS_DIR, 'statistics', 'stat_change_point_impact.csv')
+TRACE_SUMMARY_FILE = os.path.join(DATA_DIR, 'processed', 'change_point_summary.csv')
+VOLATILITY_FILE = os.path.join(DATA_DIR, 'processed', 'stochastic_volatility_estimates.csv')
+# Kalman or GARCH estimates saved (and extended with --update) by scripts/run_volatility.py
+FILTER_VOLATILITY_FILE = os.path.join(DATA_DIR, 'processed', 'volatility_filter_estimates.csv')
+# Stored volatility estimates by the name /api/volatility selects them with
+VOLATILITY_SOURCES = {'mcmc': VOLATILITY_FILE, 'filter': FILTER_VOLATILITY_FILE}
+
+# Columnar copy of PRICES_FILE written by scripts/ingest_prices.py
+PRICE_STORE_DIR = os.path.join(DATA_DIR, 'processed', 'brent_store')
+
+# Further price series: raw CSVs and columnar stores named after their ticker
+DEFAULT_SERIES = 'brent'
+SERIES_RAW_DIR = os.path.join(DATA_DIR, 'raw', 'series')
+SERIES_STORE_DIR = os.path.join(DATA_DIR, 'processed', 'series')
+SERIES_REGISTRY = SeriesRegistry(SERIES_RAW_DIR, SERIES_STORE_DIR)
+
+# Prepared return series memoized by app.prep
+PREP_CACHE_DIR = os.path.join(DATA_DIR, 'processed', 'prep')
+
+# Full posterior traces: ArviZ NetCDF from PyMC, or the resumable sampler's store
+TRACE_FILE = os.path.join(DATA_DIR, 'processed', 'change_point_trace.nc')
+TRACE_STORE_DIR = os.path.join(DATA_DIR, 'processed', 'change_point_chains')
+
+# Checkpoint of the streaming change point detector
+BOCPD_STATE_FILE = os.path.join(DATA_DIR, 'processed', 'bocpd_state.npz')
+ONLINE_START_DATE = '2012-01-01'
+
+# Most segmentations a CROPS penalty path may hold when requested through the API
+CROPS_MAX_SEGMENTATIONS = 50
+
+# Memory budget of the rolling statistics kept between requests
+ROLLING_CACHE_MAX_BYTES = int(os.environ.get('API_ROLLING_CACHE_MB', 256)) * 2 ** 20
+
+# Series the rolling statistics can be computed on
+ROLLING_SERIES = ('price', 'returns')
+
+# Values and date joins offered when aligning several series
+ALIGN_FIELDS = ('price', 'returns')
+ALIGN_JOINS = ('outer', 'inner')
+
+
+def _parse_prices(file_path: str) -> pd.DataFrame:
+    """Parses the raw price CSV into a date-sorted frame."""
+    with span('read_csv'):
+        df = pd.read_csv(file_path)
+    with span('parse_dates'):
+        df['Date'] = parse_dates(df['Date'])
+    return df.sort_values('Date').reset_index(drop=True)
+
+
+def _load_store_prices(meta_path: str) -> pd.DataFrame:
+    """Opens the columnar price store that owns meta_path."""
+    with span('store_load'):
+        return PriceStore(os.path.dirname(meta_path)).load_frame()
+
+
+def series_source(ticker: str = DEFAULT_SERIES) -> SeriesSource:
+    """
+    Looks up a price series: Brent, or one from SERIES_REGISTRY.
+    
+    Raises:
+        KeyError: If the ticker is unknown.
+    """
+    if ticker == DEFAULT_SERIES:
+        return SeriesSource(DEFAULT_SERIES, PRICES_FILE, PRICE_STORE_DIR)
+    return SERIES_REGISTRY.get(ticker)
+
+
+def series_tickers() -> List[str]:
+    """Every servable ticker, Brent first."""
+    return [DEFAULT_SERIES] + [ticker for ticker in SERIES_REGISTRY.tickers() if ticker != DEFAULT_SERIES]
+
+
+def price_source(ticker: str = DEFAULT_SERIES) -> str:
+    """
+    Returns the file backing a price series.
+    
+    The columnar store is preferred when it has been built; its metadata
+    file changes on every update, so it doubles as the cache signature.
+    
+    Raises:
+        KeyError: If the ticker is unknown.
+    """
+    return series_source(ticker).source()
+
+
+def trace_source() -> Optional[str]:
+    """
+    Returns the file to open for the full posterior trace, if any.
+    
+    The NetCDF trace is used when xarray can read it; otherwise the chunked
+    store written by `run_changepoint.py --engine gibbs` (via its config.json).
+    """
+    if os.path.isfile(TRACE_FILE) and trace_io.xr is not None:
+        return TRACE_FILE
+    config_path = os.path.join(TRACE_STORE_DIR, 'config.json')
+    return config_path if os.path.isfile(config_path) else None
+
+
+def _parse_events(file_path: str) -> pd.DataFrame:
+    """Parses the geopolitical events CSV."""
+    df = pd.read_csv(file_path)
+    # Event dates are ISO (YYYY-MM-DD); dayfirst parsing would swap month and day
+    df['Date'] = pd.to_datetime(df['Date'], format='ISO8601')
+    return df
+
+
+def _parse_trace_summary(file_path: str) -> pd.DataFrame:
+    """Parses the PyMC summary CSV with 'parameter' as a column."""
+    df = pd.read_csv(file_path, index_col=0)
+    # Reset index to make 'parameter' a column
+    return df.reset_index().rename(columns={'index': 'parameter'})
+
+
+def _parse_volatility(file_path: str) -> pd.DataFrame:
+    """Parses the volatility estimates CSV (ISO dates)."""
+    df = pd.read_csv(file_path)
+    df['Date'] = pd.to_datetime(df['Date'], format='ISO8601')
+    return df
+
+
+def _align(days: np.ndarray, values: np.ndarray, dates: np.ndarray) -> np.ndarray:
+    """Values of a sorted series at `dates`, NaN where it has no observation."""
+    column = np.full(len(dates), np.nan)
+    if len(days) == 0:
+        return column
+    pos = np.minimum(np.searchsorted(days, dates), len(days) - 1)
+    found = days[pos] == dates
+    column[found] = values[pos[found]]
+    return column
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Exclusive lock on `path` shared by every process on the host (no-op without fcntl)."""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
 class DataService:
+    # Streaming detector shared across requests, resumed from BOCPD_STATE_FILE
+    _online_detector: Optional[OnlineChangepointDetector] = None
+    # Signature of BOCPD_STATE_FILE as this process last read or wrote it
+    _online_signature: Optional[tuple] = None
+    _online_lock = threading.Lock()
+    _returns_memo = ReturnsMemo(PREP_CACHE_DIR)
+    # Rolling statistics per (ticker, series, window, ewma_span), extended as prices are appended;
+    # least recently used first, trimmed to ROLLING_CACHE_MAX_BYTES
+    _rolling_states: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+    _rolling_lock = threading.Lock()
+
     @staticmethod
-    def get_prices(start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+    @timed
+    def get_prices(start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   max_points: Optional[int] = None, method: str = 'lttb',
+                   ticker: str = DEFAULT_SERIES) -> List[Dict[str, Any]]:
         """
-        Reads historical Brent Oil Prices.
+        Reads historical Brent Oil Prices (or another registered series).
         
         Args:
             start_date: Optional filter start date (YYYY-MM-DD)
             end_date: Optional filter end date (YYYY-MM-DD)
+            max_points: Optional cap on returned points; the range is
+                downsampled with a shape-preserving method when exceeded
+            method: Downsampling method ('lttb' or 'minmax')
+            ticker: Price series to read (see series_tickers)
             
         Returns:
             List of dictionaries containing Date and Price.
+            
+        Raises:
+            KeyError: If the ticker is unknown.
         """
-        file_path = os.path.join(DATA_DIR, 'raw', 'BrentOilPrices.csv')
+        file_path = price_source(ticker)
         if not os.path.exists(file_path):
             logger.warning(f"File not found: {file_path}")
             return []
             
         try:
-            df = pd.read_csv(file_path)
-            df['Date'] = pd.to_datetime(df['Date'], format='mixed', dayfirst=True)
-            
-            # Sort and filter
-            df = df.sort_values('Date')
-            if start_date:
-                df = df[df['Date'] >= start_date]
-            if end_date:
-                df = df[df['Date'] <= end_date]
-                
+            df = DataService._price_frame(start_date, end_date, max_points, method, ticker)
             logger.info(f"Loaded {len(df)} price records.")
             # Convert to list of dicts for JSON
-            return df[['Date', 'Price']].astype({'Date': 'str'}).to_dict(orient='records')
+            with span('to_dict'):
+                return df[['Date', 'Price']].astype({'Date': 'str'}).to_dict(orient='records')
         except Exception as e:
             logger.error(f"Error loading prices: {e}")
             return []
 
     @staticmethod
+    @timed
+    def get_price_columns(start_date: Optional[str] = None, end_date: Optional[str] = None,
+                          max_points: Optional[int] = None, method: str = 'lttb',
+                          ticker: str = DEFAULT_SERIES) -> Dict[str, np.ndarray]:
+        """
+        Reads historical Brent Oil Prices as columns.
+        
+        Takes the same arguments as get_prices.
+        
+        Returns:
+            Dict with 'Date' (int64 epoch days) and 'Price' (float64) arrays.
+        """
+        file_path = price_source(ticker)
+        if not os.path.exists(file_path):
+            logger.warning(f"File not found: {file_path}")
+            return {'Date': np.empty(0, dtype=np.int64), 'Price': np.empty(0)}
+        
+        df = DataService._price_frame(start_date, end_date, max_points, method, ticker)
+        return {
+            'Date': to_epoch_days(df['Date'].to_numpy()),
+            'Price': df['Price'].to_numpy(dtype=np.float64),
+        }
+
+    @staticmethod
+    def _price_frame(start_date: Optional[str], end_date: Optional[str],
+                     max_points: Optional[int], method: str, ticker: str = DEFAULT_SERIES) -> pd.DataFrame:
+        """Returns the cached price frame sliced to a range and downsampled."""
+        df = DataService.get_price_frame(ticker)
+        df = DataService._slice_dates(df, start_date, end_date)
+        if max_points and len(df) > max_points:
+            keep = downsample_indices(to_epoch_days(df['Date'].to_numpy()), df['Price'].to_numpy(), max_points, method)
+            df = df.iloc[keep]
+        return df
+
+    @staticmethod
+    def _slice_dates(df: pd.DataFrame, start_date: Optional[str] = None,
+                     end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Restricts a date-sorted frame to [start_date, end_date].
+        
+        Uses binary search on the sorted Date column instead of a boolean
+        mask, so a range lookup does not rescan the whole frame.
+        """
+        lo, hi = 0, len(df)
+        if start_date:
+            lo = int(df['Date'].searchsorted(pd.Timestamp(start_date), side='left'))
+        if end_date:
+            hi = int(df['Date'].searchsorted(pd.Timestamp(end_date), side='right'))
+        return df.iloc[lo:max(lo, hi)]
+
+    @staticmethod
+    @timed
     def get_events() -> List[Dict[str, Any]]:
         """
         Reads Geopolitical Events.
@@ -57,15 +297,13 @@ class DataService:
         Returns:
             List of dictionaries containing Event data.
         """
-        file_path = os.path.join(DATA_DIR, 'events', 'geopolitical_events.csv')
+        file_path = EVENTS_FILE
         if not os.path.exists(file_path):
             logger.warning(f"File not found: {file_path}")
             return []
             
         try:
-            df = pd.read_csv(file_path)
-            # Ensure consistent date format
-            df['Date'] = pd.to_datetime(df['Date'], format='mixed', dayfirst=True)
+            df = dataset_cache.get(file_path, _parse_events)
             logger.info(f"Loaded {len(df)} events.")
             return df.astype({'Date': 'str'}).to_dict(orient='records')
         except Exception as e:
@@ -73,6 +311,111 @@ class DataService:
             return []
 
     @staticmethod
+    @timed
+    def get_event_impact(windows: Sequence[int] = DEFAULT_WINDOWS,
+                         estimation_days: int = DEFAULT_ESTIMATION_DAYS) -> List[Dict[str, Any]]:
+        """
+        Runs the event study over every geopolitical event.
+        
+        Uses log returns over the full price history, so events before
+        the 2012 modeling window are covered too.
+        
+        Args:
+            windows: Pre/post window sizes in trading days
+            estimation_days: Trading days used to estimate normal returns
+            
+        Returns:
+            List of records, one per (event, window); undefined statistics are None.
+        """
+        if not os.path.exists(EVENTS_FILE):
+            logger.warning(f"File not found: {EVENTS_FILE}")
+            return []
+        
+        events = dataset_cache.get(EVENTS_FILE, _parse_events)
+        series = DataService.get_returns_series(None)
+        table = event_window_impact(series.dates, series.log_returns, events, windows, estimation_days)
+        logger.info(f"Computed impact for {len(events)} events x {len(windows)} windows.")
+        return table.astype(object).where(table.notna(), None).to_dict(orient='records')
+
+    @staticmethod
+    @timed
+    def get_break_intervals(method: str = 'bayesian', penalty: Optional[float] = None) -> pd.DataFrame:
+        """
+        Lists detected breaks as date intervals.
+        
+        Args:
+            method: 'bayesian' for the single change point and its 94% HDI
+                from the trace summary, or 'pelt' for the multiple change
+                points (point intervals)
+            penalty: PELT penalty (default: BIC)
+            
+        Returns:
+            DataFrame with Break Date, Lower and Upper (datetime64[D]).
+        """
+        series = DataService.get_returns_series('2012-01-01')
+        dates = series.dates
+        if method == 'bayesian':
+            if not os.path.exists(TRACE_SUMMARY_FILE):
+                logger.warning(f"File not found: {TRACE_SUMMARY_FILE}")
+                return pd.DataFrame(columns=['Break Date', 'Lower', 'Upper'])
+            summary = dataset_cache.get(TRACE_SUMMARY_FILE, _parse_trace_summary).set_index('parameter')
+            # tau indexes the modeled returns; clamp in case the data has grown since the fit
+            positions = np.clip(summary.loc['tau', ['mean', 'hdi_3%', 'hdi_97%']].to_numpy().astype(int),
+                                0, len(dates) - 1)
+            return pd.DataFrame({'Break Date': dates[positions[:1]], 'Lower': dates[positions[1:2]],
+                                 'Upper': dates[positions[2:]]})
+        if method == 'pelt':
+            changepoints = dates[pelt(series.log_returns, penalty).changepoints]
+            return pd.DataFrame({'Break Date': changepoints, 'Lower': changepoints, 'Upper': changepoints})
+        raise ValueError("method must be 'bayesian' or 'pelt'")
+
+    @staticmethod
+    @timed
+    def get_event_breaks(method: str = 'bayesian', window: int = 90,
+                         penalty: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Joins events to the breaks whose interval lies within `window` days.
+        
+        Args:
+            method: Break source, see get_break_intervals
+            window: Maximum distance in calendar days between an event and
+                a break interval
+            penalty: PELT penalty (default: BIC)
+            
+        Returns:
+            List of event/break pairs in event order. Lag_Days is break date
+            minus event date, so a positive lag means the event came first.
+        """
+        if not os.path.exists(EVENTS_FILE):
+            logger.warning(f"File not found: {EVENTS_FILE}")
+            return []
+        
+        events = dataset_cache.get(EVENTS_FILE, _parse_events)
+        breaks = DataService.get_break_intervals(method, penalty)
+        event_days = events['Date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        lower = breaks['Lower'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        upper = breaks['Upper'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        center = breaks['Break Date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        
+        event_pos, break_pos = IntervalIndex(lower, upper).stab(event_days, window)
+        order = np.lexsort((break_pos, event_pos))
+        event_pos, break_pos = event_pos[order], break_pos[order]
+        as_date = lambda days: np.datetime_as_string(days.astype('datetime64[D]')).tolist()
+        matches = pd.DataFrame({
+            'Event': events['Event'].to_numpy()[event_pos],
+            'Date': as_date(event_days[event_pos]),
+            'Category': events['Category'].to_numpy()[event_pos] if 'Category' in events else None,
+            'Break Date': as_date(center[break_pos]),
+            'Break Lower': as_date(lower[break_pos]),
+            'Break Upper': as_date(upper[break_pos]),
+            'Lag_Days': center[break_pos] - event_days[event_pos],
+            'Within Interval': (lower[break_pos] <= event_days[event_pos]) & (event_days[event_pos] <= upper[break_pos]),
+        })
+        logger.info(f"Matched {len(matches)} event/break pairs ({method}, window={window}).")
+        return matches.to_dict(orient='records')
+
+    @staticmethod
+    @timed
     def get_changepoint_summary() -> Dict[str, float]:
         """
         Reads change point summary statistics.
@@ -80,13 +423,13 @@ class DataService:
         Returns:
             Dict mapping metrics to values.
         """
-        file_path = os.path.join(RESULTS_DIR, 'statistics', 'stat_change_point_impact.csv')
+        file_path = IMPACT_FILE
         if not os.path.exists(file_path):
             logger.warning(f"File not found: {file_path}")
             return {}
             
         try:
-            df = pd.read_csv(file_path)
+            df = dataset_cache.get(file_path, pd.read_csv)
             # Convert to a simple key-value dict
             return dict(zip(df['Metric'], df['Value']))
         except Exception as e:
@@ -94,6 +437,7 @@ class DataService:
             return {}
 
     @staticmethod
+    @timed
     def get_changepoint_trace() -> List[Dict[str, Any]]:
         """
         Reads the raw changepoint trace summary (from PyMC).
@@ -101,37 +445,576 @@ class DataService:
         Returns:
             List of trace parameters.
         """
-        file_path = os.path.join(DATA_DIR, 'processed', 'change_point_summary.csv')
+        file_path = TRACE_SUMMARY_FILE
         if not os.path.exists(file_path):
             logger.warning(f"File not found: {file_path}")
             return []
         
         try:
-            df = pd.read_csv(file_path, index_col=0)
-            # Reset index to make 'parameter' a column
-            df = df.reset_index().rename(columns={'index': 'parameter'})
+            df = dataset_cache.get(file_path, _parse_trace_summary)
             return df.to_dict(orient='records')
         except Exception as e:
             logger.error(f"Error loading changepoint trace: {e}")
             return []
 
     @staticmethod
-    def get_volatility_data() -> List[Dict[str, Any]]:
+    def _open_trace() -> trace_io.Trace:
+        """Returns the cached lazy trace handle; raises FileNotFoundError if there is none."""
+        source = trace_source()
+        if source is None:
+            raise FileNotFoundError("No posterior trace available")
+        return dataset_cache.get(source, trace_io.open_trace)
+
+    @staticmethod
+    @timed
+    def get_trace_draws(var_names: Optional[List[str]] = None, thin: int = 1) -> Dict[str, Any]:
+        """
+        Returns thinned posterior draws per chain.
+        
+        Args:
+            var_names: Variables to return (default: all scalar parameters)
+            thin: Keep every thin-th draw
+            
+        Returns:
+            Dict with the trace shape and, per variable, a list of chains.
+        """
+        trace = DataService._open_trace()
+        names = trace_io.check_var_names(trace, var_names)
+        chains, draws = trace.shape
+        return {
+            'chains': chains,
+            'draws': draws,
+            'thin': thin,
+            'values': {name: trace.draws(name, thin).tolist() for name in names},
+        }
+
+    @staticmethod
+    @timed
+    def get_trace_histogram(var_name: str = 'tau', bins: int = 50) -> Dict[str, Any]:
+        """
+        Histograms all draws of one variable.
+        
+        Args:
+            var_name: Variable to histogram
+            bins: Maximum number of bins
+            
+        Returns:
+            Dict with bin edges and counts.
+        """
+        trace = DataService._open_trace()
+        trace_io.check_var_names(trace, [var_name])
+        return dict(trace_io.histogram(trace.draws(var_name), bins), var=var_name)
+
+    @staticmethod
+    @timed
+    def get_trace_hdi(var_names: Optional[List[str]] = None, prob: float = 0.94) -> Dict[str, Any]:
+        """
+        Recomputes posterior means and highest-density intervals.
+        
+        Args:
+            var_names: Variables to summarize (default: all scalar parameters)
+            prob: Interval probability mass
+            
+        Returns:
+            Dict of variable name to mean, lower, upper and prob.
+        """
+        trace = DataService._open_trace()
+        names = trace_io.check_var_names(trace, var_names)
+        return {name: trace_io.interval(trace.draws(name), prob) for name in names}
+
+    @staticmethod
+    @timed
+    def get_posterior_summary(prob: float = 0.94) -> Dict[str, Any]:
+        """
+        Returns the full posterior summary of the trace.
+        
+        The summary is computed in one pass over all draws and cached next
+        to the trace, so it is only recomputed when the trace changes.
+        
+        Args:
+            prob: HDI probability mass of the summary table
+            
+        Returns:
+            Dict with the summary table, tau mode and interval, P(mean
+            increased), the mean and volatility change distributions and
+            histograms (see analysis.posterior.PosteriorSummary).
+        """
+        source = trace_source()
+        if source is None:
+            raise FileNotFoundError("No posterior trace available")
+        trace = DataService._open_trace()
+        return trace_io.cached_summary(source, trace, prob).to_dict()
+
+    @staticmethod
+    @timed
+    def estimate_volatility(method: str = 'garch', start_date: Optional[str] = '2012-01-01') -> pd.DataFrame:
+        """
+        Estimates daily volatility from the price series.
+        
+        Args:
+            method: 'garch' (GARCH(1,1) conditional volatility) or 'kalman'
+                (smoothed random-walk log volatility)
+            start_date: First date of the modeled returns
+            
+        Returns:
+            DataFrame with Date and Volatility, in the layout of VOLATILITY_FILE.
+        """
+        series = DataService.get_returns_series(start_date)
+        if method == 'garch':
+            volatility = GarchModel.fit(series.log_returns).volatility(series.log_returns)
+        elif method == 'kalman':
+            volatility = KalmanVolatility().fit(series.log_returns)
+        else:
+            raise ValueError(f"method must be one of {', '.join(VOLATILITY_METHODS)}")
+        return pd.DataFrame({'Date': series.dates.astype('datetime64[s]'), 'Volatility': volatility})
+
+    @staticmethod
+    def _volatility_frame(method: Optional[str], source: str = 'mcmc') -> Optional[pd.DataFrame]:
+        """Stored estimates from `source` when method is None, otherwise a fresh estimate."""
+        if method is not None:
+            return DataService.estimate_volatility(method)
+        path = VOLATILITY_SOURCES[source]
+        if not os.path.exists(path):
+            logger.warning(f"File not found: {path}")
+            return None
+        return dataset_cache.get(path, _parse_volatility)
+
+    @staticmethod
+    @timed
+    def get_volatility_data(method: Optional[str] = None, source: str = 'mcmc') -> List[Dict[str, Any]]:
         """
         Reads the stochastic volatility estimates.
         
+        Args:
+            method: None for stored estimates, or an estimator from
+                VOLATILITY_METHODS to compute them from prices
+            source: Stored estimates to read when method is None: 'mcmc'
+                (VOLATILITY_FILE) or 'filter' (FILTER_VOLATILITY_FILE)
+            
         Returns:
             List of volatility estimates.
         """
-        file_path = os.path.join(DATA_DIR, 'processed', 'stochastic_volatility_estimates.csv')
-        if not os.path.exists(file_path):
-            logger.warning(f"File not found: {file_path}")
-            return []
-            
         try:
-            df = pd.read_csv(file_path)
+            df = DataService._volatility_frame(method, source)
+            if df is None:
+                return []
             # Assuming format: Date, Volatility or similar
-            return df.to_dict(orient='records')
+            with span('to_dict'):
+                return df.astype({'Date': 'str'}).to_dict(orient='records')
         except Exception as e:
             logger.error(f"Error loading volatility data: {e}")
             return []
+
+    @staticmethod
+    @timed
+    def get_volatility_columns(method: Optional[str] = None, source: str = 'mcmc') -> Dict[str, np.ndarray]:
+        """
+        Reads the stochastic volatility estimates as columns.
+        
+        Args:
+            method: As in get_volatility_data
+            source: As in get_volatility_data
+            
+        Returns:
+            Dict with 'Date' (int64 epoch days) and one float64 array per
+            estimate column.
+        """
+        df = DataService._volatility_frame(method, source)
+        if df is None:
+            return {'Date': np.empty(0, dtype=np.int64)}
+        
+        columns = {'Date': to_epoch_days(df['Date'].to_numpy())}
+        for name in df.columns.drop('Date'):
+            columns[name] = df[name].to_numpy(dtype=np.float64)
+        return columns
+
+    @staticmethod
+    @timed
+    def get_rolling_columns(window: int = 20, stats: Sequence[str] = ('mean', 'std'),
+                            series: str = 'price', ewma_span: Optional[int] = None,
+                            start_date: Optional[str] = None,
+                            end_date: Optional[str] = None,
+                            ticker: str = DEFAULT_SERIES) -> Dict[str, np.ndarray]:
+        """
+        Rolling statistics of prices or daily log returns as columns.
+        
+        Statistics are computed over the full history, so values at the
+        start of a requested range still use the days before it.
+        
+        Args:
+            window: Rolling window in trading days
+            stats: Names from ROLLING_STATS
+            series: 'price' or 'returns' (log returns)
+            ewma_span: EWMA span (defaults to window)
+            start_date: Optional filter start date (YYYY-MM-DD)
+            end_date: Optional filter end date (YYYY-MM-DD)
+            ticker: Price series to read (see series_tickers)
+            
+        Returns:
+            Dict with 'Date' (int64 epoch days), 'Value' (the series) and
+            one float64 array per requested statistic.
+        """
+        history = DataService._rolling_history(series, window, ewma_span, ticker)
+        days = history['Date']
+        lo, hi = 0, len(days)
+        if start_date:
+            lo = int(np.searchsorted(days, to_epoch_days(pd.Timestamp(start_date).to_datetime64()), side='left'))
+        if end_date:
+            hi = int(np.searchsorted(days, to_epoch_days(pd.Timestamp(end_date).to_datetime64()), side='right'))
+        return {name: history[name][lo:max(lo, hi)] for name in ('Date', 'Value', *stats)}
+
+    @staticmethod
+    @timed
+    def get_rolling(**query: Any) -> List[Dict[str, Any]]:
+        """
+        Rolling statistics as records (see get_rolling_columns).
+        
+        Returns:
+            List of dictionaries with Date, Value and the requested
+            statistics; undefined values (before a full window) are None.
+        """
+        columns = DataService.get_rolling_columns(**query)
+        df = pd.DataFrame(columns)
+        df['Date'] = columns['Date'].astype('datetime64[D]').astype(str)
+        return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+    @staticmethod
+    def _rolling_history(series: str, window: int, ewma_span: Optional[int],
+                         ticker: str = DEFAULT_SERIES) -> Dict[str, np.ndarray]:
+        """
+        Full-history rolling columns, kept up to date incrementally.
+        
+        The first request fills the columns in one vectorized pass. When the
+        price series later grows by appended rows (same prefix), only the new
+        observations are pushed through the running state, each in O(1).
+        States are evicted least recently used first once their columns
+        exceed ROLLING_CACHE_MAX_BYTES; the newest is always kept.
+        
+        Raises:
+            ValueError: If the series is unknown or shorter than the window.
+        """
+        if series not in ROLLING_SERIES:
+            raise ValueError(f"series must be one of {', '.join(ROLLING_SERIES)}")
+        df = DataService.get_price_frame(ticker)
+        prices = df['Price'].to_numpy(dtype=np.float64)
+        days = to_epoch_days(df['Date'].to_numpy())
+        key = (ticker, series, window, ewma_span)
+        
+        with DataService._rolling_lock:
+            states = DataService._rolling_states
+            entry = states.get(key)
+            if entry is not None and entry['frame'] is df:
+                states.move_to_end(key)
+                return entry['columns']
+            
+            rows = 0 if entry is None else len(entry['prices'])
+            appended = (entry is not None and 0 < rows <= len(prices)
+                        and np.array_equal(prices[:rows], entry['prices'])
+                        and np.array_equal(days[:rows], entry['days']))
+            if appended:
+                roller, columns = entry['roller'], entry['columns']
+                new_values = prices[rows:] if series == 'price' else np.diff(np.log(prices[rows - 1:]))
+                new_stats = roller.extend(new_values)
+                columns = {
+                    'Date': days if series == 'price' else days[1:],
+                    'Value': np.concatenate([columns['Value'], new_values]),
+                    **{name: np.concatenate([columns[name], new_stats[name]]) for name in ROLLING_STATS},
+                }
+                logger.info(f"Rolling {series} statistics absorbed {len(new_values)} observations.")
+            else:
+                values = prices if series == 'price' else np.diff(np.log(prices))
+                if window > len(values):
+                    raise ValueError(f"window exceeds the {len(values)} observations of the series")
+                roller = RollingWindow(window, ewma_span)
+                columns = {'Date': days if series == 'price' else days[1:], 'Value': values,
+                           **roller.fill(values)}
+            
+            # prices is a view of the cached frame; the price series' Date column is days itself
+            arrays = {id(array): array for array in (days, roller.buffer, *columns.values())}
+            nbytes = sum(estimate_nbytes(array) for array in arrays.values())
+            states[key] = {'frame': df, 'prices': prices, 'days': days,
+                           'roller': roller, 'columns': columns, 'nbytes': nbytes}
+            states.move_to_end(key)
+            while len(states) > 1 and sum(e['nbytes'] for e in states.values()) > ROLLING_CACHE_MAX_BYTES:
+                evicted, _ = states.popitem(last=False)
+                logger.info(f"Evicted rolling statistics {evicted}.")
+            return columns
+
+    @staticmethod
+    @timed
+    def get_price_frame(ticker: str = DEFAULT_SERIES) -> pd.DataFrame:
+        """
+        Returns the full, date-sorted Date/Price frame of a series.
+        
+        Read from the columnar store when present, otherwise parsed from
+        the raw CSV. The frame is cached and shared; do not modify it.
+        """
+        source = price_source(ticker)
+        loader = _load_store_prices if os.path.basename(source) == META_FILE else _parse_prices
+        return dataset_cache.get(source, loader)
+
+    @staticmethod
+    @timed
+    def get_returns_series(start_date: Optional[str] = '2012-01-01',
+                           ticker: str = DEFAULT_SERIES) -> ReturnsSeries:
+        """
+        Prepares daily log returns from the price series.
+        
+        Same preparation as the modeling scripts: sort by date, keep rows
+        from start_date on, take log(Price / previous Price), drop NaNs.
+        The result is memoized on disk by source contents and start date.
+        
+        Args:
+            start_date: First date to keep (YYYY-MM-DD), or None for all
+            ticker: Price series to read (see series_tickers)
+            
+        Returns:
+            ReturnsSeries of dates, prices and log returns.
+        """
+        def load_prices():
+            df = DataService.get_price_frame(ticker)
+            return df['Date'].to_numpy(), df['Price'].to_numpy()
+
+        return DataService._returns_memo.get(price_source(ticker), start_date, load_prices)
+
+    @staticmethod
+    @timed
+    def get_log_returns(start_date: Optional[str] = '2012-01-01',
+                        ticker: str = DEFAULT_SERIES) -> pd.DataFrame:
+        """
+        Prepared log returns as a DataFrame (see get_returns_series).
+        
+        Returns:
+            DataFrame with Date, Price and Log_Return columns.
+        """
+        return DataService.get_returns_series(start_date, ticker).to_frame()
+
+    @staticmethod
+    @timed
+    def get_series_list() -> List[Dict[str, Any]]:
+        """
+        Lists the servable price series without loading any of them.
+        
+        Returns:
+            List of dictionaries with ticker, source ('store' or 'csv') and
+            whether the source exists; stores also report their row count
+            and first/last dates from their metadata.
+        """
+        records = []
+        for ticker in series_tickers():
+            entry = series_source(ticker)
+            source = entry.source()
+            in_store = os.path.basename(source) == META_FILE
+            record: Dict[str, Any] = {'ticker': ticker, 'source': 'store' if in_store else 'csv',
+                                      'available': os.path.exists(source)}
+            if in_store:
+                meta = PriceStore(entry.store_dir).meta()
+                record.update(rows=meta.get('rows'), first_date=meta.get('first_date'),
+                              last_date=meta.get('last_date'))
+            records.append(record)
+        return records
+
+    @staticmethod
+    @timed
+    def get_aligned_columns(tickers: Sequence[str], field: str = 'price', join: str = 'outer',
+                            start_date: Optional[str] = None, end_date: Optional[str] = None,
+                            max_points: Optional[int] = None, method: str = 'lttb') -> Dict[str, np.ndarray]:
+        """
+        Several series aligned on their dates, as columns.
+        
+        Each series is loaded lazily through the dataset cache, so only the
+        requested ones are read and they share its memory budget.
+        
+        Args:
+            tickers: Series to align, in column order
+            field: 'price' or 'returns' (daily log returns)
+            join: 'outer' (all dates, NaN where a series has no value) or
+                'inner' (dates every series has)
+            start_date: Optional filter start date (YYYY-MM-DD)
+            end_date: Optional filter end date (YYYY-MM-DD)
+            max_points: Optional cap on points per series; each series is
+                downsampled on its own and the union of the kept dates is
+                returned, so every line keeps its shape
+            method: Downsampling method ('lttb' or 'minmax')
+            
+        Returns:
+            Dict with 'Date' (int64 epoch days) and one float64 array per ticker.
+            
+        Raises:
+            KeyError: If a ticker is unknown.
+        """
+        if field not in ALIGN_FIELDS:
+            raise ValueError(f"field must be one of {', '.join(ALIGN_FIELDS)}")
+        if join not in ALIGN_JOINS:
+            raise ValueError(f"join must be one of {', '.join(ALIGN_JOINS)}")
+        
+        parts = []
+        for ticker in tickers:
+            if field == 'price':
+                df = DataService.get_price_frame(ticker)
+                days, values = to_epoch_days(df['Date'].to_numpy()), df['Price'].to_numpy(dtype=np.float64)
+            else:
+                series = DataService.get_returns_series(None, ticker)
+                days, values = to_epoch_days(series.dates), series.log_returns
+            lo, hi = 0, len(days)
+            if start_date:
+                lo = int(np.searchsorted(days, to_epoch_days(pd.Timestamp(start_date).to_datetime64()), side='left'))
+            if end_date:
+                hi = int(np.searchsorted(days, to_epoch_days(pd.Timestamp(end_date).to_datetime64()), side='right'))
+            parts.append((days[lo:max(lo, hi)], values[lo:max(lo, hi)]))
+        
+        all_days = [days for days, _ in parts]
+        if not all_days:
+            dates = np.empty(0, dtype=np.int64)
+        elif join == 'outer':
+            dates = np.unique(np.concatenate(all_days))
+        else:
+            dates = functools.reduce(np.intersect1d, all_days)
+        columns = {'Date': dates}
+        for ticker, (days, values) in zip(tickers, parts):
+            columns[ticker] = _align(days, values, dates)
+        
+        if max_points and len(dates) > max_points:
+            keep = []
+            for ticker in tickers:
+                present = np.flatnonzero(~np.isnan(columns[ticker]))
+                keep.append(present[downsample_indices(dates[present], columns[ticker][present], max_points, method)])
+            keep = np.unique(np.concatenate(keep))
+            columns = {name: values[keep] for name, values in columns.items()}
+        logger.info(f"Aligned {len(tickers)} series on {len(columns['Date'])} dates ({join} join).")
+        return columns
+
+    @staticmethod
+    @timed
+    def get_aligned(**query: Any) -> List[Dict[str, Any]]:
+        """
+        Aligned series as records (see get_aligned_columns).
+        
+        Returns:
+            List of dictionaries with Date and one value per ticker;
+            dates a series does not cover are None.
+        """
+        columns = DataService.get_aligned_columns(**query)
+        df = pd.DataFrame(columns)
+        df['Date'] = columns['Date'].astype('datetime64[D]').astype(str)
+        return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+    @staticmethod
+    @timed
+    def get_changepoints(penalty: Optional[float] = None, min_size: int = 5,
+                         start_date: Optional[str] = '2012-01-01',
+                         penalty_min: Optional[float] = None,
+                         penalty_max: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Detects multiple change points in log returns with PELT.
+        
+        Args:
+            penalty: Penalty per change point (defaults to BIC)
+            min_size: Minimum segment length in trading days
+            start_date: First date of the analysed series
+            penalty_min: With penalty_max, also returns the CROPS penalty path
+            penalty_max: Upper end of the CROPS penalty range
+            
+        Returns:
+            Dict with the change point dates, per-segment statistics and,
+            when requested, the penalty path.
+        
+        Raises:
+            ValueError: If the penalty range spans more than
+                CROPS_MAX_SEGMENTATIONS segmentations.
+        """
+        source = price_source()
+        if not os.path.exists(source):
+            logger.warning(f"File not found: {source}")
+            return {'changepoints': [], 'segments': []}
+        
+        df = DataService.get_log_returns(start_date)
+        x = df['Log_Return'].to_numpy()
+        result = pelt(x, penalty, min_size)
+        dates = df['Date'].dt.strftime('%Y-%m-%d')
+        segments = segment_table(x, df['Date'], result.changepoints)
+        logger.info(f"Detected {result.n_changepoints} change points (penalty={result.penalty:.2f}).")
+        response: Dict[str, Any] = {
+            'penalty': result.penalty,
+            'changepoints': [dates[i] for i in result.changepoints],
+            'segments': segments.to_dict(orient='records'),
+        }
+        if penalty_min is not None and penalty_max is not None:
+            response['path'] = [
+                {
+                    'penalty': seg.penalty,
+                    'n_changepoints': seg.n_changepoints,
+                    'cost': seg.cost,
+                    'changepoints': [dates[i] for i in seg.changepoints],
+                }
+                for seg in crops(x, penalty_min, penalty_max, min_size, CROPS_MAX_SEGMENTATIONS)
+            ]
+        return response
+
+    @staticmethod
+    @timed
+    def get_online_regime(window: int = 20) -> Dict[str, Any]:
+        """
+        Reports the current regime from the streaming change point detector.
+        
+        Only log returns newer than the detector's last checkpoint are fed
+        to it, so history is never recomputed. The checkpoint is written
+        back whenever new observations were absorbed. API workers share it
+        under a file lock: a worker resumes from the checkpoint whenever
+        another one has written it since.
+        
+        Args:
+            window: Trading days considered "recent" for the change probability
+            
+        Returns:
+            Dict with the current run length, regime start date, probability
+            of a change within the window and the regime's mean/volatility.
+        """
+        source = price_source()
+        if not os.path.exists(source):
+            logger.warning(f"File not found: {source}")
+            return {}
+        
+        df = DataService.get_log_returns(ONLINE_START_DATE)
+        days = to_epoch_days(df['Date'].to_numpy())
+        with DataService._online_lock, _file_lock(f"{BOCPD_STATE_FILE}.lock"):
+            detector = DataService._online_detector
+            signature = file_signature(BOCPD_STATE_FILE)
+            if signature is not None and (detector is None or signature != DataService._online_signature):
+                detector = OnlineChangepointDetector.load(BOCPD_STATE_FILE)
+            if detector is None:
+                detector = OnlineChangepointDetector()
+            
+            start = 0 if detector.last_date is None else int(np.searchsorted(days, detector.last_date, side='right'))
+            if start < len(days):
+                detector.update_many(df['Log_Return'].to_numpy()[start:], days[-1])
+                detector.save(BOCPD_STATE_FILE)
+                signature = file_signature(BOCPD_STATE_FILE)
+                logger.info(f"Online detector absorbed {len(days) - start} observations.")
+            DataService._online_detector = detector
+            DataService._online_signature = signature
+            
+            run_length = detector.map_run_length()
+            regime = detector.regime_estimate()
+            result = {
+                'as_of': str(np.datetime64(detector.last_date, 'D')) if detector.last_date is not None else None,
+                'observations': detector.n_observed,
+                'run_length': run_length,
+                'regime_start': str(df['Date'].iloc[len(df) - run_length].date()) if 0 < run_length <= len(df) else None,
+                'window': window,
+                'prob_change_in_window': detector.prob_change_within(window),
+                'regime_mean': regime['mean'],
+                'regime_volatility': regime['volatility'],
+                'hazard': detector.hazard,
+            }
+        return result
+
+    @staticmethod
+    def get_cache_stats() -> Dict[str, int]:
+        """
+        Reports dataset cache counters.
+        
+        Returns:
+            Dict with hits, misses, reloads and number of cached entries.
+        """
+        return dataset_cache.stats()
@@ -0,0 +1,293 @@
+"""
+Typed columnar store for the daily price series.
+
+The raw CSV mixes several date formats, which makes every parse slow. The
+store normalizes it once into two .npy columns, int64 epoch days and float64
+prices, that loaders open as memory maps. A small meta.json records how much
+of the source CSV has been ingested, so re-running the ingestion only parses
+rows appended to the CSV since the last run.
+"""
+
+import hashlib
+import io
+import json
+import os
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DATES_FILE = 'dates.npy'
+PRICES_FILE = 'prices.npy'
+META_FILE = 'meta.json'
+# Leading YYYY-MM-DD, read as year-month-day rather than with dayfirst
+ISO_DATE_PATTERN = r'^\d{4}-\d{2}-\d{2}'
+
+
+def _prefix_digest(path: str, n_bytes: int) -> str:
+    """SHA-256 of the first n_bytes of a file."""
+    digest = hashlib.sha256()
+    remaining = n_bytes
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(min(remaining, 1 << 20))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def parse_dates(values: pd.Series, errors: str = 'raise') -> pd.Series:
+    """
+    Parses the raw CSV's mixed date formats.
+
+    '20-May-87' and 'Nov 10, 2022' style dates are read day first; ISO
+    dates are parsed separately, since dayfirst would swap their month and
+    day whenever the day is 12 or less.
+    """
+    text = values.astype(str)
+    iso = text.str.match(ISO_DATE_PATTERN).to_numpy()
+    dates = pd.to_datetime(values.where(~iso), format='mixed', dayfirst=True, errors=errors)
+    if iso.any():
+        dates = dates.where(~iso, pd.to_datetime(values.where(iso), format='ISO8601', errors=errors))
+    return dates
+
+
+def parse_price_rows(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Validates raw Date/Price rows and converts them to typed columns.
+
+    Args:
+        df: Frame with 'Date' (any format accepted by the raw CSV) and 'Price'.
+
+    Returns:
+        (epoch_days, prices) sorted by date, de-duplicated (last row wins).
+
+    Raises:
+        ValueError: If a date cannot be parsed or a price is not a positive number.
+    """
+    if not {'Date', 'Price'}.issubset(df.columns):
+        raise ValueError("Price rows need 'Date' and 'Price' columns")
+    dates = parse_dates(df['Date'], errors='coerce')
+    prices = pd.to_numeric(df['Price'], errors='coerce').to_numpy(dtype=np.float64)
+    bad_dates = dates.isna().to_numpy()
+    if bad_dates.any():
+        raise ValueError(f"Unparseable dates: {df['Date'][bad_dates].tolist()[:5]}")
+    bad_prices = ~np.isfinite(prices) | (prices <= 0)
+    if bad_prices.any():
+        raise ValueError(f"Invalid prices on: {df['Date'][bad_prices].tolist()[:5]}")
+
+    days = dates.to_numpy().astype('datetime64[D]').astype(np.int64)
+    # Stable sort, then keep the last occurrence of each date
+    order = np.argsort(days, kind='stable')
+    days, prices = days[order], prices[order]
+    last = np.append(days[1:] != days[:-1], True)
+    return days[last], prices[last]
+
+
+class PriceStore:
+    """
+    Directory holding the dates/prices columns and ingestion metadata.
+
+    Args:
+        path: Store directory.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @property
+    def meta_path(self) -> str:
+        """Metadata file, rewritten last on every update (use it as the version signature)."""
+        return os.path.join(self.path, META_FILE)
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.meta_path)
+
+    def meta(self) -> Dict[str, Any]:
+        with open(self.meta_path) as f:
+            return json.load(f)
+
+    def load(self, mmap: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Opens the columns.
+
+        Args:
+            mmap: Memory-map the files read-only instead of reading them.
+
+        Returns:
+            (epoch_days int64, prices float64)
+        """
+        mode = 'r' if mmap else None
+        return (np.load(os.path.join(self.path, DATES_FILE), mmap_mode=mode),
+                np.load(os.path.join(self.path, PRICES_FILE), mmap_mode=mode))
+
+    def load_frame(self) -> pd.DataFrame:
+        """Loads the store as a date-sorted Date/Price frame."""
+        days, prices = self.load()
+        return pd.DataFrame({
+            'Date': days.astype('datetime64[D]').astype('datetime64[s]'),
+            'Price': np.asarray(prices),
+        })
+
+    def write(self, days: np.ndarray, prices: np.ndarray, meta: Dict[str, Any]) -> None:
+        """Replaces the store contents; each file is swapped in atomically."""
+        self.write_blocks(len(days), [(days, prices)], meta)
+
+    def write_blocks(self, n_rows: int, blocks: Iterable[Tuple[np.ndarray, np.ndarray]],
+                     meta: Dict[str, Any]) -> None:
+        """
+        Replaces the store contents with rows streamed in blocks.
+
+        Memory use is bounded by the block size, so series larger than RAM
+        can be written.
+
+        Args:
+            n_rows: Total number of rows the blocks hold.
+            blocks: (epoch_days, prices) pairs in date order.
+            meta: Metadata to record.
+
+        Raises:
+            ValueError: If the blocks hold a different number of rows or the
+                dates are not strictly increasing.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        tmp_days = os.path.join(self.path, DATES_FILE + '.tmp')
+        tmp_prices = os.path.join(self.path, PRICES_FILE + '.tmp')
+        out_days = np.lib.format.open_memmap(tmp_days, mode='w+', dtype=np.int64, shape=(n_rows,))
+        out_prices = np.lib.format.open_memmap(tmp_prices, mode='w+', dtype=np.float64, shape=(n_rows,))
+        pos = 0
+        for days, prices in blocks:
+            end = pos + len(days)
+            if end > n_rows:
+                raise ValueError(f"Blocks hold more than {n_rows} rows")
+            out_days[pos:end] = days
+            out_prices[pos:end] = prices
+            lo = max(pos, 1)
+            if np.any(out_days[lo:end] <= out_days[lo - 1:end - 1]):
+                raise ValueError("Dates must be strictly increasing")
+            pos = end
+        if pos != n_rows:
+            raise ValueError(f"Blocks hold {pos} rows, expected {n_rows}")
+        out_days.flush()
+        out_prices.flush()
+
+        # Content hash, so meta.json changes whenever the columns do
+        content = hashlib.sha256()
+        for column in (out_days, out_prices):
+            for start in range(0, n_rows, 1 << 20):
+                content.update(np.ascontiguousarray(column[start:start + (1 << 20)]).tobytes())
+        meta = dict(meta, rows=int(n_rows), digest=content.hexdigest(),
+                    first_date=str(np.datetime64(int(out_days[0]), 'D')) if n_rows else None,
+                    last_date=str(np.datetime64(int(out_days[-1]), 'D')) if n_rows else None)
+        del out_days, out_prices
+        os.replace(tmp_days, os.path.join(self.path, DATES_FILE))
+        os.replace(tmp_prices, os.path.join(self.path, PRICES_FILE))
+        tmp = self.meta_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, self.meta_path)
+
+    def append(self, days: np.ndarray, prices: np.ndarray, replace: bool = False,
+               meta: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Merges validated rows into the store.
+
+        Rows whose date is already stored with the same price are dropped as
+        duplicates. A different price for a stored date is rejected unless
+        `replace` is set.
+
+        Args:
+            days: Sorted, unique epoch days (see parse_price_rows).
+            prices: Prices aligned with `days`.
+            replace: Overwrite stored prices that differ.
+            meta: Metadata updates to record.
+
+        Returns:
+            Number of rows added or changed.
+        """
+        if self.exists():
+            old_days, old_prices = self.load(mmap=False)
+            current = self.meta()
+        else:
+            old_days, old_prices = np.empty(0, dtype=np.int64), np.empty(0)
+            current = {}
+
+        pos = np.searchsorted(old_days, days)
+        found = pos < len(old_days)
+        found[found] = old_days[pos[found]] == days[found]
+        changed = found.copy()
+        changed[found] = old_prices[pos[found]] != prices[found]
+        if changed.any() and not replace:
+            conflicts = np.datetime_as_string(days[changed].astype('datetime64[D]'))
+            raise ValueError(f"Prices differ from stored values on {conflicts[:5].tolist()}; use replace=True")
+
+        new = ~found
+        if not new.any() and not changed.any():
+            if meta:
+                self.write(old_days, old_prices, dict(current, **meta))
+            return 0
+        merged_prices = old_prices.copy()
+        merged_prices[pos[changed]] = prices[changed]
+        all_days = np.concatenate([old_days, days[new]])
+        all_prices = np.concatenate([merged_prices, prices[new]])
+        order = np.argsort(all_days, kind='stable')
+        self.write(all_days[order], all_prices[order], dict(current, **(meta or {})))
+        return int(new.sum() + changed.sum())
+
+    def ingest_csv(self, csv_path: str, full: bool = False) -> int:
+        """
+        Brings the store up to date with a raw Date,Price CSV.
+
+        If the part of the CSV ingested last time is unchanged, only the rows
+        appended after it are parsed. Otherwise (or with `full`) the whole
+        file is re-ingested.
+
+        Args:
+            csv_path: Raw CSV path.
+            full: Force a full rebuild.
+
+        Returns:
+            Number of rows added or changed.
+        """
+        size = os.path.getsize(csv_path)
+        meta = self.meta() if self.exists() and not full else {}
+        consumed = meta.get('source_bytes', 0)
+        incremental = (
+            meta.get('source') == os.path.abspath(csv_path)
+            and 0 < consumed <= size
+            and meta.get('source_digest') == _prefix_digest(csv_path, consumed)
+        )
+
+        with open(csv_path, 'rb') as f:
+            header = f.readline()
+            if incremental:
+                f.seek(consumed)
+            body = f.read()
+        if incremental and not body.strip():
+            return 0
+
+        end = (consumed if incremental else len(header)) + len(body)
+        rows = pd.read_csv(io.BytesIO(header + body))
+        days, prices = parse_price_rows(rows)
+        source_meta = {
+            'source': os.path.abspath(csv_path),
+            'source_bytes': end,
+            'source_digest': _prefix_digest(csv_path, end),
+        }
+        if incremental:
+            return self.append(days, prices, meta=source_meta)
+        self.write(days, prices, source_meta)
+        return int(len(days))
+
+
+def append_rows(store: PriceStore, rows: Sequence[Dict[str, Any]], replace: bool = False) -> int:
+    """
+    Validates and appends rows such as [{'Date': '2022-11-15', 'Price': 91.2}].
+
+    Returns:
+        Number of rows added or changed.
+    """
+    days, prices = parse_price_rows(pd.DataFrame(list(rows)))
+    return store.append(days, prices, replace=replace)
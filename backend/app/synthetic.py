@@ -0,0 +1,256 @@
+"""
+Synthetic daily price series with planted regime changes.
+
+Used to exercise DataService, the change point engines and the benchmarks
+at scales the single Brent CSV cannot reach, and to measure detection
+recall against known breaks. Each regime k has its own drift mu_k and
+volatility level sigma_k; within a regime, daily log returns are
+
+    r_t = mu_k + sigma_k * exp(h_t - v) * z_t,   z_t ~ Student-t(df), unit variance
+    h_t = phi * h_{t-1} + eta_t,                 eta_t ~ N(0, s^2)
+
+where v = Var[h] keeps sigma_k the long-run standard deviation. The AR(1)
+log volatility (as in notebooks/03) clusters volatility; the t innovations
+give fat tails. The log price reverts to its initial level,
+
+    x_t = (1 - kappa) * x_{t-1} + r_t,   price_t = initial_price * exp(x_t)
+
+with kappa set by the reversion half-life, so drifts move the price within
+a regime but cannot compound across thousands of regimes. h and x come from
+linear filters carried across blocks, so series of any length are streamed
+to disk with memory bounded by the block size.
+
+Dates are consecutive business days. ISO dates end at 9999-12-31, so a CSV
+holds at most max_csv_rows(spec) rows (about 2.1M from 1987); larger
+series go to the columnar store, which keeps dates as day numbers.
+
+Row 0 holds the initial price. A change point at row c means r_c is the
+first return of the new regime; in a log return series that drops row 0
+(prep.compute_returns) it sits at index c - 1.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from .store import PriceStore
+
+# Rows generated and written per block (the series itself does not depend on it)
+BLOCK_ROWS = 1_000_000
+# Random draws are made per page of rows, so any block size gives the same series
+PAGE_ROWS = 1 << 16
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """
+    Parameters of a synthetic series.
+
+    Attributes:
+        n_rows: Number of daily prices.
+        seed: Random seed.
+        start_date: First date; dates are consecutive business days.
+        initial_price: Price on the first date.
+        mean_regime_days: Expected regime length in trading days.
+        min_regime_days: Shortest regime.
+        volatility_range: Range of the regimes' daily volatility levels.
+        drift_scale: Standard deviation of the regimes' mean daily return.
+        persistence: AR(1) coefficient phi of the log volatility.
+        reversion_half_life: Trading days for the log price to close half
+            its gap to the initial price.
+        volatility_of_volatility: Innovation std s of the log volatility.
+        tail_df: Degrees of freedom of the return innovations (> 2).
+    """
+    n_rows: int
+    seed: int = 0
+    start_date: str = '1987-05-20'
+    initial_price: float = 18.63
+    mean_regime_days: int = 750
+    min_regime_days: int = 60
+    volatility_range: Tuple[float, float] = (0.008, 0.04)
+    drift_scale: float = 0.0005
+    persistence: float = 0.97
+    reversion_half_life: float = 500.0
+    volatility_of_volatility: float = 0.15
+    tail_df: float = 5.0
+
+    def __post_init__(self) -> None:
+        if self.n_rows < 1:
+            raise ValueError("n_rows must be positive")
+        if not 1 <= self.min_regime_days < self.mean_regime_days:
+            raise ValueError("Need 1 <= min_regime_days < mean_regime_days")
+        if not 0 <= self.persistence < 1:
+            raise ValueError("persistence must be in [0, 1)")
+        if self.reversion_half_life <= 0:
+            raise ValueError("reversion_half_life must be positive")
+        if self.tail_df <= 2:
+            raise ValueError("tail_df must exceed 2 for finite variance")
+
+
+def planted_regimes(spec: SyntheticSpec) -> pd.DataFrame:
+    """
+    Draws the regimes of a series.
+
+    Returns:
+        DataFrame with one row per regime: Start (first row), Date, Mean
+        (daily drift) and Volatility (long-run daily std). Every Start
+        after the first is a planted change point.
+    """
+    rng = np.random.default_rng([spec.seed, 0])
+    extra = spec.mean_regime_days - spec.min_regime_days
+    starts = [np.zeros(1, dtype=np.int64)]
+    end = 0
+    while end < spec.n_rows:
+        batch = int((spec.n_rows - end) / spec.mean_regime_days * 1.2) + 8
+        lengths = spec.min_regime_days - 1 + rng.geometric(1.0 / (extra + 1), batch)
+        bounds = end + np.cumsum(lengths)
+        starts.append(bounds[bounds < spec.n_rows])
+        end = int(bounds[-1])
+    start = np.concatenate(starts)
+    n_regimes = len(start)
+    low, high = spec.volatility_range
+    return pd.DataFrame({
+        'Start': start,
+        'Date': _business_days(spec, start).astype('datetime64[s]'),
+        'Mean': rng.normal(0.0, spec.drift_scale, n_regimes),
+        # Log-uniform levels, so calm and turbulent regimes are equally common
+        'Volatility': np.exp(rng.uniform(np.log(low), np.log(high), n_regimes)),
+    })
+
+
+def planted_changepoints(spec: SyntheticSpec) -> np.ndarray:
+    """Rows where a new regime starts (see the module docstring for returns)."""
+    return planted_regimes(spec)['Start'].to_numpy()[1:]
+
+
+def _business_days(spec: SyntheticSpec, rows: np.ndarray) -> np.ndarray:
+    """Business-day dates (datetime64[D]) of the given rows."""
+    first = np.busday_offset(np.datetime64(spec.start_date, 'D'), 0, roll='forward')
+    return np.busday_offset(first, rows)
+
+
+def max_csv_rows(spec: SyntheticSpec) -> int:
+    """Rows whose business-day dates still have four-digit years (up to 9999-12-31)."""
+    first = np.busday_offset(np.datetime64(spec.start_date, 'D'), 0, roll='forward')
+    return int(np.busday_count(first, np.datetime64('10000-01-01', 'D')))
+
+
+def _draws(spec: SyntheticSpec, lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Standard normal and Student-t draws for rows [lo, hi), generated page by page."""
+    eta, z = [], []
+    for page in range(lo // PAGE_ROWS, (hi - 1) // PAGE_ROWS + 1):
+        rng = np.random.default_rng([spec.seed, 2, page])
+        page_eta, page_z = rng.standard_normal(PAGE_ROWS), rng.standard_t(spec.tail_df, PAGE_ROWS)
+        first = page * PAGE_ROWS
+        part = slice(max(lo - first, 0), min(hi - first, PAGE_ROWS))
+        eta.append(page_eta[part])
+        z.append(page_z[part])
+    return np.concatenate(eta), np.concatenate(z)
+
+
+def iter_blocks(spec: SyntheticSpec, block_rows: int = BLOCK_ROWS) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Generates the series block by block.
+
+    Yields:
+        (epoch_days int64, prices float64) for consecutive row ranges.
+    """
+    regimes = planted_regimes(spec)
+    starts = regimes['Start'].to_numpy()
+    means = regimes['Mean'].to_numpy()
+    vols = regimes['Volatility'].to_numpy()
+    phi, s, df = spec.persistence, spec.volatility_of_volatility, spec.tail_df
+    h_var = s * s / (1 - phi * phi)
+    t_scale = np.sqrt((df - 2) / df)
+    # 1 - kappa: the share of the log price gap kept from one day to the next
+    keep = 0.5 ** (1.0 / spec.reversion_half_life)
+
+    init_rng = np.random.default_rng([spec.seed, 1])
+    zi = np.array([phi * init_rng.normal(0.0, np.sqrt(h_var))])
+    # Log price relative to the initial price, starting at 0
+    zi_price = np.zeros(1)
+    log_initial = np.log(spec.initial_price)
+    for lo in range(0, spec.n_rows, block_rows):
+        hi = min(lo + block_rows, spec.n_rows)
+        rows = np.arange(lo, hi)
+        eta, z = _draws(spec, lo, hi)
+        regime = np.searchsorted(starts, rows, side='right') - 1
+        h, zi = lfilter([1.0], [1.0, -phi], s * eta, zi=zi)
+        returns = means[regime] + vols[regime] * np.exp(h - h_var) * z * t_scale
+        if lo == 0:
+            returns[0] = 0.0
+        gap, zi_price = lfilter([1.0], [1.0, -keep], returns, zi=zi_price)
+        yield _business_days(spec, rows).astype(np.int64), np.exp(log_initial + gap)
+
+
+def generate(spec: SyntheticSpec) -> Tuple[np.ndarray, np.ndarray]:
+    """Whole series in memory as (epoch_days, prices); use the writers for large sizes."""
+    blocks = list(iter_blocks(spec))
+    return np.concatenate([b[0] for b in blocks]), np.concatenate([b[1] for b in blocks])
+
+
+def write_csv(spec: SyntheticSpec, path: str, block_rows: int = BLOCK_ROWS) -> None:
+    """
+    Streams the series to a Date,Price CSV (ISO dates), like the raw Brent file.
+
+    The file is written next to `path` and swapped in when complete.
+
+    Raises:
+        ValueError: If the series runs past 9999-12-31 (see max_csv_rows).
+    """
+    limit = max_csv_rows(spec)
+    if spec.n_rows > limit:
+        raise ValueError(f"A CSV starting {spec.start_date} holds at most {limit:,} rows "
+                         f"(dates end at 9999-12-31); use an earlier start_date or the columnar store")
+    tmp = path + '.tmp'
+    with open(tmp, 'w', newline='') as f:
+        f.write('Date,Price\n')
+        for days, prices in iter_blocks(spec, block_rows):
+            pd.DataFrame({
+                'Date': np.datetime_as_string(days.astype('datetime64[D]')),
+                'Price': prices,
+            }).to_csv(f, header=False, index=False, float_format='%.10g')
+    os.replace(tmp, path)
+
+
+def write_store(spec: SyntheticSpec, path: str, block_rows: int = BLOCK_ROWS) -> PriceStore:
+    """Streams the series into a columnar PriceStore at `path`."""
+    store = PriceStore(path)
+    store.write_blocks(spec.n_rows, iter_blocks(spec, block_rows),
+                       {'source': 'synthetic', 'seed': spec.seed})
+    return store
+
+
+def detection_recall(planted: Sequence[int], detected: Sequence[int], tolerance: int,
+                     n_rows: Optional[int] = None) -> float:
+    """
+    Fraction of planted change points with a detection within `tolerance` rows.
+
+    Args:
+        planted: Planted change point positions.
+        detected: Detected positions, in the same coordinates.
+        tolerance: Maximum distance for a match.
+        n_rows: If given, planted points closer than `tolerance` to the end
+            are left out, since no detector can confirm them.
+
+    Returns:
+        Recall in [0, 1] (1.0 when nothing was planted).
+    """
+    planted = np.asarray(planted, dtype=np.int64)
+    if n_rows is not None:
+        planted = planted[planted < n_rows - tolerance]
+    detected = np.sort(np.asarray(detected, dtype=np.int64))
+    if len(planted) == 0:
+        return 1.0
+    if len(detected) == 0:
+        return 0.0
+    # Nearest detection is the one at or after each planted point, or the one before
+    pos = np.searchsorted(detected, planted)
+    after = detected[np.minimum(pos, len(detected) - 1)]
+    before = detected[np.maximum(pos - 1, 0)]
+    nearest = np.minimum(np.abs(after - planted), np.abs(before - planted))
+    return float(np.mean(nearest <= tolerance))
@@ -0,0 +1,212 @@
+"""
+Lazy, sliced access to posterior traces.
+
+A trace is opened once and kept in the dataset cache, so requests share the
+handle instead of re-reading the file. Variables are only read when asked
+for: xarray opens the NetCDF posterior group lazily (and in chunks when dask
+is installed), and the chunked sampler store reads one member per .npz
+chunk. Thinning is applied before values are materialized.
+
+The full posterior summary (see analysis.posterior) is cached in a JSON
+file next to the trace, keyed by the trace files' signatures, so reports
+and the API read it instead of summarizing every draw again.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .analysis.changepoint import hdi
+from .analysis.posterior import PosteriorSummary, histogram, summarize
+from .analysis.sampling import TraceStore
+from .cache import file_signature
+
+try:
+    import xarray as xr
+except ImportError:  # pragma: no cover - optional dependency
+    xr = None
+
+logger = logging.getLogger(__name__)
+
+# Summary cache of a chunked store, inside its directory
+SUMMARY_FILE = 'summary.json'
+# HDI probability of the summaries saved next to the trace; others are only kept in memory
+DEFAULT_PROB = 0.94
+# Summaries at other probabilities kept per process, least recently used dropped first
+MEMORY_SUMMARIES = 8
+
+_memory_summaries: 'OrderedDict[Tuple[str, float], Tuple[List[Any], PosteriorSummary]]' = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+class NetCDFTrace:
+    """
+    Posterior group of an ArviZ NetCDF file, opened lazily.
+
+    Args:
+        path: Path to the .nc file.
+
+    Raises:
+        RuntimeError: If xarray is not installed.
+    """
+
+    def __init__(self, path: str) -> None:
+        if xr is None:
+            raise RuntimeError("xarray is required to read NetCDF traces")
+        self._dataset = xr.open_dataset(path, group='posterior')
+        # Scalar parameters only; deterministic vectors are not served
+        self.var_names = [name for name, var in self._dataset.data_vars.items()
+                          if var.dims == ('chain', 'draw')]
+
+    @property
+    def shape(self):
+        return self._dataset.sizes['chain'], self._dataset.sizes['draw']
+
+    def draws(self, name: str, thin: int = 1) -> np.ndarray:
+        """Reads one variable as a (chains, draws) array, keeping every `thin`-th draw."""
+        return self._dataset[name].isel(draw=slice(None, None, thin)).values
+
+
+class ChunkedTrace:
+    """
+    Trace written by the resumable sampler (see analysis.sampling).
+
+    Args:
+        config_path: The store's config.json.
+    """
+
+    def __init__(self, config_path: str) -> None:
+        self._store = TraceStore(os.path.dirname(config_path))
+        self._config = self._store.stored_config()
+        self.var_names = self._store.var_names()
+
+    @property
+    def shape(self):
+        return self._config.chains, self._config.draws
+
+    def draws(self, name: str, thin: int = 1) -> np.ndarray:
+        """Reads one variable as a (chains, draws) array, keeping every `thin`-th draw."""
+        return self._store.load(self._config, [name])[name][:, ::thin]
+
+
+Trace = Union[NetCDFTrace, ChunkedTrace]
+
+
+def open_trace(path: str) -> Trace:
+    """Opens a NetCDF file or a chunked store's config.json."""
+    if path.endswith('.nc'):
+        return NetCDFTrace(path)
+    return ChunkedTrace(path)
+
+
+def check_var_names(trace: Trace, var_names: Optional[List[str]]) -> List[str]:
+    """
+    Resolves requested variables, defaulting to all.
+
+    Raises:
+        ValueError: If a variable is not in the trace.
+    """
+    if not var_names:
+        return list(trace.var_names)
+    unknown = [name for name in var_names if name not in trace.var_names]
+    if unknown:
+        raise ValueError(f"Unknown variables {unknown}; available: {', '.join(trace.var_names)}")
+    return var_names
+
+
+def interval(values: np.ndarray, prob: float) -> Dict[str, float]:
+    """Posterior mean and highest-density interval of all draws."""
+    flat = np.asarray(values, dtype=np.float64).ravel()
+    lower, upper = hdi(flat, prob)
+    return {'mean': float(flat.mean()), 'lower': float(lower), 'upper': float(upper), 'prob': prob}
+
+
+def summary_path(source: str) -> str:
+    """File caching the DEFAULT_PROB summary of a trace: <name>.summary.json, or summary.json in a store."""
+    if source.endswith('.nc'):
+        return source[:-len('.nc')] + '.summary.json'
+    return os.path.join(os.path.dirname(source), SUMMARY_FILE)
+
+
+def trace_signature(source: str) -> List[Any]:
+    """
+    Signatures of every file holding the trace's draws.
+
+    A chunked store grows chunk by chunk without rewriting config.json, so
+    each chunk counts; a NetCDF trace is a single file.
+    """
+    if source.endswith('.nc'):
+        return [list(file_signature(source) or ())]
+    store = os.path.dirname(source)
+    files = [source] + sorted(os.path.join(root, name)
+                              for root, _, names in os.walk(store)
+                              for name in names if name.endswith('.npz'))
+    return [[os.path.relpath(path, store)] + list(file_signature(path) or ()) for path in files]
+
+
+def save_summary(source: str, summary: PosteriorSummary) -> str:
+    """
+    Caches a summary of the trace at `source` next to it; returns the summary path.
+
+    Raises:
+        ValueError: If the summary is not at DEFAULT_PROB (only that one is saved).
+    """
+    if summary.prob != DEFAULT_PROB:
+        raise ValueError(f"Only summaries at prob={DEFAULT_PROB} are saved next to the trace")
+    path = summary_path(source)
+    summary.save(path, signature=trace_signature(source))
+    return path
+
+
+def cached_summary(source: str, trace: Optional[Trace] = None, prob: float = DEFAULT_PROB) -> PosteriorSummary:
+    """
+    Returns the trace's posterior summary, recomputing it only when the trace changed.
+
+    The DEFAULT_PROB summary is cached on disk next to the trace. Other
+    probabilities come from request parameters, so they are kept in a
+    bounded in-process cache (MEMORY_SUMMARIES) instead of adding files.
+
+    Args:
+        source: Trace file, as for open_trace.
+        trace: Already opened handle of `source`, if any.
+        prob: HDI probability mass of the summary table.
+    """
+    signature = trace_signature(source)
+    if prob != DEFAULT_PROB:
+        key = (source, prob)
+        with _memory_lock:
+            entry = _memory_summaries.get(key)
+            if entry is not None and entry[0] == signature:
+                _memory_summaries.move_to_end(key)
+                return entry[1]
+        trace = trace or open_trace(source)
+        summary = summarize({name: trace.draws(name) for name in trace.var_names}, trace.var_names, prob)
+        with _memory_lock:
+            _memory_summaries[key] = (signature, summary)
+            _memory_summaries.move_to_end(key)
+            while len(_memory_summaries) > MEMORY_SUMMARIES:
+                _memory_summaries.popitem(last=False)
+        return summary
+
+    path = summary_path(source)
+    try:
+        with open(path) as f:
+            stored = json.load(f)
+        if stored.get('signature') == signature and stored.get('prob') == prob:
+            return PosteriorSummary.from_dict(stored)
+    except (OSError, ValueError, KeyError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"Ignoring unreadable posterior summary {path}: {e}")
+
+    trace = trace or open_trace(source)
+    summary = summarize({name: trace.draws(name) for name in trace.var_names}, trace.var_names, prob)
+    try:
+        save_summary(source, summary)
+    except OSError as e:
+        logger.warning(f"Posterior summary not cached at {path}: {e}")
+    return summary
@@ -0,0 +1,71 @@
+"""
+Start-up warm-up for production serving.
+
+Requests every parameterless GET endpoint, plus the exact URLs the
+dashboard loads first, through the test client. That parses every dataset
+and fills the dataset and response caches before the server accepts
+traffic. Run in the gunicorn master (preload_app), the warmed caches are
+inherited by every forked worker and shared copy-on-write.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from flask import Flask
+
+from .instrumentation import REQUEST_LATENCY, STAGE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+# Query strings the dashboard sends (frontend/src/services/api.js); the
+# response cache is keyed by them, so they are warmed verbatim
+DASHBOARD_REQUESTS = (
+    '/api/prices?max_points=1200',
+    '/api/events/changepoints?method=bayesian&window=90',
+)
+# Endpoints that are not worth warming (or need parameters)
+SKIP_ENDPOINTS = ('/api/metrics', '/api/series/prices')
+
+
+def warm_urls(app: Flask) -> List[str]:
+    """Parameterless GET endpoints under /api, then the dashboard requests."""
+    urls = sorted(
+        rule.rule for rule in app.url_map.iter_rules()
+        if rule.rule.startswith('/api/') and 'GET' in rule.methods
+        and not rule.arguments and rule.rule not in SKIP_ENDPOINTS
+    )
+    return urls + [url for url in DASHBOARD_REQUESTS if url not in urls]
+
+
+def warm_up(app: Flask, urls: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Requests each URL once so later requests are served from the caches.
+
+    Failures are logged, not raised: an endpoint whose data is missing
+    should not keep the server from starting. Latency histograms are reset
+    afterwards so warm-up requests do not show up in /api/metrics.
+
+    Args:
+        app: The application to warm.
+        urls: URLs to request (default: warm_urls(app)).
+
+    Returns:
+        Status code per URL.
+    """
+    statuses: Dict[str, int] = {}
+    client = app.test_client()
+    start = time.perf_counter()
+    for url in urls if urls is not None else warm_urls(app):
+        url_start = time.perf_counter()
+        try:
+            statuses[url] = client.get(url).status_code
+        except Exception as e:
+            logger.error(f"Warm-up request {url} failed: {e}")
+            statuses[url] = 500
+            continue
+        logger.info(f"Warmed {url}: {statuses[url]} in {(time.perf_counter() - url_start) * 1000:.0f} ms")
+    REQUEST_LATENCY.clear()
+    STAGE_LATENCY.clear()
+    logger.info(f"Warm-up of {len(statuses)} endpoints finished in {time.perf_counter() - start:.1f}s")
+    return statuses
@@ -0,0 +1,119 @@
+"""Columnar and binary encodings for time-series endpoints."""
+
+from typing import Callable, Dict
+
+import numpy as np
+from flask import Request
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow output is optional
+    pa = None
+
+# Wire format name -> response mimetype. Row-oriented JSON stays the default.
+WIRE_FORMATS: Dict[str, str] = {
+    'json': 'application/json',
+    'columnar': 'application/vnd.columnar+json',
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'f64': 'application/octet-stream',
+}
+
+# Columns are passed around as name -> 1-D array; dates are int64 epoch days
+Columns = Dict[str, np.ndarray]
+
+
+def negotiate_format(request: Request) -> str:
+    """
+    Picks the wire format from the `format` query parameter or Accept header.
+
+    Args:
+        request: The incoming request.
+
+    Returns:
+        A key of WIRE_FORMATS.
+
+    Raises:
+        ValueError: If `format` names an unknown format.
+    """
+    fmt = request.args.get('format')
+    if fmt:
+        if fmt not in WIRE_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(WIRE_FORMATS)}")
+        return fmt
+    # application/json is listed first so '*/*' keeps the row format
+    best = request.accept_mimetypes.best_match(list(WIRE_FORMATS.values()), default='application/json')
+    return next(name for name, mimetype in WIRE_FORMATS.items() if mimetype == best)
+
+
+def to_epoch_days(dates: np.ndarray) -> np.ndarray:
+    """Converts datetime64 values to int64 days since 1970-01-01."""
+    return np.asarray(dates).astype('datetime64[D]').astype(np.int64)
+
+
+def encode_columnar_json(columns: Columns, dumps: Callable[[object], str]) -> bytes:
+    """Encodes columns as a JSON object of arrays; NaN (a missing value) becomes null."""
+    return dumps({name: _to_list(values) for name, values in columns.items()}).encode('utf-8')
+
+
+def _to_list(values: np.ndarray) -> list:
+    if values.dtype.kind == 'f':
+        missing = np.isnan(values)
+        if missing.any():
+            return np.where(missing, None, values).tolist()
+    return values.tolist()
+
+
+def encode_f64(columns: Columns) -> bytes:
+    """
+    Encodes columns as consecutive little-endian float64 blocks.
+
+    For n rows and k columns the body is k * n * 8 bytes: all values of the
+    first column, then the second, and so on (epoch days are exact in float64).
+    """
+    if not columns:
+        return b''
+    return np.concatenate([np.asarray(values, dtype='<f8') for values in columns.values()]).tobytes()
+
+
+def encode_arrow(columns: Columns, date_columns=('Date',)) -> bytes:
+    """
+    Encodes columns as a single-batch Arrow IPC stream.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed.
+    """
+    if pa is None:
+        raise RuntimeError("Arrow output requires pyarrow")
+    arrays = []
+    for name, values in columns.items():
+        if name in date_columns:
+            arrays.append(pa.array(values.astype(np.int32), type=pa.date32()))
+        else:
+            # Float columns are wrapped without copying
+            arrays.append(pa.array(values))
+    batch = pa.RecordBatch.from_arrays(arrays, names=list(columns))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_columns(columns: Columns, fmt: str, dumps: Callable[[object], str]) -> bytes:
+    """
+    Encodes columns in one of the non-row formats.
+
+    Args:
+        columns: Mapping of column name to array.
+        fmt: 'columnar', 'arrow' or 'f64'.
+        dumps: JSON encoder used for the columnar JSON format.
+
+    Returns:
+        The encoded body.
+    """
+    if fmt == 'columnar':
+        return encode_columnar_json(columns, dumps)
+    if fmt == 'arrow':
+        return encode_arrow(columns)
+    if fmt == 'f64':
+        return encode_f64(columns)
+    raise ValueError(f"Unsupported columnar format: {fmt}")
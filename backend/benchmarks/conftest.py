@@ -0,0 +1,149 @@
+"""
+Shared fixtures for the benchmark suite.
+
+Each benchmark runs against a synthetic price series (app.synthetic)
+written to a temporary columnar store, so DataService and the routes read it exactly as
+they would read the production store. Sizes come from --bench-sizes;
+benchmarks whose cost grows faster than linearly declare a
+@pytest.mark.max_size and are not generated above it.
+"""
+
+import os
+import resource
+import shutil
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Callable
+
+import numpy as np
+import pytest
+from app import create_app, services
+from app.analysis.sampling import GibbsChangepointSampler, SamplerConfig, run_chains
+from app.cache import dataset_cache
+from app.prep import ReturnsMemo
+from app.response_cache import response_cache
+from app.store import PriceStore
+from app.synthetic import SyntheticSpec, write_store
+
+DEFAULT_SIZES = '10000,100000,1000000'
+
+
+def pytest_addoption(parser):
+    parser.addoption('--bench-sizes', default=DEFAULT_SIZES,
+                     help=f"Comma-separated series lengths to benchmark (default: {DEFAULT_SIZES}); "
+                          "add 10000000 for the largest scale")
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'max_size(n): skip sizes above n for super-linear benchmarks')
+
+
+def pytest_generate_tests(metafunc):
+    if 'size' not in metafunc.fixturenames:
+        return
+    sizes = [int(s) for s in metafunc.config.getoption('--bench-sizes').split(',') if s]
+    marker = metafunc.definition.get_closest_marker('max_size')
+    if marker is not None:
+        sizes = [s for s in sizes if s <= marker.args[0]]
+    metafunc.parametrize('size', sizes, ids=[f'n={s:,}'.replace(',', '_') for s in sizes], scope='session')
+
+
+@pytest.fixture(scope='session')
+def price_store(size, tmp_path_factory) -> PriceStore:
+    """Columnar store holding `size` synthetic daily prices."""
+    return write_store(SyntheticSpec(size), str(tmp_path_factory.mktemp(f'store_{size}')))
+
+
+@pytest.fixture
+def cold(tmp_path, monkeypatch) -> Callable[[], None]:
+    """
+    Keeps API state files in a temporary directory.
+
+    Returns:
+        A reset callable that drops every cache, so the next call is cold.
+    """
+    memo_dir = str(tmp_path / 'prep')
+    monkeypatch.setattr(services, 'BOCPD_STATE_FILE', str(tmp_path / 'bocpd_state.npz'))
+    monkeypatch.setattr(services.DataService, '_returns_memo', ReturnsMemo(memo_dir))
+
+    def reset() -> None:
+        dataset_cache.clear()
+        response_cache.clear()
+        services.DataService._returns_memo.clear()
+        shutil.rmtree(memo_dir, ignore_errors=True)
+        # Through monkeypatch, so the class attributes are restored after the benchmark
+        monkeypatch.setattr(services.DataService, '_rolling_states', OrderedDict())
+        monkeypatch.setattr(services.DataService, '_online_detector', None)
+        if os.path.exists(services.BOCPD_STATE_FILE):
+            os.remove(services.BOCPD_STATE_FILE)
+
+    reset()
+    yield reset
+    reset()
+
+
+@pytest.fixture
+def use_store(price_store, cold, monkeypatch) -> Callable[[], None]:
+    """Points DataService at the synthetic store; returns the cold reset."""
+    monkeypatch.setattr(services, 'PRICE_STORE_DIR', price_store.path)
+    return cold
+
+
+@pytest.fixture(scope='session')
+def trace_store(tmp_path_factory) -> str:
+    """Small checkpointed trace for the /changepoint/trace/* benchmarks."""
+    rng = np.random.default_rng(3)
+    x = np.concatenate([rng.normal(0, 0.01, 500), rng.normal(0, 0.03, 500)])
+    path = str(tmp_path_factory.mktemp('trace') / 'chains')
+    run_chains(GibbsChangepointSampler(x, collapse_tau=True), path,
+               SamplerConfig(draws=1000, tune=0, chains=4, chunk_size=250, cores=1))
+    return path
+
+
+@pytest.fixture
+def use_trace(trace_store, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(services, 'TRACE_FILE', str(tmp_path / 'missing.nc'))
+    monkeypatch.setattr(services, 'TRACE_STORE_DIR', trace_store)
+
+
+@pytest.fixture(scope='session')
+def client():
+    app = create_app()
+    app.config.update({'TESTING': True})
+    return app.test_client()
+
+
+def rounds_for(size: int) -> int:
+    """Fewer timed rounds for larger series, so the suite stays bounded."""
+    return int(np.clip(100_000 // max(size, 1), 1, 10))
+
+
+@pytest.fixture
+def measure(benchmark) -> Callable[..., Any]:
+    """
+    Times a callable with pytest-benchmark and records its memory use.
+
+    extra_info gets 'peak_alloc_mb' (tracemalloc peak of one untimed call,
+    which numpy allocations are reported to) and 'max_rss_mb' (the
+    process's peak resident set size after the timed rounds).
+
+    Args of the returned callable:
+        fn: Callable to benchmark.
+        size: Series length, used to pick the number of rounds.
+        setup: Optional callable run before every round (e.g. a cache reset).
+    """
+    def run(fn: Callable[[], Any], size: int, setup: Callable[[], None] = None) -> Any:
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            fn()
+            benchmark.extra_info['peak_alloc_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+        result = benchmark.pedantic(fn, setup=setup, rounds=rounds_for(size), iterations=1, warmup_rounds=0)
+        benchmark.extra_info['max_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        benchmark.extra_info['size'] = size
+        return result
+
+    return run
@@ -0,0 +1,43 @@
+"""Change point and volatility fits on synthetic daily log returns."""
+
+import numpy as np
+import pytest
+from app.analysis.changepoint import fit_single_changepoint
+from app.analysis.rolling import RollingWindow
+from app.analysis.sampling import GibbsChangepointSampler
+from app.analysis.segmentation import pelt
+from app.analysis.volatility import GarchModel, KalmanVolatility
+from app.synthetic import SyntheticSpec, detection_recall, generate, planted_changepoints
+
+pytest.importorskip('pytest_benchmark')
+
+@pytest.fixture(scope='session')
+def returns(size):
+    return np.diff(np.log(generate(SyntheticSpec(size))[1]))
+
+def test_fit_single_changepoint(returns, size, measure):
+    measure(lambda: fit_single_changepoint(returns), size)
+
+def test_garch_fit(returns, size, measure):
+    measure(lambda: GarchModel.fit(returns), size)
+
+def test_rolling_fill(returns, size, measure):
+    measure(lambda: RollingWindow(20).fill(returns), size)
+
+@pytest.mark.max_size(100_000)
+def test_pelt(returns, size, measure, benchmark):
+    result = measure(lambda: pelt(returns), size)
+    # Planted change point rows are one ahead of their index in the returns
+    planted = planted_changepoints(SyntheticSpec(size)) - 1
+    benchmark.extra_info['recall_20d'] = detection_recall(planted, result.changepoints, 20, len(returns))
+
+@pytest.mark.max_size(100_000)
+def test_kalman_fit(returns, size, measure):
+    measure(lambda: KalmanVolatility().fit(returns), size)
+
+@pytest.mark.max_size(100_000)
+def test_gibbs_sweeps(returns, size, measure):
+    """100 collapsed Gibbs iterations (one chain chunk)."""
+    sampler = GibbsChangepointSampler(returns, collapse_tau=True)
+    rng = np.random.default_rng(0)
+    measure(lambda: sampler.sample(sampler.initial_state(rng), 100, rng), size)
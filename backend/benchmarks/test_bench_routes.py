@@ -0,0 +1,54 @@
+"""Flask routes through the test client, cold (caches dropped) and warm (response cache hit)."""
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+# Routes whose payload is derived from the price series
+PRICE_ROUTES = [
+    '/api/prices?max_points=2000',
+    '/api/prices?format=columnar',
+    '/api/prices?format=f64',
+    '/api/rolling?window=20&stat=mean,std,ewma&format=columnar',
+    '/api/events/impact',
+    '/api/events/changepoints',
+    '/api/volatility?method=garch&format=columnar',
+]
+
+BOUNDED_ROUTES = [
+    '/api/changepoints',
+    '/api/changepoint/online',
+    '/api/volatility?method=kalman',
+]
+
+FIXED_ROUTES = [
+    '/api/events',
+    '/api/changepoint',
+    '/api/changepoint/trace',
+    '/api/changepoint/trace/draws?thin=4',
+    '/api/changepoint/trace/histogram',
+    '/api/changepoint/trace/hdi',
+    '/api/volatility',
+]
+
+def request(client, url):
+    def call():
+        response = client.get(url)
+        assert response.status_code == 200, response.data[:200]
+        return response
+    return call
+
+@pytest.mark.parametrize('warm', [False, True], ids=['cold', 'warm'])
+@pytest.mark.parametrize('url', PRICE_ROUTES)
+def test_price_routes(url, warm, size, client, use_store, measure):
+    measure(request(client, url), size, setup=None if warm else use_store)
+
+@pytest.mark.max_size(100_000)
+@pytest.mark.parametrize('url', BOUNDED_ROUTES)
+def test_bounded_routes(url, size, client, use_store, measure):
+    measure(request(client, url), size, setup=use_store)
+
+@pytest.mark.parametrize('warm', [False, True], ids=['cold', 'warm'])
+@pytest.mark.parametrize('url', FIXED_ROUTES)
+def test_fixed_routes(url, warm, client, cold, use_trace, measure):
+    measure(request(client, url), 0, setup=None if warm else cold)
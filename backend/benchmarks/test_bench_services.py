@@ -0,0 +1,56 @@
+"""DataService methods on synthetic series, cold (every cache dropped before each round)."""
+
+import pytest
+from app.services import DataService
+
+pytest.importorskip('pytest_benchmark')
+
+# (name, call) for methods whose cost scales roughly linearly with the series
+LINEAR_METHODS = [
+    ('get_price_frame', DataService.get_price_frame),
+    ('get_prices', DataService.get_prices),
+    ('get_prices_downsampled', lambda: DataService.get_prices(max_points=2000)),
+    ('get_price_columns', DataService.get_price_columns),
+    ('get_returns_series', lambda: DataService.get_returns_series(None)),
+    ('get_log_returns', DataService.get_log_returns),
+    ('get_rolling_columns', lambda: DataService.get_rolling_columns(stats=('mean', 'std', 'ewma', 'ewm_std'))),
+    ('get_rolling', DataService.get_rolling),
+    ('get_event_impact', DataService.get_event_impact),
+    ('get_break_intervals', DataService.get_break_intervals),
+    ('get_event_breaks', DataService.get_event_breaks),
+    ('estimate_volatility_garch', lambda: DataService.estimate_volatility('garch')),
+    ('get_volatility_columns_garch', lambda: DataService.get_volatility_columns('garch')),
+]
+
+# PELT prunes poorly when breaks are rare, and BOCPD and the Kalman filter loop per day
+BOUNDED_METHODS = [
+    ('get_changepoints', lambda: DataService.get_changepoints(start_date=None)),
+    ('get_event_breaks_pelt', lambda: DataService.get_event_breaks('pelt')),
+    ('get_online_regime', DataService.get_online_regime),
+    ('estimate_volatility_kalman', lambda: DataService.estimate_volatility('kalman')),
+]
+
+# Methods that read fixed-size result files rather than the price series
+FIXED_METHODS = [
+    ('get_events', DataService.get_events),
+    ('get_changepoint_summary', DataService.get_changepoint_summary),
+    ('get_changepoint_trace', DataService.get_changepoint_trace),
+    ('get_volatility_data', DataService.get_volatility_data),
+    ('get_trace_draws', lambda: DataService.get_trace_draws(thin=4)),
+    ('get_trace_histogram', DataService.get_trace_histogram),
+    ('get_trace_hdi', DataService.get_trace_hdi),
+    ('get_cache_stats', DataService.get_cache_stats),
+]
+
+@pytest.mark.parametrize('name, call', LINEAR_METHODS, ids=[name for name, _ in LINEAR_METHODS])
+def test_linear_methods(name, call, size, use_store, measure):
+    measure(call, size, setup=use_store)
+
+@pytest.mark.max_size(100_000)
+@pytest.mark.parametrize('name, call', BOUNDED_METHODS, ids=[name for name, _ in BOUNDED_METHODS])
+def test_bounded_methods(name, call, size, use_store, measure):
+    measure(call, size, setup=use_store)
+
+@pytest.mark.parametrize('name, call', FIXED_METHODS, ids=[name for name, _ in FIXED_METHODS])
+def test_fixed_methods(name, call, cold, use_trace, measure):
+    measure(call, 0, setup=cold)
@@ -0,0 +1,26 @@
+"""
+Gunicorn settings for serving the API in production.
+
+The app is preloaded and warmed in the master, so datasets and cached
+response bodies are shared copy-on-write by all workers; gc.freeze() before
+each fork keeps the collector from touching (and copying) those pages.
+Every setting can be overridden from the environment or the command line.
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('API_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', min(2 * multiprocessing.cpu_count() + 1, 8)))
+# Threads per worker; requests mostly wait on numpy/pandas, which release the GIL
+worker_class = 'gthread'
+threads = int(os.environ.get('API_THREADS', 4))
+preload_app = True
+# The first PELT or volatility fit on a cold dataset can take a few seconds
+timeout = int(os.environ.get('API_TIMEOUT', 120))
+accesslog = '-'
+
+
+def pre_fork(server, worker):
+    gc.freeze()
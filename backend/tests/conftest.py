@@ -1,6 +1,51 @@
+from collections import OrderedDict
 
 import pytest
 from app import create_app
+from app import services
+from app.cache import dataset_cache
+from app.prep import ReturnsMemo
+from app.response_cache import response_cache
+from app.series import SeriesRegistry
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty dataset and response caches."""
+    dataset_cache.clear()
+    response_cache.clear()
+    yield
+    dataset_cache.clear()
+    response_cache.clear()
+
+@pytest.fixture(autouse=True)
+def isolate_online_state(tmp_path, monkeypatch):
+    """Keep the streaming detector checkpoint out of the data directory."""
+    monkeypatch.setattr(services, 'BOCPD_STATE_FILE', str(tmp_path / 'bocpd_state.npz'))
+    monkeypatch.setattr(services.DataService, '_online_detector', None)
+    monkeypatch.setattr(services.DataService, '_online_signature', None)
+
+@pytest.fixture(autouse=True)
+def isolate_price_store(tmp_path, monkeypatch):
+    """Read prices from the raw CSV unless a test builds its own store."""
+    monkeypatch.setattr(services, 'PRICE_STORE_DIR', str(tmp_path / 'brent_store'))
+
+@pytest.fixture(autouse=True)
+def isolate_returns_memo(tmp_path, monkeypatch):
+    """Write prepared return series to a per-test directory."""
+    monkeypatch.setattr(services.DataService, '_returns_memo', ReturnsMemo(str(tmp_path / 'prep')))
+
+@pytest.fixture(autouse=True)
+def isolate_rolling_state(monkeypatch):
+    """Start every test without incremental rolling statistics."""
+    monkeypatch.setattr(services.DataService, '_rolling_states', OrderedDict())
+
+@pytest.fixture(autouse=True)
+def isolate_series_registry(tmp_path, monkeypatch):
+    """Discover extra price series in per-test directories."""
+    raw_dir, store_dir = str(tmp_path / 'series_raw'), str(tmp_path / 'series_store')
+    monkeypatch.setattr(services, 'SERIES_RAW_DIR', raw_dir)
+    monkeypatch.setattr(services, 'SERIES_STORE_DIR', store_dir)
+    monkeypatch.setattr(services, 'SERIES_REGISTRY', SeriesRegistry(raw_dir, store_dir))
 
 @pytest.fixture
 def app():
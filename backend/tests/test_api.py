@@ -1,3 +1,8 @@
+import json
+import numpy as np
+import pytest
+from app import services
+from app.analysis.sampling import GibbsChangepointSampler, SamplerConfig, run_chains
 
 def test_prices_endpoint(client):
     """Test that the prices endpoint returns 200 and a list."""
@@ -16,3 +21,221 @@ def test_changepoint_endpoint(client):
     response = client.get('/api/changepoint')
     assert response.status_code == 200
     assert isinstance(response.json, dict)
+
+def test_prices_endpoint_etag(client):
+    """Test that responses carry a strong ETag and Cache-Control."""
+    response = client.get('/api/prices')
+    assert response.headers['ETag'].startswith('"')
+    assert 'max-age' in response.headers['Cache-Control']
+
+def test_prices_endpoint_not_modified(client):
+    """Test that a matching If-None-Match is answered with 304."""
+    etag = client.get('/api/prices').headers['ETag']
+    response = client.get('/api/prices', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
+def test_response_cache_reuses_body(client):
+    """Test that repeat requests are served from the response cache."""
+    from app.response_cache import response_cache
+    first = client.get('/api/events')
+    second = client.get('/api/events')
+    assert first.data == second.data
+    assert response_cache.stats()['hits'] == 1
+
+def test_prices_endpoint_range_and_max_points(client):
+    """Test date-range filtering and downsampling on /api/prices."""
+    response = client.get('/api/prices?start_date=2012-01-01&end_date=2012-12-31&max_points=50')
+    assert response.status_code == 200
+    data = response.json
+    assert 0 < len(data) <= 50
+    assert data[0]['Date'] >= '2012-01-01'
+    assert data[-1]['Date'] <= '2012-12-31'
+
+def test_prices_endpoint_rejects_bad_params(client):
+    """Test that malformed query parameters return 400."""
+    assert client.get('/api/prices?max_points=abc').status_code == 400
+    assert client.get('/api/prices?start_date=not-a-date').status_code == 400
+    assert client.get('/api/prices?method=median').status_code == 400
+
+def test_prices_endpoint_columnar(client):
+    """Test the columnar JSON format returns parallel arrays."""
+    response = client.get('/api/prices?format=columnar&start_date=2020-01-01&end_date=2020-01-31')
+    assert response.status_code == 200
+    data = response.json
+    assert set(data) == {'Date', 'Price'}
+    assert len(data['Date']) == len(data['Price']) > 0
+    assert all(isinstance(day, int) for day in data['Date'])
+
+def test_volatility_endpoint_f64(client):
+    """Test the raw float64 format matches the declared layout."""
+    import numpy as np
+    response = client.get('/api/volatility', headers={'Accept': 'application/octet-stream'})
+    assert response.status_code == 200
+    assert response.headers['X-Columns'] == 'Date,Volatility'
+    n = int(response.headers['X-Row-Count'])
+    values = np.frombuffer(response.data, dtype='<f8')
+    assert len(values) == 2 * n
+    assert 'Accept' in response.headers['Vary']
+
+def test_prices_endpoint_arrow(client):
+    """Test the Arrow IPC stream decodes to the same rows."""
+    pa = pytest.importorskip('pyarrow')
+    response = client.get('/api/prices?format=arrow&start_date=2022-01-01')
+    table = pa.ipc.open_stream(response.data).read_all()
+    assert table.column_names == ['Date', 'Price']
+    assert str(table.column('Date').to_pylist()[0]) >= '2022-01-01'
+
+def test_prices_endpoint_unknown_format(client):
+    """Test that an unknown format is rejected."""
+    assert client.get('/api/prices?format=xml').status_code == 400
+
+def test_changepoints_endpoint(client):
+    """Test the PELT endpoint returns change points and segments."""
+    response = client.get('/api/changepoints?penalty=100')
+    assert response.status_code == 200
+    data = response.json
+    assert len(data['segments']) == len(data['changepoints']) + 1
+    assert client.get('/api/changepoints?min_size=1').status_code == 400
+    assert client.get('/api/changepoints?penalty=100&start_date=2012/01/01').json == data
+    assert client.get('/api/changepoints?start_date=2012-13-45').status_code == 400
+    # CROPS ranges spanning too many segmentations are refused after two PELT runs
+    response = client.get('/api/changepoints?penalty_min=0.5&penalty_max=200')
+    assert response.status_code == 400 and 'narrow' in response.json['error']
+
+def test_online_regime_endpoint(client):
+    """Test the streaming detector endpoint reports the current regime."""
+    response = client.get('/api/changepoint/online?window=10')
+    assert response.status_code == 200
+    data = response.json
+    assert data['window'] == 10
+    assert 0.0 <= data['prob_change_in_window'] <= 1.0
+    assert client.get('/api/changepoint/online?window=0').status_code == 400
+
+@pytest.fixture
+def chunked_trace(tmp_path, monkeypatch):
+    """Small resumable-sampler trace served in place of the NetCDF file."""
+    rng = np.random.default_rng(3)
+    x = np.concatenate([rng.normal(0, 0.01, 80), rng.normal(0, 0.04, 40)])
+    path = tmp_path / 'chains'
+    run_chains(GibbsChangepointSampler(x, collapse_tau=True), str(path),
+               SamplerConfig(draws=60, tune=0, chains=2, chunk_size=25, cores=1))
+    monkeypatch.setattr(services, 'TRACE_FILE', str(tmp_path / 'missing.nc'))
+    monkeypatch.setattr(services, 'TRACE_STORE_DIR', str(path))
+
+def test_trace_draws_endpoint(client, chunked_trace):
+    """Test thinned draws are served per chain for the requested variables."""
+    response = client.get('/api/changepoint/trace/draws?var=tau,sigma_after&thin=4')
+    assert response.status_code == 200
+    data = response.json
+    assert (data['chains'], data['draws'], data['thin']) == (2, 60, 4)
+    assert set(data['values']) == {'tau', 'sigma_after'}
+    assert len(data['values']['tau']) == 2 and len(data['values']['tau'][0]) == 15
+    assert client.get('/api/changepoint/trace/draws?var=nope').status_code == 400
+
+def test_trace_histogram_and_hdi_endpoints(client, chunked_trace):
+    """Test the tau histogram covers every draw and the HDI is recomputed."""
+    histogram = client.get('/api/changepoint/trace/histogram?bins=20').json
+    assert histogram['var'] == 'tau'
+    assert sum(histogram['counts']) == 120
+    assert len(histogram['edges']) == len(histogram['counts']) + 1
+
+    narrow = client.get('/api/changepoint/trace/hdi?var=tau&prob=0.5').json['tau']
+    wide = client.get('/api/changepoint/trace/hdi?var=tau&prob=0.99').json['tau']
+    assert narrow['lower'] <= narrow['upper']
+    assert wide['upper'] - wide['lower'] >= narrow['upper'] - narrow['lower']
+    assert client.get('/api/changepoint/trace/hdi?prob=1.5').status_code == 400
+
+def test_trace_summary_endpoint(client, chunked_trace):
+    """Test the posterior summary covers the table and the derived change distributions."""
+    data = client.get('/api/changepoint/trace/summary').json
+    assert (data['chains'], data['draws']) == (2, 60)
+    assert {row['parameter'] for row in data['table']} >= {'tau', 'sigma_after'}
+    assert 0.0 <= data['prob_increase'] <= 1.0
+    assert data['tau_interval'][0] <= data['tau_mode'] <= data['tau_interval'][1]
+    assert sum(data['histograms']['volatility_change_pct']['counts']) == 120
+    assert client.get('/api/changepoint/trace/summary?prob=0').status_code == 400
+
+def test_trace_endpoints_without_trace(client, tmp_path, monkeypatch):
+    """Test a missing trace is reported as 404."""
+    monkeypatch.setattr(services, 'TRACE_FILE', str(tmp_path / 'missing.nc'))
+    monkeypatch.setattr(services, 'TRACE_STORE_DIR', str(tmp_path / 'missing'))
+    assert client.get('/api/changepoint/trace/draws').status_code == 404
+    assert client.get('/api/changepoint/trace/summary').status_code == 404
+
+def test_event_impact_endpoint(client):
+    """Test every event is reported for each requested window."""
+    events = client.get('/api/events').json
+    response = client.get('/api/events/impact?windows=5,20')
+    assert response.status_code == 200
+    rows = response.json
+    assert len(rows) == 2 * len(events)
+    assert {row['Window'] for row in rows} == {5, 20}
+    assert client.get('/api/events/impact?windows=1').status_code == 400
+    assert client.get('/api/events/impact?windows=a').status_code == 400
+
+def test_event_breaks_endpoint(client):
+    """Test the event/change point join reports lags within the window."""
+    response = client.get('/api/events/changepoints?method=pelt&window=30')
+    assert response.status_code == 200
+    rows = response.json
+    assert rows
+    for row in rows:
+        # PELT breaks are points, so the lag is the distance to the interval
+        assert row['Break Lower'] == row['Break Upper'] == row['Break Date']
+        assert abs(row['Lag_Days']) <= 30
+    assert client.get('/api/events/changepoints?method=nope').status_code == 400
+
+def test_volatility_endpoint_fast_estimators(client):
+    """Test GARCH and Kalman estimates cover the modeled returns."""
+    stored = client.get('/api/volatility').json
+    for method in ('garch', 'kalman'):
+        response = client.get(f'/api/volatility?method={method}&format=columnar')
+        assert response.status_code == 200
+        data = response.json
+        assert set(data) >= {'Date', 'Volatility'}
+        assert len(data['Volatility']) == len(stored)
+    assert client.get('/api/volatility?method=mcmc').status_code == 400
+
+def test_volatility_endpoint_sources(client, tmp_path, monkeypatch):
+    """Test the filter estimates saved by run_volatility.py are served apart from the MCMC ones."""
+    path = tmp_path / 'volatility_filter_estimates.csv'
+    monkeypatch.setitem(services.VOLATILITY_SOURCES, 'filter', str(path))
+    assert client.get('/api/volatility?source=filter').json == []
+    path.write_text('Date,Volatility\n2022-01-03,0.021\n2022-01-04,0.02\n')
+    assert client.get('/api/volatility?source=filter&format=columnar').json['Volatility'] == [0.021, 0.02]
+    assert len(client.get('/api/volatility?source=mcmc').json) > 2
+    assert client.get('/api/volatility?source=garch').status_code == 400
+    assert client.get('/api/volatility?source=filter&method=kalman').status_code == 400
+
+def test_rolling_endpoint(client):
+    """Test rolling statistics are served for a date range and validated."""
+    response = client.get('/api/rolling?window=20&stat=mean,ewm_std&start_date=2020-01-01&end_date=2020-03-31')
+    assert response.status_code == 200
+    rows = response.json
+    assert rows and set(rows[0]) == {'Date', 'Value', 'mean', 'ewm_std'}
+    assert rows[0]['Date'] >= '2020-01-01'
+    # Statistics at the start of the range already use earlier days
+    assert rows[0]['mean'] is not None
+    columnar = client.get('/api/rolling?series=returns&format=columnar').json
+    # span sets the EWMA span only, not the window
+    default = client.get('/api/rolling?stat=ewma&format=columnar').json
+    spanned = client.get('/api/rolling?stat=ewma&span=5&format=columnar').json
+    assert spanned['Date'] == default['Date'] and spanned['ewma'] != default['ewma']
+    assert 'get_rolling_columns' in client.get('/api/rolling?span=7').headers['Server-Timing']
+    assert set(columnar) == {'Date', 'Value', 'mean', 'std'}
+    assert client.get('/api/rolling?window=1').status_code == 400
+    assert client.get('/api/rolling?window=100000000000').status_code == 400
+    assert client.get('/api/rolling?window=50000').status_code == 400
+    assert client.get('/api/rolling?stat=median').status_code == 400
+    assert client.get('/api/rolling?series=volume').status_code == 400
+
+def test_rolling_columnar_json_is_strict(client):
+    """Test windows not yet full are sent as null, never as the non-standard NaN token."""
+    def reject(token):
+        raise ValueError(f"non-standard JSON constant {token}")
+
+    response = client.get('/api/rolling?window=20&stat=mean,std&format=columnar')
+    assert response.status_code == 200
+    data = json.loads(response.get_data(as_text=True), parse_constant=reject)
+    assert data['mean'][0] is None and data['mean'][-1] is not None
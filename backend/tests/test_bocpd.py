@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pytest
+from app import services
+from app.analysis.bocpd import OnlineChangepointDetector
+
+@pytest.fixture
+def regime_switch():
+    """Calm regime followed by a volatile one starting at index 300."""
+    rng = np.random.default_rng(5)
+    return np.concatenate([rng.normal(0, 0.01, 300), rng.normal(0, 0.05, 100)])
+
+def test_detects_regime_switch(regime_switch):
+    """Test the run length resets after the volatility jump."""
+    detector = OnlineChangepointDetector(hazard=1 / 100)
+    detector.update_many(regime_switch)
+    assert abs(detector.map_run_length() - 100) <= 10
+    assert detector.regime_estimate()['volatility'] == pytest.approx(0.05, rel=0.2)
+
+def test_run_length_is_bounded(regime_switch):
+    """Test truncation caps memory at max_run_length."""
+    detector = OnlineChangepointDetector(max_run_length=50)
+    detector.update_many(regime_switch)
+    assert len(detector.log_probs) == 50
+    assert detector.run_length_probs.sum() == pytest.approx(1.0)
+
+def test_checkpoint_resume_matches_uninterrupted(tmp_path, regime_switch):
+    """Test that save/load mid-stream gives the same posterior."""
+    full = OnlineChangepointDetector()
+    full.update_many(regime_switch)
+
+    partial = OnlineChangepointDetector()
+    partial.update_many(regime_switch[:250], last_date=19000)
+    path = str(tmp_path / 'state.npz')
+    partial.save(path)
+    resumed = OnlineChangepointDetector.load(path)
+    assert resumed.last_date == 19000
+    resumed.update_many(regime_switch[250:])
+
+    assert resumed.n_observed == full.n_observed
+    np.testing.assert_allclose(resumed.log_probs, full.log_probs)
+
+def test_invalid_hazard():
+    """Test that the hazard must be a probability."""
+    with pytest.raises(ValueError):
+        OnlineChangepointDetector(hazard=0)
+
+def test_service_resumes_checkpoints_written_by_other_workers(tmp_path):
+    """Test a worker reloads the shared checkpoint once another process has replaced it."""
+    first = services.DataService.get_online_regime()
+    # Another worker checkpoints a detector that has seen more observations
+    other = OnlineChangepointDetector.load(services.BOCPD_STATE_FILE)
+    other.n_observed += 1000
+    other.save(services.BOCPD_STATE_FILE)
+    assert services.DataService.get_online_regime()['observations'] == first['observations'] + 1000
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
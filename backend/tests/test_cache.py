@@ -0,0 +1,95 @@
+import os
+import threading
+
+import numpy as np
+from app.cache import DatasetCache, file_signature
+
+def _write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+def test_cache_hit_after_first_load(tmp_path):
+    """Test that a file is parsed once and then served from memory."""
+    path = str(tmp_path / 'data.csv')
+    _write(path, 'a\n1\n')
+    calls = []
+    cache = DatasetCache()
+
+    def loader(p):
+        calls.append(p)
+        return open(p).read()
+
+    assert cache.get(path, loader) == 'a\n1\n'
+    assert cache.get(path, loader) == 'a\n1\n'
+    assert len(calls) == 1
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'reloads': 0, 'evictions': 0, 'entries': 1, 'bytes': 0}
+
+def test_cache_reloads_on_change(tmp_path):
+    """Test that a change in mtime/size triggers a reload."""
+    path = str(tmp_path / 'data.csv')
+    _write(path, 'a\n1\n')
+    cache = DatasetCache()
+    cache.get(path, lambda p: open(p).read())
+
+    _write(path, 'a\n1\n2\n')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(path, lambda p: open(p).read()) == 'a\n1\n2\n'
+    assert cache.stats()['reloads'] == 1
+    assert cache.signature(path) == file_signature(path)
+
+def test_cache_clear_resets_counters(tmp_path):
+    """Test that clear drops entries and counters."""
+    path = str(tmp_path / 'data.csv')
+    _write(path, 'a\n')
+    cache = DatasetCache()
+    cache.get(path, lambda p: 1)
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'reloads': 0, 'evictions': 0, 'entries': 0, 'bytes': 0}
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test that entries beyond the memory budget are dropped oldest-use first."""
+    paths = [str(tmp_path / f'{name}.csv') for name in 'abc']
+    for path in paths:
+        _write(path, 'a\n')
+    cache = DatasetCache(max_bytes=2 * 800)
+    loader = lambda p: np.zeros(100)
+
+    cache.get(paths[0], loader)
+    cache.get(paths[1], loader)
+    cache.get(paths[0], loader)
+    cache.get(paths[2], loader)
+    assert cache.cached(paths[0]) and cache.cached(paths[2])
+    assert not cache.cached(paths[1])
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] == 1600
+
+def test_slow_load_blocks_only_its_own_path(tmp_path):
+    """Test a cold parse of one file leaves other files servable and is shared by its own waiters."""
+    slow, fast = str(tmp_path / 'slow.csv'), str(tmp_path / 'fast.csv')
+    _write(slow, 'a\n')
+    _write(fast, 'b\n')
+    cache = DatasetCache()
+    cache.get(fast, lambda p: 'fast')
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_loader(p):
+        calls.append(p)
+        started.set()
+        assert release.wait(5)
+        return 'slow'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(slow, slow_loader))) for _ in range(2)]
+    threads[0].start()
+    assert started.wait(5)
+    threads[1].start()
+    # Served while slow.csv is still being parsed
+    assert cache.get(fast, lambda p: 'reloaded') == 'fast'
+    assert cache.get(str(tmp_path / 'missing.csv'), lambda p: 'none') == 'none'
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == ['slow', 'slow'] and len(calls) == 1
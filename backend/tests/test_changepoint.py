@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.analysis.changepoint import (
+    NIGPrior,
+    fit_single_changepoint,
+    hdi,
+    impact_table,
+    summary_table,
+)
+
+@pytest.fixture
+def shifted_series():
+    """Series with a volatility jump after index 299."""
+    rng = np.random.default_rng(1)
+    return np.concatenate([rng.normal(0, 0.01, 300), rng.normal(0.002, 0.04, 200)])
+
+def test_posterior_locates_change(shifted_series):
+    """Test the exact posterior concentrates at the planted break."""
+    posterior = fit_single_changepoint(shifted_series)
+    assert posterior.tau_probs.sum() == pytest.approx(1.0)
+    assert abs(posterior.tau_mode() - 299) <= 10
+    means = posterior.expected()
+    assert means['sigma_before'] == pytest.approx(0.01, rel=0.15)
+    assert means['sigma_after'] == pytest.approx(0.04, rel=0.15)
+
+def test_posterior_matches_brute_force():
+    """Test prefix-sum marginals against a direct per-tau computation."""
+    from scipy.special import gammaln
+    rng = np.random.default_rng(2)
+    x = rng.normal(0, 0.02, 40)
+    prior = NIGPrior()
+
+    def log_ml(seg):
+        n = len(seg)
+        kn = prior.kappa0 + n
+        mn = (prior.kappa0 * prior.mu0 + seg.sum()) / kn
+        an = prior.alpha0 + n / 2
+        xbar = seg.mean() if n else 0.0
+        bn = prior.beta0 + 0.5 * ((seg - xbar) ** 2).sum() + prior.kappa0 * n * (xbar - prior.mu0) ** 2 / (2 * kn)
+        return (gammaln(an) - gammaln(prior.alpha0) + prior.alpha0 * np.log(prior.beta0) - an * np.log(bn)
+                + 0.5 * np.log(prior.kappa0 / kn) - n / 2 * np.log(2 * np.pi))
+
+    log_post = np.array([log_ml(x[:t + 1]) + log_ml(x[t + 1:]) for t in range(len(x))])
+    expected = np.exp(log_post - np.logaddexp.reduce(log_post))
+    np.testing.assert_allclose(fit_single_changepoint(x, prior).tau_probs, expected, rtol=1e-8)
+
+def test_summary_and_impact_tables(shifted_series):
+    """Test output tables follow the layout of the stored CSVs."""
+    posterior = fit_single_changepoint(shifted_series)
+    summary = summary_table(posterior, draws=500)
+    assert list(summary.index) == ['tau', 'mu_before', 'mu_after', 'sigma_before', 'sigma_after']
+    assert 'hdi_3%' in summary.columns and (summary['r_hat'] == 1.0).all()
+
+    dates = pd.bdate_range('2015-01-01', periods=len(shifted_series))
+    impact = dict(zip(*impact_table(posterior, dates, draws=500).values.T))
+    assert impact['Date Lower CI (2.5%)'] <= impact['Change Point Date'] <= impact['Date Upper CI (97.5%)']
+    assert impact['Volatility Change (%)'].endswith('%')
+
+def test_hdi_narrowest_interval():
+    """Test HDI picks the densest interval."""
+    lower, upper = hdi(np.arange(100.0), prob=0.5)
+    assert upper - lower == 50
+
+def test_fit_requires_two_observations():
+    """Test that degenerate input is rejected."""
+    with pytest.raises(ValueError):
+        fit_single_changepoint([0.1])
+
+def test_default_prior_matches_documented_scale():
+    """Test the default prior has E[sigma^2] = 0.05^2 and a regime-mean sd of 0.1 at that volatility."""
+    prior = NIGPrior()
+    sigma2 = prior.beta0 / (prior.alpha0 - 1)
+    assert sigma2 == pytest.approx(0.05 ** 2)
+    assert np.sqrt(sigma2 / prior.kappa0) == pytest.approx(0.1)
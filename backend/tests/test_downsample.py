@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from app.downsample import lttb_indices, minmax_indices, downsample_indices
+
+def test_lttb_keeps_endpoints_and_size():
+    """Test LTTB returns n_out sorted indices including both ends."""
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    idx = lttb_indices(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert np.all(np.diff(idx) > 0)
+
+def test_lttb_preserves_spike():
+    """Test that an isolated spike survives LTTB downsampling."""
+    y = np.zeros(1000)
+    y[537] = 10.0
+    idx = lttb_indices(np.arange(1000), y, 50)
+    assert 537 in idx
+
+def test_minmax_keeps_extremes():
+    """Test min/max bucketing keeps the global extremes."""
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=5000)
+    idx = minmax_indices(y, 200)
+    assert len(idx) <= 200
+    assert y.argmax() in idx and y.argmin() in idx
+
+def test_downsample_noop_when_small():
+    """Test that short series are returned unchanged."""
+    idx = downsample_indices(np.arange(10), np.arange(10.0), 100)
+    assert list(idx) == list(range(10))
+
+def test_downsample_unknown_method():
+    """Test that an unknown method is rejected."""
+    with pytest.raises(ValueError):
+        downsample_indices(np.arange(10), np.arange(10.0), 5, method='avg')
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from app.figures import FigurePipeline, decimate, stored_hash
+
+pytest.importorskip('matplotlib')
+import matplotlib.pyplot as plt
+
+PIPELINE = FigurePipeline('unused', style='default')
+
+@PIPELINE.figure('line.png', inputs=['x', 'y'], dpi=20)
+def line(x, y):
+    fig, ax = plt.subplots(figsize=(2, 1))
+    ax.plot(x, y)
+    return fig
+
+@PIPELINE.figure('broken.png', inputs=['x'], dpi=20)
+def broken(x):
+    raise ValueError("no data")
+
+def test_decimate_keeps_endpoints_and_short_series():
+    """Test long series are thinned to max_points, keeping both ends; short ones pass through."""
+    dates = np.arange('2000-01-01', '2010-01-01', dtype='datetime64[D]')
+    values = np.sin(np.arange(len(dates)) / 50.0)
+    x, y = decimate(dates, values, max_points=500)
+    assert len(x) == 500 and x.dtype == dates.dtype
+    assert (x[0], x[-1]) == (dates[0], dates[-1])
+    assert len(decimate(dates[:100], values[:100], max_points=500)[0]) == 100
+
+def test_render_skips_unchanged_inputs(tmp_path):
+    """Test a figure is redrawn only when its inputs change, with the hash kept in the PNG."""
+    PIPELINE.output_dir = str(tmp_path)
+    data = {'x': np.arange(10), 'y': np.arange(10) ** 2}
+    assert PIPELINE.render(data, ['line.png'])['line.png'].status == 'rendered'
+    digest = stored_hash(PIPELINE.path('line.png'))
+    assert digest is not None
+
+    assert PIPELINE.render(data, ['line.png'])['line.png'].status == 'cached'
+    assert PIPELINE.render(data, ['line.png'], force=True)['line.png'].status == 'rendered'
+    changed = dict(data, y=np.arange(10) ** 3)
+    assert PIPELINE.stale(changed, ['line.png']).keys() == {'line.png'}
+    assert PIPELINE.render(changed, ['line.png'])['line.png'].status == 'rendered'
+    assert stored_hash(PIPELINE.path('line.png')) != digest
+
+def test_render_in_workers_reports_failures(tmp_path):
+    """Test figures render in worker processes and a failing one does not stop the rest."""
+    PIPELINE.output_dir = str(tmp_path)
+    results = PIPELINE.render({'x': np.arange(5), 'y': np.ones(5)}, workers=2)
+    assert results['line.png'].status == 'rendered'
+    assert results['broken.png'].status == 'failed' and 'no data' in results['broken.png'].error
+    assert not (tmp_path / 'broken.png').exists()
+    with pytest.raises(KeyError):
+        PIPELINE.stale({'y': np.ones(5)}, ['line.png'])
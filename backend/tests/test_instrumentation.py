@@ -0,0 +1,70 @@
+import threading
+import time
+from app.instrumentation import STAGE_LATENCY, Histogram, span
+from app.profiler import SamplingProfiler
+
+def test_server_timing_reports_stages(client):
+    """Test responses carry the total and the stages that ran."""
+    header = client.get('/api/prices').headers['Server-Timing']
+    names = [entry.split(';')[0] for entry in header.split(', ')]
+    assert names[0] == 'total'
+    assert {'get_prices', 'read_csv', 'parse_dates', 'to_dict', 'json_encode'} <= set(names)
+    # Served from the response cache: nothing is recomputed
+    header = client.get('/api/prices').headers['Server-Timing']
+    assert 'get_prices' not in header
+
+def test_metrics_endpoint(client):
+    """Test /api/metrics exposes request latency by route and cache counters."""
+    client.get('/api/events')
+    client.get('/api/events')
+    response = client.get('/api/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert '# TYPE api_request_duration_seconds histogram' in text
+    assert 'api_request_duration_seconds_count{endpoint="/api/events",method="GET",status="200"}' in text
+    assert 'api_stage_duration_seconds_bucket{stage="get_events",le="+Inf"}' in text
+    assert 'api_cache_hits_total{cache="response"} 1' in text
+
+def test_histogram_buckets_are_cumulative():
+    """Test observations land in the first bucket whose bound they do not exceed."""
+    histogram = Histogram('demo_seconds', "Demo.", ('stage',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, stage='x')
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{stage="x",le="0.1"} 2' in lines
+    assert 'demo_seconds_bucket{stage="x",le="1.0"} 3' in lines
+    assert 'demo_seconds_bucket{stage="x",le="+Inf"} 4' in lines
+    assert 'demo_seconds_count{stage="x"} 4' in lines
+
+def test_span_outside_request():
+    """Test spans work without a request (scripts, warm-up)."""
+    def count():
+        line = 'api_stage_duration_seconds_count{stage="offline_stage"} '
+        return sum(int(entry[len(line):]) for entry in STAGE_LATENCY.render() if entry.startswith(line))
+
+    before = count()
+    with span('offline_stage'):
+        pass
+    assert count() == before + 1
+
+def test_sampling_profiler_collapses_stacks():
+    """Test the profiler attributes samples to the busy function."""
+    def busy_loop():
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+
+    profiler = SamplingProfiler(threading.get_ident()).start()
+    busy_loop()
+    profiler.stop()
+    assert profiler.samples > 0
+    assert 'busy_loop' in profiler.collapsed()
+
+def test_profiling_is_opt_in(app, client):
+    """Test ?profile=1 only replaces the body when profiling is enabled."""
+    assert client.get('/api/events?profile=1').is_json
+    app.config['PROFILING'] = True
+    response = client.get('/api/events?profile=1')
+    assert response.mimetype == 'text/plain'
+    assert 'X-Profile-Samples' in response.headers
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from app.analysis.intervals import IntervalIndex
+
+def brute_force(starts, ends, lo, hi):
+    return sorted((q, i) for q in range(len(lo)) for i in range(len(starts))
+                  if starts[i] <= hi[q] and ends[i] >= lo[q])
+
+def test_query_matches_brute_force():
+    """Test the join against all pairs, including nested intervals."""
+    rng = np.random.default_rng(4)
+    starts = rng.integers(0, 1000, 60)
+    ends = starts + rng.integers(0, 80, 60)
+    ends[:3] = starts[:3] + 500  # long intervals that nest others
+    points = rng.integers(-50, 1100, 200)
+    index = IntervalIndex(starts, ends)
+    q, i = index.stab(points, window=10)
+    assert sorted(zip(q.tolist(), i.tolist())) == brute_force(starts, ends, points - 10, points + 10)
+
+def test_point_intervals_and_empty_index():
+    """Test degenerate intervals and an index without intervals."""
+    index = IntervalIndex(np.array([5, 10]), np.array([5, 10]))
+    q, i = index.stab(np.array([4, 10, 20]), window=1)
+    assert list(zip(q, i)) == [(0, 0), (1, 1)]
+    q, i = IntervalIndex(np.array([], dtype=int), np.array([], dtype=int)).stab(np.array([1, 2]))
+    assert len(q) == len(i) == 0
+    with pytest.raises(ValueError):
+        IntervalIndex(np.array([3]), np.array([1]))
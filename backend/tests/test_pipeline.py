@@ -0,0 +1,104 @@
+import json
+import threading
+
+import pytest
+from app.pipeline import Pipeline
+
+def make_pipeline(tmp_path, calls):
+    """raw.txt -> upper.txt -> {count.txt, first.txt}, with each stage logging its runs."""
+    pipeline = Pipeline(str(tmp_path), str(tmp_path / 'state' / 'pipeline.json'))
+
+    @pipeline.stage('upper', inputs=['raw.txt'], outputs=['upper.txt'])
+    def upper():
+        calls.append('upper')
+        (tmp_path / 'upper.txt').write_text((tmp_path / 'raw.txt').read_text().upper())
+
+    @pipeline.stage('count', inputs=['upper.txt'], outputs=['count.txt'])
+    def count():
+        calls.append('count')
+        (tmp_path / 'count.txt').write_text(str(len((tmp_path / 'upper.txt').read_text())))
+
+    @pipeline.stage('first', inputs=['upper.txt'], outputs=['first.txt'])
+    def first():
+        calls.append('first')
+        (tmp_path / 'first.txt').write_text((tmp_path / 'upper.txt').read_text()[:1])
+
+    return pipeline
+
+def test_run_skips_fresh_stages(tmp_path):
+    """Test stages rerun only when their input contents change, stopping where outputs are unchanged."""
+    (tmp_path / 'raw.txt').write_text('abc')
+    calls = []
+    pipeline = make_pipeline(tmp_path, calls)
+    results = pipeline.run(workers=2)
+    assert list(results) == ['upper', 'count', 'first']
+    assert {result.status for result in results.values()} == {'ran'}
+    assert (tmp_path / 'count.txt').read_text() == '3'
+
+    # A new pipeline object reads the saved state
+    calls.clear()
+    pipeline = make_pipeline(tmp_path, calls)
+    assert pipeline.status() == {'upper': 'fresh', 'count': 'fresh', 'first': 'fresh'}
+    assert {result.status for result in pipeline.run().values()} == {'fresh'} and calls == []
+
+    # Same upper-cased output: the stages below are skipped
+    (tmp_path / 'raw.txt').write_text('ABC')
+    assert pipeline.status()['count'] == 'stale'
+    assert {name: result.status for name, result in pipeline.run().items()} == \
+        {'upper': 'ran', 'count': 'fresh', 'first': 'fresh'}
+
+    # A deleted output reruns its stage only
+    (tmp_path / 'first.txt').unlink()
+    calls.clear()
+    pipeline.run()
+    assert calls == ['first']
+
+    # Forcing a target leaves its fresh upstream stages alone
+    assert {name: result.status for name, result in pipeline.run(['count'], force=True).items()} == \
+        {'upper': 'fresh', 'count': 'ran'}
+
+    runs = (tmp_path / 'state' / 'pipeline_runs.jsonl').read_text().splitlines()
+    assert len(runs) == 5 and json.loads(runs[0])['stages']['upper']['status'] == 'ran'
+
+def test_run_concurrently_and_block_after_failure(tmp_path):
+    """Test independent stages run at once and a failure blocks only its descendants."""
+    pipeline = Pipeline(str(tmp_path), str(tmp_path / 'pipeline.json'))
+    barrier = threading.Barrier(2, timeout=5)
+
+    @pipeline.stage('a', outputs=['a.txt'])
+    def a():
+        barrier.wait()
+        (tmp_path / 'a.txt').write_text('a')
+
+    @pipeline.stage('b', outputs=['b.txt'])
+    def b():
+        barrier.wait()
+        raise RuntimeError("no data")
+
+    @pipeline.stage('after_a', inputs=['a.txt'], outputs=['after_a.txt'])
+    def after_a():
+        (tmp_path / 'after_a.txt').write_text('done')
+
+    @pipeline.stage('after_b', inputs=['b.txt'], outputs=['after_b.txt'])
+    def after_b():
+        pass
+
+    results = pipeline.run(workers=2)
+    assert results['a'].status == 'ran' and results['after_a'].status == 'ran'
+    assert results['b'].status == 'failed' and 'no data' in results['b'].error
+    assert results['after_b'].status == 'blocked'
+    assert pipeline.select(['after_a']) == ['a', 'after_a']
+
+def test_invalid_graphs_are_rejected(tmp_path):
+    """Test shared outputs and cycles are reported before anything runs."""
+    pipeline = Pipeline(str(tmp_path), str(tmp_path / 'pipeline.json'))
+    pipeline.stage('x', inputs=['y.txt'], outputs=['x.txt'])(lambda: None)
+    pipeline.stage('y', inputs=['x.txt'], outputs=['y.txt'])(lambda: None)
+    with pytest.raises(ValueError, match='cycle'):
+        pipeline.run()
+
+    pipeline.stage('z', outputs=['x.txt'])(lambda: None)
+    with pytest.raises(ValueError, match='written by both'):
+        pipeline.dependencies()
+    with pytest.raises(KeyError):
+        Pipeline(str(tmp_path), str(tmp_path / 'p.json')).select(['missing'])
@@ -0,0 +1,103 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pytest
+from app import trace as trace_io
+from app.analysis.changepoint import hdi
+from app.analysis.diagnostics import effective_sample_size, split_rhat
+from app.analysis.posterior import PosteriorSummary, summarize
+from app.analysis.sampling import GibbsChangepointSampler, SamplerConfig, run_chains
+
+@pytest.fixture
+def draws():
+    rng = np.random.default_rng(5)
+    shape = (3, 400)
+    return {
+        'tau': rng.integers(90, 110, shape),
+        'mu_before': rng.normal(0.001, 0.0005, shape),
+        'mu_after': rng.normal(0.0, 0.0005, shape),
+        'sigma_before': rng.normal(0.010, 0.0005, shape),
+        'sigma_after': rng.normal(0.020, 0.001, shape),
+    }
+
+def test_summary_matches_separate_passes(draws):
+    """Test the one-pass summary agrees with per-variable diagnostics and percentiles."""
+    summary = summarize(draws)
+    for name, chains in draws.items():
+        row = summary.table.loc[name]
+        lower, upper = hdi(chains.ravel().astype(float))
+        assert (row['hdi_3%'], row['hdi_97%']) == (round(lower, 3), round(upper, 3))
+        assert row['ess_bulk'] == round(effective_sample_size(chains), 3)
+        assert row['r_hat'] == round(split_rhat(chains), 3)
+        assert sum(summary.histograms[name]['counts']) == chains.size
+
+    tau = draws['tau'].ravel()
+    assert summary.tau_mode == np.bincount(tau).argmax()
+    assert summary.tau_interval == [int(q) for q in np.quantile(tau, [0.025, 0.975])]
+    change = (draws['mu_after'] - draws['mu_before']).ravel()
+    assert summary.prob_increase == (change > 0).mean()
+    assert summary.mean_change['q50'] == pytest.approx(np.median(change))
+    vol = ((draws['sigma_after'] - draws['sigma_before']) / draws['sigma_before']).ravel() * 100
+    assert summary.volatility_change_pct['mean'] == pytest.approx(vol.mean())
+    assert summary.volatility_change_pct['q2.5'] == pytest.approx(np.percentile(vol, 2.5))
+
+def test_summary_without_changepoint_parameters(draws, tmp_path):
+    """Test other traces get the table only, and summaries survive a JSON round trip."""
+    summary = summarize(draws, ['sigma_after', 'mu_after'], prob=0.9)
+    assert list(summary.table.index) == ['sigma_after', 'mu_after']
+    assert 'hdi_5%' in summary.table.columns
+    assert summary.tau_mode is None and summary.volatility_change_pct is None
+
+    path = str(tmp_path / 'summary.json')
+    summarize(draws).save(path)
+    loaded = PosteriorSummary.load(path)
+    pd.testing.assert_frame_equal(loaded.table, summarize(draws).table, check_dtype=False)
+    assert loaded.tau_interval == summarize(draws).tau_interval
+
+def test_cached_summary_follows_the_trace(tmp_path, monkeypatch):
+    """Test the summary is cached next to the trace and recomputed once it grows."""
+    rng = np.random.default_rng(9)
+    sampler = GibbsChangepointSampler(np.concatenate([rng.normal(0, 0.01, 60), rng.normal(0, 0.03, 40)]))
+    store = str(tmp_path / 'chains')
+    run_chains(sampler, store, SamplerConfig(draws=40, tune=0, chains=2, chunk_size=20, cores=1))
+    source = os.path.join(store, 'config.json')
+
+    first = trace_io.cached_summary(source)
+    assert os.path.isfile(os.path.join(store, trace_io.SUMMARY_FILE))
+    assert first.draws == 40 and first.tau_mode is not None
+
+    calls = []
+    monkeypatch.setattr(trace_io, 'summarize', lambda *args: calls.append(args) or summarize(*args))
+    assert trace_io.cached_summary(source).tau_interval == first.tau_interval
+    assert not calls
+
+    run_chains(sampler, store, SamplerConfig(draws=60, tune=0, chains=2, chunk_size=20, cores=1))
+    assert trace_io.cached_summary(source).draws == 60
+    assert len(calls) == 1
+
+def test_cached_summary_per_probability(draws, tmp_path, monkeypatch):
+    """Test only the default probability is saved; others are cached in memory, boundedly."""
+    rng = np.random.default_rng(3)
+    sampler = GibbsChangepointSampler(np.concatenate([rng.normal(0, 0.01, 60), rng.normal(0, 0.03, 40)]))
+    store = str(tmp_path / 'chains')
+    run_chains(sampler, store, SamplerConfig(draws=40, tune=0, chains=2, chunk_size=20, cores=1))
+    source = os.path.join(store, 'config.json')
+    monkeypatch.setattr(trace_io, '_memory_summaries', OrderedDict())
+    monkeypatch.setattr(trace_io, 'MEMORY_SUMMARIES', 2)
+
+    assert trace_io.cached_summary(source, prob=0.9).prob == 0.9
+    assert trace_io.cached_summary(source).prob == 0.94
+    calls = []
+    monkeypatch.setattr(trace_io, 'summarize', lambda *args: calls.append(args) or summarize(*args))
+    assert trace_io.cached_summary(source, prob=0.9).prob == 0.9
+    assert trace_io.cached_summary(source).prob == 0.94
+    assert not calls
+    assert sorted(name for name in os.listdir(store) if name.endswith('.json')) == ['config.json', 'run.json', 'summary.json']
+
+    for prob in (0.5, 0.6, 0.7):
+        trace_io.cached_summary(source, prob=prob)
+    assert [key[1] for key in trace_io._memory_summaries] == [0.6, 0.7]
+    with pytest.raises(ValueError):
+        trace_io.save_summary(source, summarize(draws, prob=0.9))
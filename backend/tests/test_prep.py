@@ -0,0 +1,76 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from app.prep import ReturnsMemo, compute_returns
+
+DATES = np.array(['2011-12-29', '2011-12-30', '2012-01-03', '2012-01-04', '2012-01-05'], dtype='datetime64[D]')
+PRICES = np.array([100.0, 101.0, 102.0, 99.0, 99.0])
+
+def reference_returns(start_date):
+    """The pandas preparation previously repeated in every script."""
+    df = pd.DataFrame({'Date': DATES.astype('datetime64[s]'), 'Price': PRICES})
+    df = df[df['Date'] >= start_date].copy()
+    df['Log_Return'] = np.log(df['Price'] / df['Price'].shift(1))
+    return df.dropna().reset_index(drop=True)
+
+def test_compute_returns_matches_pandas_preparation():
+    """Test the single-pass preparation reproduces the original pipeline."""
+    series = compute_returns(DATES, PRICES, '2012-01-01')
+    pd.testing.assert_frame_equal(series.to_frame(), reference_returns('2012-01-01'))
+    assert len(compute_returns(DATES, PRICES).log_returns) == len(DATES) - 1
+
+def test_memo_reuses_artifact_until_source_changes(tmp_path):
+    """Test prepared series are stored once per source version and start date."""
+    source = tmp_path / 'prices.csv'
+    source.write_text('v1')
+    calls = []
+
+    def load():
+        calls.append(1)
+        return DATES, PRICES
+
+    memo = ReturnsMemo(str(tmp_path / 'prep'))
+    first = memo.get(str(source), '2012-01-01', load)
+    # A fresh memo (e.g. another process) reads the artifact from disk
+    second = ReturnsMemo(str(tmp_path / 'prep')).get(str(source), '2012-01-01', load)
+    np.testing.assert_array_equal(first.log_returns, second.log_returns)
+    assert len(calls) == 1
+
+    memo.get(str(source), None, load)
+    source.write_text('v2')
+    memo.get(str(source), '2012-01-01', load)
+    assert len(calls) == 3
+    # Artifacts of the source's previous contents are deleted
+    assert len(os.listdir(tmp_path / 'prep')) == 1
+
+def test_start_date_spellings_share_one_artifact(tmp_path):
+    """Test other date spellings are normalized, and their artifacts named by the ISO date."""
+    source = tmp_path / 'prices.csv'
+    source.write_text('v1')
+    calls = []
+
+    def load():
+        calls.append(1)
+        return DATES, PRICES
+
+    memo = ReturnsMemo(str(tmp_path / 'prep'))
+    slashed = memo.get(str(source), '2012/01/01', load)
+    pd.testing.assert_frame_equal(slashed.to_frame(), reference_returns('2012-01-01'))
+    memo.get(str(source), '2012-01-01', load)
+    assert len(calls) == 1
+    assert [name.endswith('_2012-01-01.npz') for name in os.listdir(tmp_path / 'prep')] == [True]
+    with pytest.raises(ValueError):
+        compute_returns(DATES, PRICES, 'not a date')
+
+def test_memo_keeps_a_bounded_number_of_series(tmp_path):
+    """Test in-memory series are dropped least recently used first, and no temporary files remain."""
+    source = tmp_path / 'prices.csv'
+    source.write_text('v1')
+    memo = ReturnsMemo(str(tmp_path / 'prep'), max_series=2)
+    load = lambda: (DATES, PRICES)
+    for start_date in ('2011-12-30', '2012-01-03', '2011-12-30', '2012-01-04'):
+        memo.get(str(source), start_date, load)
+    assert [os.path.basename(path).rsplit('_', 1)[1] for path in memo._series] == \
+        ['2011-12-30.npz', '2012-01-04.npz']
+    assert sorted(name.endswith('.npz') for name in os.listdir(tmp_path / 'prep')) == [True] * 3
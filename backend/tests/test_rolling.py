@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app import services
+from app.analysis.rolling import MAX_WINDOW, ROLLING_STATS, RollingWindow
+from app.services import DataService
+from app.store import PriceStore, append_rows
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(5)
+    return 60 * np.exp(np.cumsum(rng.normal(0, 0.02, 500)))
+
+def test_fill_matches_pandas(prices):
+    """Test the vectorized pass agrees with pandas rolling and ewm."""
+    stats = RollingWindow(20, span=10).fill(prices)
+    series = pd.Series(prices)
+    np.testing.assert_allclose(stats['mean'], series.rolling(20).mean())
+    np.testing.assert_allclose(stats['std'], series.rolling(20).std())
+    np.testing.assert_allclose(stats['ewma'], series.ewm(span=10, adjust=False).mean())
+    assert np.isnan(stats['mean'][18]) and not np.isnan(stats['mean'][19])
+
+def test_updates_continue_full_history(prices):
+    """Test O(1) updates after a partial fill reproduce the full-history pass."""
+    full = RollingWindow(20).fill(prices)
+    roller = RollingWindow(20)
+    roller.fill(prices[:300])
+    tail = roller.extend(prices[300:])
+    for name in ROLLING_STATS:
+        np.testing.assert_allclose(tail[name], full[name][300:], rtol=1e-9)
+
+def test_updates_from_empty_state(prices):
+    """Test a window that starts empty fills up through the Welford phase."""
+    full = RollingWindow(20).fill(prices[:60])
+    stepped = RollingWindow(20).extend(prices[:60])
+    for name in ROLLING_STATS:
+        np.testing.assert_allclose(stepped[name], full[name], rtol=1e-9)
+    with pytest.raises(ValueError):
+        RollingWindow(1)
+
+def test_service_extends_appended_prices(tmp_path, monkeypatch, prices):
+    """Test appended store rows are absorbed without refilling the history."""
+    store = PriceStore(str(tmp_path / 'store'))
+    dates = pd.bdate_range('2020-01-01', periods=len(prices))
+    rows = [{'Date': d.strftime('%d-%b-%Y'), 'Price': p} for d, p in zip(dates, prices)]
+    append_rows(store, rows[:400])
+    monkeypatch.setattr(services, 'PRICE_STORE_DIR', store.path)
+    DataService.get_rolling_columns(window=10, series='returns')
+
+    append_rows(store, rows[400:])
+    expected = RollingWindow(10).fill(np.diff(np.log(prices)))
+    filled = []
+    monkeypatch.setattr(RollingWindow, 'fill', lambda self, values: filled.append(values))
+    columns = DataService.get_rolling_columns(window=10, stats=ROLLING_STATS, series='returns')
+    assert not filled
+    assert len(columns['Date']) == len(prices) - 1
+    for name in ROLLING_STATS:
+        np.testing.assert_allclose(columns[name], expected[name], rtol=1e-9)
+
+def test_window_is_bounded(tmp_path, monkeypatch, prices):
+    """Test windows beyond MAX_WINDOW or the series length are rejected before allocating."""
+    with pytest.raises(ValueError):
+        RollingWindow(MAX_WINDOW + 1)
+    store = PriceStore(str(tmp_path / 'store'))
+    dates = pd.bdate_range('2020-01-01', periods=len(prices))
+    append_rows(store, [{'Date': d.strftime('%d-%b-%Y'), 'Price': p} for d, p in zip(dates, prices)])
+    monkeypatch.setattr(services, 'PRICE_STORE_DIR', store.path)
+    with pytest.raises(ValueError, match='observations'):
+        DataService.get_rolling_columns(window=len(prices) + 1)
+
+def test_states_are_evicted_least_recently_used(tmp_path, monkeypatch, prices):
+    """Test rolling states stay within their memory budget, keeping the most recent ones."""
+    store = PriceStore(str(tmp_path / 'store'))
+    dates = pd.bdate_range('2020-01-01', periods=len(prices))
+    append_rows(store, [{'Date': d.strftime('%d-%b-%Y'), 'Price': p} for d, p in zip(dates, prices)])
+    monkeypatch.setattr(services, 'PRICE_STORE_DIR', store.path)
+    # Room for two states of a 500-row series (Date, Value, four statistics and a small buffer)
+    monkeypatch.setattr(services, 'ROLLING_CACHE_MAX_BYTES', 2 * 6 * 8 * len(prices) + 1000)
+    for window in (5, 10, 15):
+        DataService.get_rolling_columns(window=window)
+    states = DataService._rolling_states
+    assert [key[2] for key in states] == [10, 15]
+    DataService.get_rolling_columns(window=10)
+    DataService.get_rolling_columns(window=20)
+    assert [key[2] for key in states] == [10, 20]
+
+    # A state larger than the budget is still kept until the next one arrives
+    monkeypatch.setattr(services, 'ROLLING_CACHE_MAX_BYTES', 0)
+    DataService.get_rolling_columns(window=30)
+    assert [key[2] for key in states] == [30]
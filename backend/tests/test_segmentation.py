@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.analysis.segmentation import (
+    SegmentCost,
+    binary_segmentation,
+    crops,
+    pelt,
+    segment_table,
+)
+
+@pytest.fixture
+def three_regimes():
+    """Series with volatility breaks at 200 and 350."""
+    rng = np.random.default_rng(3)
+    return np.concatenate([
+        rng.normal(0, 0.01, 200),
+        rng.normal(0, 0.05, 150),
+        rng.normal(0, 0.02, 250),
+    ])
+
+def _brute_force(x, penalty, min_size):
+    """Optimal partitioning without pruning, for reference."""
+    cost = SegmentCost(x)
+    n = len(x)
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    for t in range(min_size, n + 1):
+        starts = np.array([s for s in range(0, t - min_size + 1) if s == 0 or s >= min_size])
+        best[t] = (best[starts] + cost(starts, t)).min() + penalty
+    return best[n]
+
+def test_pelt_finds_planted_breaks(three_regimes):
+    """Test PELT recovers the planted change points."""
+    result = pelt(three_regimes)
+    assert result.n_changepoints == 2
+    assert abs(result.changepoints[0] - 200) <= 5
+    assert abs(result.changepoints[1] - 350) <= 5
+
+@pytest.mark.parametrize('min_size', [2, 3, 5, 8])
+def test_pelt_matches_optimal_partitioning(min_size):
+    """Test pruning does not change the optimum on random series, penalties and lengths."""
+    rng = np.random.default_rng(min_size)
+    for _ in range(50):
+        n = int(rng.integers(2 * min_size, 70))
+        breaks = np.sort(rng.choice(np.arange(1, n), size=int(rng.integers(0, 4)), replace=False))
+        x = np.concatenate([rng.normal(rng.normal(0, 2), rng.uniform(0.2, 3), len(part))
+                            for part in np.split(np.arange(n), breaks)])
+        penalty = float(rng.uniform(0.5, 15))
+        result = pelt(x, penalty=penalty, min_size=min_size)
+        assert all(np.diff([0] + result.changepoints + [n]) >= min_size)
+        assert result.cost + penalty * result.n_changepoints == pytest.approx(_brute_force(x, penalty, min_size))
+
+def test_binary_segmentation_agrees(three_regimes):
+    """Test greedy splitting finds the same breaks on clear data."""
+    result = binary_segmentation(three_regimes)
+    assert len(result.changepoints) == 2
+    assert abs(result.changepoints[0] - 200) <= 5
+
+def test_crops_path_is_monotone(three_regimes):
+    """Test the penalty path orders solutions by number of breaks."""
+    path = crops(three_regimes, 5.0, 500.0)
+    counts = [seg.n_changepoints for seg in path]
+    assert counts == sorted(counts, reverse=True)
+    assert 2 in counts
+    with pytest.raises(ValueError, match='narrow'):
+        crops(three_regimes, 0.01, 500.0, max_segmentations=3)
+    assert crops(three_regimes, 5.0, 500.0, max_segmentations=counts[0] + 1) == path
+
+def test_segment_table(three_regimes):
+    """Test per-segment statistics line up with the breaks."""
+    dates = pd.bdate_range('2015-01-01', periods=len(three_regimes))
+    table = segment_table(three_regimes, dates, [200, 350])
+    assert list(table['Observations']) == [200, 150, 250]
+    assert table['Volatility'][1] > table['Volatility'][0]
+    np.testing.assert_allclose(table['Volatility'][0], three_regimes[:200].std(ddof=1))
@@ -0,0 +1,88 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from app import services
+from app.cache import dataset_cache
+from app.series import SeriesRegistry
+from app.services import DataService
+from app.store import PriceStore
+
+def _write_series(ticker, dates, prices):
+    os.makedirs(services.SERIES_RAW_DIR, exist_ok=True)
+    pd.DataFrame({'Date': dates, 'Price': prices}).to_csv(
+        os.path.join(services.SERIES_RAW_DIR, f'{ticker}.csv'), index=False)
+
+@pytest.fixture
+def two_series():
+    """WTI and Dubai with partly overlapping dates."""
+    _write_series('wti', ['2023-01-02', '2023-01-03', '2023-01-04'], [70.0, 71.0, 72.0])
+    _write_series('dubai', ['2023-01-03', '2023-01-04', '2023-01-05'], [75.0, 76.0, 77.0])
+
+def test_registry_discovers_csvs_and_stores(tmp_path):
+    """Test series are found by file name, stores included, and unknown tickers raise KeyError."""
+    registry = SeriesRegistry(str(tmp_path / 'raw'), str(tmp_path / 'stores'))
+    os.makedirs(registry.raw_dir)
+    open(os.path.join(registry.raw_dir, 'wti.csv'), 'w').close()
+    open(os.path.join(registry.raw_dir, 'Not A Ticker.csv'), 'w').close()
+    PriceStore(os.path.join(registry.store_dir, 'dubai')).write(np.array([19000]), np.array([75.0]), {})
+
+    assert registry.tickers() == ['dubai', 'wti']
+    assert registry.get('dubai').source().endswith('meta.json')
+    assert registry.get('wti').source() == os.path.join(registry.raw_dir, 'wti.csv')
+    with pytest.raises(KeyError):
+        registry.get('../raw/wti')
+    with pytest.raises(KeyError):
+        registry.get('brent')
+
+def test_series_loaded_lazily(two_series):
+    """Test only the requested series is parsed."""
+    prices = DataService.get_prices(ticker='wti')
+    assert [p['Price'] for p in prices] == [70.0, 71.0, 72.0]
+    assert dataset_cache.cached(services.price_source('wti'))
+    assert not dataset_cache.cached(services.price_source('dubai'))
+
+def test_aligned_columns_outer_and_inner(two_series):
+    """Test an outer join fills gaps with NaN and an inner join keeps common dates."""
+    outer = DataService.get_aligned_columns(['wti', 'dubai'])
+    assert outer['Date'].astype('datetime64[D]').astype(str).tolist() == \
+        ['2023-01-02', '2023-01-03', '2023-01-04', '2023-01-05']
+    np.testing.assert_array_equal(outer['wti'], [70.0, 71.0, 72.0, np.nan])
+    np.testing.assert_array_equal(outer['dubai'], [np.nan, 75.0, 76.0, 77.0])
+
+    inner = DataService.get_aligned_columns(['wti', 'dubai'], field='returns', join='inner')
+    assert inner['Date'].astype('datetime64[D]').astype(str).tolist() == ['2023-01-04']
+    np.testing.assert_allclose(inner['wti'], [np.log(72 / 71)])
+    np.testing.assert_allclose(inner['dubai'], [np.log(76 / 75)])
+
+def test_aligned_downsampling_keeps_every_series():
+    """Test each series keeps its own extremes when the union is downsampled."""
+    dates = pd.bdate_range('2020-01-01', periods=500).strftime('%Y-%m-%d')
+    wti, dubai = np.full(500, 70.0), np.full(500, 75.0)
+    wti[100], dubai[400] = 150.0, 10.0
+    _write_series('wti', dates, wti)
+    _write_series('dubai', dates, dubai)
+
+    columns = DataService.get_aligned_columns(['wti', 'dubai'], max_points=20, method='minmax')
+    assert len(columns['Date']) <= 40
+    assert columns['wti'].max() == 150.0
+    assert columns['dubai'].min() == 10.0
+
+def test_series_routes(client, two_series):
+    """Test per-series and batch endpoints, including unknown tickers."""
+    listing = client.get('/api/series').get_json()
+    assert [entry['ticker'] for entry in listing] == ['brent', 'dubai', 'wti']
+
+    response = client.get('/api/series/wti/prices')
+    assert response.status_code == 200
+    assert response.get_json()[0] == {'Date': '2023-01-02', 'Price': 70.0}
+    assert client.get('/api/series/wti/rolling?window=2').status_code == 200
+    assert client.get('/api/series/gasoil/prices').status_code == 404
+
+    rows = client.get('/api/series/prices?tickers=wti,dubai').get_json()
+    assert rows[0] == {'Date': '2023-01-02', 'wti': 70.0, 'dubai': None}
+    columns = client.get('/api/series/prices?tickers=wti&tickers=dubai&format=columnar').get_json()
+    assert columns['dubai'] == [None, 75.0, 76.0, 77.0]
+    assert client.get('/api/series/prices').status_code == 400
+    assert client.get('/api/series/prices?tickers=wti&join=left').status_code == 400
+    assert client.get('/api/series/prices?tickers=wti,gasoil').status_code == 404
@@ -72,3 +72,40 @@ def test_get_events_success(mock_read_csv):
         assert len(result) == 1
         assert result[0]['Event'] == 'Test Event'
 
+
+def test_get_prices_uses_cache(mock_read_csv):
+    """Test repeated get_prices calls parse the CSV only once."""
+    with patch('os.path.exists', return_value=True):
+        mock_read_csv.return_value = pd.DataFrame({
+            'Date': ['2023-01-01', '2023-01-05'],
+            'Price': [80.5, 82.0]
+        })
+        
+        DataService.get_prices()
+        result = DataService.get_prices(end_date='2023-01-02')
+        
+        assert mock_read_csv.call_count == 1
+        assert len(result) == 1
+        assert DataService.get_cache_stats()['hits'] == 1
+
+def test_get_prices_max_points(mock_read_csv):
+    """Test get_prices downsamples to max_points and keeps the endpoints."""
+    with patch('os.path.exists', return_value=True):
+        dates = pd.date_range('2020-01-01', periods=500, freq='D')
+        mock_read_csv.return_value = pd.DataFrame({
+            'Date': dates.strftime('%d-%b-%y'),
+            'Price': range(500)
+        })
+        
+        result = DataService.get_prices(max_points=20)
+        assert len(result) == 20
+        assert result[0]['Date'] == '2020-01-01'
+        assert result[-1]['Price'] == 499
+
+def test_get_events_keeps_iso_dates(mock_read_csv):
+    """Test ISO event dates are not read day-first."""
+    with patch('os.path.exists', return_value=True):
+        mock_read_csv.return_value = pd.DataFrame({
+            'Date': ['2014-06-01'], 'Event': ['Test Event'], 'Category': ['Test']
+        })
+        assert DataService.get_events()[0]['Date'].startswith('2014-06-01')
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app import services
+from app.services import DataService
+from app.store import PriceStore, append_rows, parse_price_rows
+
+CSV_ROWS = 'Date,Price\n20-May-87,18.63\n21-May-87,18.45\n"Nov 10, 2022",94.25\n'
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    path = tmp_path / 'prices.csv'
+    path.write_text(CSV_ROWS)
+    return str(path)
+
+def test_parse_price_rows_validates_and_dedupes():
+    """Test mixed date formats are normalized and duplicates collapse."""
+    days, prices = parse_price_rows(pd.DataFrame({
+        'Date': ['21-May-87', '20-May-87', 'May 21, 1987'],
+        'Price': [18.45, 18.63, 18.50],
+    }))
+    assert list(days.astype('datetime64[D]').astype(str)) == ['1987-05-20', '1987-05-21']
+    assert list(prices) == [18.63, 18.50]
+    with pytest.raises(ValueError):
+        parse_price_rows(pd.DataFrame({'Date': ['2022-01-01'], 'Price': [-1.0]}))
+    with pytest.raises(ValueError):
+        parse_price_rows(pd.DataFrame({'Date': ['someday'], 'Price': [1.0]}))
+
+def test_ingest_is_incremental(tmp_path, raw_csv):
+    """Test that re-ingesting only parses rows appended to the CSV."""
+    store = PriceStore(str(tmp_path / 'store'))
+    assert store.ingest_csv(raw_csv) == 3
+    assert store.ingest_csv(raw_csv) == 0
+
+    with open(raw_csv, 'a') as f:
+        f.write('"Nov 11, 2022",96.37\n')
+    assert store.ingest_csv(raw_csv) == 1
+    days, prices = store.load()
+    assert isinstance(prices, np.memmap)
+    assert store.meta()['last_date'] == '2022-11-11'
+    assert prices[-1] == 96.37
+
+def test_append_rejects_conflicting_price(tmp_path, raw_csv):
+    """Test duplicates are dropped and conflicting prices need replace."""
+    store = PriceStore(str(tmp_path / 'store'))
+    store.ingest_csv(raw_csv)
+    assert append_rows(store, [{'Date': '1987-05-20', 'Price': 18.63}]) == 0
+    with pytest.raises(ValueError):
+        append_rows(store, [{'Date': '1987-05-20', 'Price': 19.0}])
+    assert append_rows(store, [{'Date': '1987-05-20', 'Price': 19.0}], replace=True) == 1
+    assert store.load()[1][0] == 19.0
+
+def test_data_service_reads_store(tmp_path, raw_csv, monkeypatch):
+    """Test DataService prefers the store once it exists."""
+    store = PriceStore(str(tmp_path / 'store'))
+    store.ingest_csv(raw_csv)
+    monkeypatch.setattr(services, 'PRICE_STORE_DIR', store.path)
+    result = DataService.get_prices()
+    assert [row['Date'] for row in result] == ['1987-05-20', '1987-05-21', '2022-11-10']
+
+def test_parse_iso_dates_month_first():
+    """Test ISO dates are not read day first alongside the raw CSV formats."""
+    days, _ = parse_price_rows(pd.DataFrame({
+        'Date': ['2020-01-02', '03-Jan-2020', 'Jan 06, 2020'],
+        'Price': [60.0, 61.0, 62.0],
+    }))
+    assert list(days.astype('datetime64[D]').astype(str)) == ['2020-01-02', '2020-01-03', '2020-01-06']
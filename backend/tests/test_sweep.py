@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.analysis import SweepConfig, expand_grid, fit_single_changepoint, run_sweep
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(5)
+    x = np.concatenate([rng.normal(0, 0.01, 200), rng.normal(0, 0.03, 150)])
+    dates = np.datetime64('2015-01-01') + np.arange(len(x))
+    return {'2015-01-01': (dates, x), '2015-06-01': (dates[151:], x[151:])}
+
+def test_expand_grid():
+    """Test the grid expands to every combination over the base settings."""
+    configs = expand_grid({'start_date': ['2015-01-01', '2015-06-01'], 'kappa0': [0.01, 0.04, 0.16]},
+                          SweepConfig(model='gibbs', draws=10))
+    assert len(configs) == 6
+    assert configs[1] == SweepConfig(model='gibbs', start_date='2015-01-01', kappa0=0.04, draws=10)
+
+    # Each model is swept over its own parameters only
+    configs = expand_grid({'model': ['analytic', 'gibbs', 'pelt'], 'kappa0': [0.1, 0.25], 'penalty': [50, 100]})
+    assert [(c.model, c.kappa0, c.penalty) for c in configs] == [
+        ('analytic', 0.1, None), ('analytic', 0.25, None), ('gibbs', 0.1, None), ('gibbs', 0.25, None),
+        ('pelt', SweepConfig.kappa0, 50), ('pelt', SweepConfig.kappa0, 100)]
+    with pytest.raises(ValueError):
+        expand_grid({'sigma': [0.05]})
+    with pytest.raises(ValueError):
+        expand_grid({'model': ['pymc']})
+
+def test_parallel_sweep_matches_serial(series):
+    """Test pooled runs reproduce serial ones and the analytic row matches a direct fit."""
+    configs = expand_grid({'model': ['analytic', 'gibbs', 'pelt'], 'start_date': list(series)},
+                          SweepConfig(draws=200, tune=50))
+    serial = run_sweep(configs, series, workers=1)
+    parallel = run_sweep(configs, series, workers=3)
+    columns = serial.columns.drop('seconds')
+    assert serial[columns].equals(parallel[columns])
+    assert serial['error'].isna().all()
+
+    dates, x = series['2015-01-01']
+    row = serial.iloc[0]
+    posterior = fit_single_changepoint(x)
+    assert row['tau'] == posterior.tau_mode()
+    assert row['change_date'] == str(dates[posterior.tau_mode()])
+    assert row['log_evidence'] == pytest.approx(posterior.log_evidence)
+    # The sampled model finds the same break
+    assert abs(serial.iloc[2]['tau'] - row['tau']) <= 5
+    assert serial.iloc[4]['n_changepoints'] >= 1
+
+def test_failed_configuration_is_reported(series):
+    """Test a configuration that cannot be fitted reports its error without stopping the sweep."""
+    short = {'2015-01-01': (series['2015-01-01'][0][:1], series['2015-01-01'][1][:1])}
+    table = run_sweep([SweepConfig(start_date='2015-01-01'), SweepConfig(model='pelt', start_date='2015-01-01')],
+                      short, workers=1)
+    assert table.loc[0, 'error'].startswith('ValueError')
+    assert pd.isna(table.loc[1, 'error'])
+    with pytest.raises(ValueError):
+        run_sweep([SweepConfig(start_date=None)], short)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app import services
+from app.analysis.segmentation import pelt
+from app.store import PriceStore, parse_price_rows
+from app.synthetic import (SyntheticSpec, detection_recall, generate, iter_blocks, max_csv_rows, planted_regimes,
+                           write_csv, write_store)
+
+def test_blocks_stream_the_whole_series():
+    """Test blocks cover every row once, on increasing business days."""
+    spec = SyntheticSpec(2500, seed=4)
+    blocks = list(iter_blocks(spec, block_rows=1000))
+    assert [len(days) for days, _ in blocks] == [1000, 1000, 500]
+    days = np.concatenate([days for days, _ in blocks])
+    assert np.all(np.diff(days) > 0)
+    assert np.all(np.is_busday(days.astype('datetime64[D]')))
+    assert blocks[0][1][0] == spec.initial_price
+    np.testing.assert_array_equal(generate(spec)[1], generate(SyntheticSpec(2500, seed=4))[1])
+
+def test_regimes_cover_series():
+    """Test regimes start at row 0, respect the minimum length and stay in range."""
+    spec = SyntheticSpec(20_000, seed=1, mean_regime_days=300, min_regime_days=50)
+    regimes = planted_regimes(spec)
+    starts = regimes['Start'].to_numpy()
+    assert starts[0] == 0 and starts[-1] < spec.n_rows
+    assert np.diff(starts).min() >= 50
+    assert regimes['Volatility'].between(*spec.volatility_range).all()
+    with pytest.raises(ValueError):
+        SyntheticSpec(100, min_regime_days=800)
+
+def test_store_and_csv_round_trip(tmp_path):
+    """Test both writers reproduce the in-memory series through the loaders."""
+    spec = SyntheticSpec(3000, seed=2)
+    days, prices = generate(spec)
+    store = write_store(spec, str(tmp_path / 'store'), block_rows=700)
+    np.testing.assert_array_equal(store.load()[0], days)
+    # Block boundaries only change the rounding of the cumulative sum
+    np.testing.assert_allclose(store.load()[1], prices, rtol=1e-12)
+    reference = PriceStore(str(tmp_path / 'reference'))
+    reference.write(*store.load(mmap=False), {})
+    assert store.meta()['digest'] == reference.meta()['digest']
+
+    csv_path = str(tmp_path / 'prices.csv')
+    write_csv(spec, csv_path, block_rows=700)
+    df = services._parse_prices(csv_path)
+    np.testing.assert_array_equal(df['Date'].to_numpy().astype('datetime64[D]').astype(np.int64), days)
+    np.testing.assert_allclose(df['Price'].to_numpy(), prices, rtol=1e-9)
+
+def test_pelt_recovers_distinct_planted_breaks():
+    """Test PELT finds planted volatility shifts of at least 2x."""
+    spec = SyntheticSpec(6000, seed=7, volatility_range=(0.005, 0.05), volatility_of_volatility=0.05)
+    x = np.diff(np.log(generate(spec)[1]))
+    regimes = planted_regimes(spec)
+    ratio = regimes['Volatility'].to_numpy()[1:] / regimes['Volatility'].to_numpy()[:-1]
+    distinct = regimes['Start'].to_numpy()[1:][np.abs(np.log(ratio)) > np.log(2)]
+    assert len(distinct) > 0
+    # Row c starts the regime; in the return series that is index c - 1
+    assert detection_recall(distinct - 1, pelt(x).changepoints, tolerance=20, n_rows=len(x)) >= 0.8
+
+def test_detection_recall():
+    """Test recall counts planted points with a detection within the tolerance."""
+    assert detection_recall([100, 500, 900], [95, 530, 902], tolerance=10) == pytest.approx(2 / 3)
+    assert detection_recall([100], [], tolerance=10) == 0.0
+    assert detection_recall([], [5], tolerance=10) == 1.0
+    assert detection_recall([100, 995], [100], tolerance=10, n_rows=1000) == 1.0
+
+def test_csv_dates_stay_parseable_past_two_million_rows(tmp_path):
+    """Test CSVs above 2.2M rows round-trip when they start early enough, and are refused otherwise."""
+    spec = SyntheticSpec(2_250_000, seed=3, start_date='1000-01-01')
+    assert max_csv_rows(spec) >= spec.n_rows > 2_200_000
+    csv_path = str(tmp_path / 'long.csv')
+    write_csv(spec, csv_path)
+    days, prices = parse_price_rows(pd.read_csv(csv_path))
+    np.testing.assert_array_equal(days, generate(spec)[0])
+    assert len(prices) == spec.n_rows
+    assert days[-1].astype('datetime64[D]').astype('datetime64[Y]').astype(int) + 1970 <= 9999
+
+    with pytest.raises(ValueError, match='9999-12-31'):
+        write_csv(SyntheticSpec(2_250_000), str(tmp_path / 'too_long.csv'))
+    assert not (tmp_path / 'too_long.csv.tmp').exists()
+
+def test_prices_stay_in_a_plausible_range():
+    """Test the log price reverts instead of compounding regime drifts over millions of rows."""
+    prices = generate(SyntheticSpec(5_000_000, seed=11))[1]
+    assert np.isfinite(prices).all()
+    assert prices.min() > 18.63 / 100 and prices.max() < 18.63 * 100
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from app.analysis.volatility import GarchModel, KalmanVolatility, garch_variance
+
+@pytest.fixture
+def garch_returns():
+    """2000 days simulated from GARCH(1,1) with alpha=0.1, beta=0.85."""
+    rng = np.random.default_rng(8)
+    omega, alpha, beta = 1e-5, 0.1, 0.85
+    var, x = omega / (1 - alpha - beta), np.empty(2000)
+    for t in range(len(x)):
+        x[t] = rng.normal(0, np.sqrt(var))
+        var = omega + alpha * x[t] ** 2 + beta * var
+    return x
+
+def test_variance_filter_matches_recursion(garch_returns):
+    """Test the lfilter form equals the textbook loop."""
+    x = garch_returns[:50]
+    expected = [4e-4]
+    for t in range(1, len(x)):
+        expected.append(1e-5 + 0.1 * x[t - 1] ** 2 + 0.85 * expected[-1])
+    np.testing.assert_allclose(garch_variance(x, 1e-5, 0.1, 0.85, 4e-4), expected)
+
+def test_garch_recovers_parameters(garch_returns):
+    """Test MLE estimates land near the simulated parameters."""
+    model = GarchModel.fit(garch_returns)
+    assert model.alpha == pytest.approx(0.1, abs=0.05)
+    assert model.beta == pytest.approx(0.85, abs=0.07)
+    assert model.alpha + model.beta < 1
+
+def test_garch_update_continues_in_sample_path(garch_returns):
+    """Test incremental updates equal the variance path of the full series."""
+    model = GarchModel.fit(garch_returns[:1500])
+    fresh = GarchModel.from_state(model.to_state())
+    new = fresh.update(garch_returns[1500:])
+    full = model.volatility(garch_returns)
+    np.testing.assert_allclose(new, full[1500:])
+
+def test_kalman_tracks_volatility_step():
+    """Test the smoothed volatility follows a jump from 1% to 4% daily."""
+    rng = np.random.default_rng(1)
+    x = np.concatenate([rng.normal(0, 0.01, 500), rng.normal(0, 0.04, 500)])
+    model = KalmanVolatility()
+    volatility = model.fit(x)
+    assert np.median(volatility[100:400]) == pytest.approx(0.01, rel=0.25)
+    assert np.median(volatility[600:900]) == pytest.approx(0.04, rel=0.25)
+
+def test_kalman_update_matches_batch_filter():
+    """Test filtering new days one call at a time gives the batch result."""
+    rng = np.random.default_rng(2)
+    x = rng.normal(0, 0.02, 300)
+    model = KalmanVolatility()
+    model.fit(x[:200])
+    resumed = KalmanVolatility.from_state(model.to_state())
+    step_by_step = np.concatenate([resumed.update(x[200:250]), resumed.update(x[250:])])
+    np.testing.assert_allclose(step_by_step, model.update(x[200:]))
+    assert resumed.n_observed == 300
@@ -0,0 +1,25 @@
+from app.instrumentation import REQUEST_LATENCY
+from app.response_cache import response_cache
+from app.warmup import DASHBOARD_REQUESTS, warm_up, warm_urls
+
+def test_warm_urls(app):
+    """Test warm-up covers parameterless GET endpoints and the dashboard's queries."""
+    urls = warm_urls(app)
+    assert '/api/prices' in urls
+    assert '/api/events' in urls
+    assert '/api/metrics' not in urls
+    assert not any('<' in url for url in urls)
+    assert urls[-len(DASHBOARD_REQUESTS):] == list(DASHBOARD_REQUESTS)
+
+def test_warm_up_fills_response_cache(app, client):
+    """Test the dashboard's first request is a response cache hit after warm-up."""
+    statuses = warm_up(app, ['/api/events', DASHBOARD_REQUESTS[0], '/api/missing'])
+    assert statuses == {'/api/events': 200, DASHBOARD_REQUESTS[0]: 200, '/api/missing': 404}
+    # Warm-up requests are not reported as traffic
+    assert not REQUEST_LATENCY.render()[2:]
+
+    hits = response_cache.stats()['hits']
+    response = client.get(DASHBOARD_REQUESTS[0])
+    assert response.status_code == 200
+    assert response_cache.stats()['hits'] == hits + 1
+    assert 'get_prices' not in response.headers['Server-Timing']
@@ -0,0 +1,19 @@
+"""
+Production WSGI entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is created and warmed when this module is imported. With
+preload_app (see gunicorn.conf.py) that happens once in the master, before
+the workers are forked. Set API_WARM_UP=0 to skip the warm-up.
+"""
+
+import os
+
+from app import create_app
+from app.warmup import warm_up
+
+app = create_app()
+
+if os.environ.get('API_WARM_UP', '1') == '1':
+    warm_up(app)
@@ -2,25 +2,28 @@ import React, { useEffect, useState } from 'react';
 import './App.css';
 import PriceChart from './components/PriceChart';
 import EventTimeline from './components/EventTimeline';
-import { fetchPrices, fetchEvents, fetchChangePoint } from './services/api';
+import { fetchPrices, fetchEvents, fetchChangePoint, fetchEventBreaks } from './services/api';
 
 function App() {
   const [prices, setPrices] = useState([]);
   const [events, setEvents] = useState([]);
   const [changePoint, setChangePoint] = useState(null);
+  const [eventBreaks, setEventBreaks] = useState([]);
   const [isLoading, setIsLoading] = useState(true);
 
   useEffect(() => {
     const loadData = async () => {
       try {
-        const [pricesData, eventsData, cpData] = await Promise.all([
+        const [pricesData, eventsData, cpData, breaksData] = await Promise.all([
           fetchPrices(),
           fetchEvents(),
-          fetchChangePoint()
+          fetchChangePoint(),
+          fetchEventBreaks()
         ]);
         setPrices(pricesData);
         setEvents(eventsData);
         setChangePoint(cpData);
+        setEventBreaks(breaksData);
       } catch (error) {
         console.error("Failed to load dashboard data:", error);
       } finally {
@@ -79,7 +82,7 @@ function App() {
 
           {/* Sidebar: Event Timeline - Takes 1 column */}
           <div className="md:col-span-1">
-            <EventTimeline events={events} />
+            <EventTimeline events={events} breaks={eventBreaks} />
           </div>
         </div>
       </main>
@@ -1,7 +1,7 @@
 import React from 'react';
 import { motion } from 'framer-motion';
 
-const EventTimeline = ({ events, onEventClick }) => {
+const EventTimeline = ({ events, breaks = [], onEventClick }) => {
     const getCategoryColor = (category) => {
         switch (category) {
             case 'Conflict':
@@ -17,6 +17,18 @@ const EventTimeline = ({ events, onEventClick }) => {
         }
     };
 
+    // Change points matched to each event by the API join, keyed by event name and date
+    const breaksByEvent = breaks.reduce((acc, match) => {
+        const key = `${match.Event}|${match.Date}`;
+        (acc[key] = acc[key] || []).push(match);
+        return acc;
+    }, {});
+
+    const describeLag = (lag) => {
+        if (lag === 0) return 'same day';
+        return lag > 0 ? `${lag}d after event` : `${-lag}d before event`;
+    };
+
     return (
         <div className="h-[calc(100vh-180px)] rounded-lg border border-border bg-card overflow-hidden flex flex-col">
             <div className="sticky top-0 bg-card border-b border-border p-4 z-10">
@@ -57,6 +69,13 @@ const EventTimeline = ({ events, onEventClick }) => {
                             </p>
                         )}
 
+                        {(breaksByEvent[`${event.Event}|${String(event.Date).slice(0, 10)}`] || []).map((match) => (
+                            <div key={match['Break Date']} className="mt-2 text-xs text-amber-400">
+                                Change point {match['Break Date']} ({describeLag(match.Lag_Days)}
+                                {match['Within Interval'] ? ', inside credible interval' : ''})
+                            </div>
+                        ))}
+
                         {event.Expected_Impact && (
                             <div className="mt-2 pt-2 border-t border-border/50">
                                 <span className="text-xs text-muted-foreground">
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import {
     LineChart,
     Line,
@@ -10,18 +10,34 @@ import {
     ResponsiveContainer,
     ReferenceLine
 } from 'recharts';
+import { fetchPrices } from '../services/api';
+
+// Years of history covered by each range button
+const RANGE_YEARS = { '1Y': 1, '5Y': 5 };
 
 const PriceChart = ({ data, events, changePoint }) => {
     const [timeRange, setTimeRange] = useState('All');
+    const [rangeData, setRangeData] = useState(null);
+
+    // Ranges are fetched from the server so each view gets full resolution
+    // up to the chart width instead of slicing the downsampled full series.
+    useEffect(() => {
+        if (!data || data.length === 0 || !RANGE_YEARS[timeRange]) {
+            setRangeData(null);
+            return;
+        }
+        let cancelled = false;
+        const start = new Date(data[data.length - 1].Date);
+        start.setFullYear(start.getFullYear() - RANGE_YEARS[timeRange]);
+        fetchPrices({ startDate: start.toISOString().slice(0, 10) }).then((result) => {
+            if (!cancelled) setRangeData(result);
+        });
+        return () => { cancelled = true; };
+    }, [data, timeRange]);
 
-    // Filter data based on selected time range
     const getFilteredData = () => {
         if (!data || data.length === 0) return [];
-
-        // Total data is already filtered/sorted in App or Service
-        // We treat the current data as the 'Full' set for the analysis period
-        if (timeRange === '1Y') return data.slice(-252);
-        if (timeRange === '5Y') return data.slice(-1260);
+        if (timeRange !== 'All' && rangeData) return rangeData;
         return data;
     };
 
@@ -3,9 +3,15 @@ import axios from 'axios';
 
 const API_BASE_URL = 'http://127.0.0.1:5000/api';
 
-export const fetchPrices = async () => {
+// Roughly the chart's pixel width; the server downsamples to this many points
+export const MAX_CHART_POINTS = 1200;
+
+export const fetchPrices = async ({ startDate, endDate, maxPoints = MAX_CHART_POINTS } = {}) => {
     try {
-        const response = await axios.get(`${API_BASE_URL}/prices`);
+        const params = { max_points: maxPoints };
+        if (startDate) params.start_date = startDate;
+        if (endDate) params.end_date = endDate;
+        const response = await axios.get(`${API_BASE_URL}/prices`, { params });
         return response.data;
     } catch (error) {
         console.error("Error fetching prices:", error);
@@ -13,6 +19,30 @@ export const fetchPrices = async () => {
     }
 };
 
+export const fetchSeriesList = async () => {
+    try {
+        const response = await axios.get(`${API_BASE_URL}/series`);
+        return response.data;
+    } catch (error) {
+        console.error("Error fetching series list:", error);
+        return [];
+    }
+};
+
+// Several series aligned on their dates in one request; rows hold one value per ticker (null where missing)
+export const fetchAlignedPrices = async (tickers, { startDate, endDate, field = 'price', maxPoints = MAX_CHART_POINTS } = {}) => {
+    try {
+        const params = { tickers: tickers.join(','), field, max_points: maxPoints };
+        if (startDate) params.start_date = startDate;
+        if (endDate) params.end_date = endDate;
+        const response = await axios.get(`${API_BASE_URL}/series/prices`, { params });
+        return response.data;
+    } catch (error) {
+        console.error("Error fetching aligned prices:", error);
+        return [];
+    }
+};
+
 export const fetchEvents = async () => {
     try {
         const response = await axios.get(`${API_BASE_URL}/events`);
@@ -23,6 +53,17 @@ export const fetchEvents = async () => {
     }
 };
 
+// Events joined to change points within `window` days, with the lag between them
+export const fetchEventBreaks = async ({ method = 'bayesian', window = 90 } = {}) => {
+    try {
+        const response = await axios.get(`${API_BASE_URL}/events/changepoints`, { params: { method, window } });
+        return response.data;
+    } catch (error) {
+        console.error("Error fetching event/change point matches:", error);
+        return [];
+    }
+};
+
 export const fetchChangePoint = async () => {
     try {
         const response = await axios.get(`${API_BASE_URL}/changepoint`);
@@ -0,0 +1,18 @@
+"""
+Repository paths shared by the analysis scripts.
+
+Importing this module also puts `backend/` on sys.path so scripts can use
+the engines in `app.analysis` regardless of the working directory.
+"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+BACKEND_DIR = os.path.join(REPO_ROOT, 'backend')
+DATA_DIR = os.path.join(REPO_ROOT, 'data')
+RESULTS_DIR = os.path.join(REPO_ROOT, 'results')
+
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
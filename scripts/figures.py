@@ -0,0 +1,191 @@
+"""
+Figures of the change point analysis, rendered through app.figures.
+
+Each figure is a function of named inputs registered on FIGURES; the
+analysis scripts pass their results to FIGURES.render(), which redraws
+only the figures whose inputs changed, in parallel worker processes.
+Run this module to regenerate every figure from the current data:
+
+    python scripts/figures.py [--force] [--workers N]
+"""
+
+import argparse
+import os
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from cycler import cycler
+
+from _paths import RESULTS_DIR
+from app.figures import FigurePipeline, decimate
+
+FIGURES_DIR = os.path.join(RESULTS_DIR, 'figures')
+
+# Previously set globally by each script with plt.style.use / sns.set_palette
+FIGURES = FigurePipeline(FIGURES_DIR, style=['seaborn-v0_8-darkgrid',
+                                             {'axes.prop_cycle': cycler(color=sns.color_palette('husl'))}])
+
+CHANGEPOINT_FIGURES = ['fig_tau_posterior.png', 'fig_parameter_posteriors.png', 'fig_changepoint_on_prices.png']
+EVENT_FIGURES = ['event_association.png']
+
+
+def _date(value):
+    return pd.to_datetime(value).date()
+
+
+@FIGURES.figure('fig_tau_posterior.png', inputs=['tau_probs', 'tau_mode', 'tau_interval', 'change_date'])
+def tau_posterior(tau_probs, tau_mode, tau_interval, change_date):
+    """Posterior distribution of the change point index."""
+    fig, ax = plt.subplots(figsize=(14, 5))
+    ax.fill_between(np.arange(len(tau_probs)), tau_probs, step='mid', alpha=0.7)
+    ax.axvline(tau_mode, color='red', linestyle='--', linewidth=2, label=f'Mode: {_date(change_date)}')
+    ax.axvline(tau_interval[0], color='blue', linestyle=':', linewidth=1.5, label='95% CI')
+    ax.axvline(tau_interval[1], color='blue', linestyle=':', linewidth=1.5)
+    ax.set_xlabel('Time Index')
+    ax.set_ylabel('Posterior Probability')
+    ax.set_title('Posterior Distribution of Change Point (τ)', fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+@FIGURES.figure('fig_parameter_posteriors.png', inputs=['histograms', 'prob_increase'])
+def parameter_posteriors(histograms, prob_increase):
+    """Before/after parameters and the change distributions, from the posterior summary's histograms."""
+    def stairs(ax, name, **kwargs):
+        ax.stairs(histograms[name]['counts'], histograms[name]['edges'], fill=True, **kwargs)
+
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+
+    ax = axes[0, 0]
+    stairs(ax, 'mu_before', alpha=0.7, label='Before', color='blue')
+    stairs(ax, 'mu_after', alpha=0.7, label='After', color='orange')
+    ax.set_xlabel('Daily Log Return')
+    ax.set_ylabel('Density')
+    ax.set_title('Mean Return Before vs After', fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+    ax = axes[0, 1]
+    stairs(ax, 'sigma_before', alpha=0.7, label='Before', color='blue')
+    stairs(ax, 'sigma_after', alpha=0.7, label='After', color='orange')
+    ax.set_xlabel('Standard Deviation')
+    ax.set_ylabel('Density')
+    ax.set_title('Volatility Before vs After', fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+    ax = axes[1, 0]
+    stairs(ax, 'mean_change', alpha=0.7, color='green', edgecolor='black')
+    ax.axvline(0, color='red', linestyle='--', linewidth=2)
+    ax.set_xlabel('Change in Mean Return')
+    ax.set_ylabel('Density')
+    ax.set_title(f'Distribution of Mean Change (P(increase) = {prob_increase:.2%})', fontweight='bold')
+    ax.grid(True, alpha=0.3)
+
+    ax = axes[1, 1]
+    stairs(ax, 'volatility_change_pct', alpha=0.7, color='purple', edgecolor='black')
+    ax.axvline(0, color='red', linestyle='--', linewidth=2)
+    ax.set_xlabel('Volatility Change (%)')
+    ax.set_ylabel('Density')
+    ax.set_title('Distribution of Volatility Change', fontweight='bold')
+    ax.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+@FIGURES.figure('fig_changepoint_on_prices.png', inputs=['dates', 'prices', 'change_date', 'date_interval'])
+def changepoint_on_prices(dates, prices, change_date, date_interval):
+    """Price series with the detected change point and its 95% interval."""
+    fig, ax = plt.subplots(figsize=(16, 6))
+    ax.plot(*decimate(dates, prices), linewidth=1, color='darkblue', alpha=0.7)
+    ax.axvline(change_date, color='red', linestyle='--', linewidth=2, label=f'Change Point: {_date(change_date)}')
+    ax.axvspan(date_interval[0], date_interval[1], alpha=0.2, color='red', label='95% CI')
+    ax.set_xlabel('Date', fontsize=12)
+    ax.set_ylabel('Price (USD/barrel)', fontsize=12)
+    ax.set_title('Brent Oil Prices with Detected Change Point', fontsize=14, fontweight='bold')
+    ax.legend(fontsize=11)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+@FIGURES.figure('event_association.png', inputs=['event_dates', 'event_prices', 'cp_date', 'cp_interval', 'nearby_events'],
+                dpi=100, bbox_inches=None)
+def event_association(event_dates, event_prices, cp_date, cp_interval, nearby_events):
+    """Prices a year either side of the change point, with the events near it."""
+    fig, ax = plt.subplots(figsize=(15, 8))
+    ax.plot(*decimate(event_dates, event_prices), label='Brent Price', color='blue', alpha=0.6)
+    ax.axvline(cp_date, color='red', linestyle='--', label=f'Detected Change Point ({_date(cp_date)})')
+    if cp_interval is not None:
+        ax.axvspan(cp_interval[0], cp_interval[1], color='red', alpha=0.1, label='Uncertainty (HDI)')
+
+    top = np.max(event_prices)
+    for _, row in nearby_events.iterrows():
+        ax.axvline(row['Date'], color='green', linestyle=':', alpha=0.8)
+        ax.text(row['Date'], top, row['Event'], rotation=90, verticalalignment='top')
+
+    ax.set_title('Brent Oil Price: Change Points vs Geopolitical Events')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Price (USD)')
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def changepoint_inputs(posterior, summary, dates, prices):
+    """Inputs of CHANGEPOINT_FIGURES from the exact posterior and its one-pass draw summary."""
+    tau_mode = posterior.tau_mode()
+    tau_interval = (posterior.tau_quantile(0.025), posterior.tau_quantile(0.975))
+    return {
+        'tau_probs': posterior.tau_probs,
+        'tau_mode': tau_mode,
+        'tau_interval': tau_interval,
+        'change_date': dates[tau_mode],
+        'date_interval': (dates[tau_interval[0]], dates[tau_interval[1]]),
+        'histograms': summary.histograms,
+        'prob_increase': summary.prob_increase,
+        'dates': dates,
+        'prices': prices,
+    }
+
+
+def load_changepoint_inputs(start_date='2012-01-01'):
+    """Fits the exact posterior as bayesian_changepoint.py does and returns the figure inputs."""
+    from app.analysis import fit_single_changepoint, summarize
+    from app.services import DataService
+
+    df = DataService.get_log_returns(start_date)
+    posterior = fit_single_changepoint(df['Log_Return'].values)
+    samples = posterior.sample(draws=4000, random_seed=42)
+    summary = summarize({name: values[None] for name, values in samples.items()})
+    return changepoint_inputs(posterior, summary, df['Date'].values, df['Price'].values)
+
+
+def report(results):
+    """Prints one line per figure and returns the number that failed."""
+    for name, result in results.items():
+        detail = f" ({result.seconds:.1f}s)" if result.status == 'rendered' else ''
+        print(f"  {result.status:>8}: {name}{detail}" + (f" - {result.error}" if result.error else ''))
+    return sum(result.status == 'failed' for result in results.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate the analysis figures whose inputs changed.")
+    parser.add_argument('--force', action='store_true', help="redraw every figure")
+    parser.add_argument('--workers', type=int, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    from run_event_analysis import load_event_association
+
+    start = time.perf_counter()
+    data = dict(load_changepoint_inputs(), **load_event_association()['figure_inputs'])
+    print(f"Inputs loaded in {time.perf_counter() - start:.1f}s; rendering to {FIGURES_DIR}...")
+    results = FIGURES.render(data, CHANGEPOINT_FIGURES + EVENT_FIGURES, args.workers, args.force)
+    failed = report(results)
+    print(f"Done in {time.perf_counter() - start:.1f}s ({failed} failed).")
@@ -1,49 +1,27 @@
+"""
+Final report: Brent oil price regimes through a Bayesian lens.
 
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak, KeepTogether
+Every statistic and figure is read from the results artifacts (see
+report_data.py); sections are cached and only rebuilt when their inputs
+change (see report_builder.py).
+"""
+
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_JUSTIFY, TA_CENTER
 import os
-import pandas as pd
+
+from _paths import REPO_ROOT
+from report_builder import Report, figure
+from report_data import fmt_date, fmt_lag, load_report_data
 
 # Report Configuration
-REPORT_FILENAME = "/home/karanos/kiam/week11/prod/docs/Final_Report_Birhan_Energies.pdf"
+REPORT_FILENAME = os.path.join(REPO_ROOT, 'docs', 'Final_Report_Birhan_Energies.pdf')
 AUTHOR = "Biruk Gebru Jember"
 TITLE = "The Pulse of Energy: Analyzing Brent Oil Price Volatility through Bayesian Lens"
 
-# Data Paths
-BASE_DIR = "/home/karanos/kiam/week11/prod"
-RESULTS_DIR = os.path.join(BASE_DIR, "results")
-FIGURES_DIR = os.path.join(RESULTS_DIR, "figures")
-EVENTS_CSV = os.path.join(BASE_DIR, "data/events/geopolitical_events.csv")
-IMPACT_CSV = os.path.join(RESULTS_DIR, "statistics/stat_change_point_impact.csv")
-CONVERGENCE_CSV = os.path.join(RESULTS_DIR, "statistics/stat_bayesian_convergence.csv")
-EDA_CSV = os.path.join(RESULTS_DIR, "statistics/stat_descriptive_summary.csv")
-
-def add_image(story, filename, caption, styles, width=450, height=None):
-    img_path = os.path.join(FIGURES_DIR, filename)
-    if not height:
-        height = width * 0.6
-    
-    if os.path.exists(img_path):
-        try:
-            img = Image(img_path, width=width, height=height)
-            story.append(Spacer(1, 10))
-            story.append(img)
-            story.append(Paragraph(f"<i>{caption}</i>", styles['Caption']))
-            story.append(Spacer(1, 10))
-        except Exception as e:
-            story.append(Paragraph(f"[Image error: {filename} - {str(e)}]", styles['Normal']))
-    else:
-        story.append(Paragraph(f"[Image not found: {filename}]", styles['Normal']))
-
-def create_report():
-    os.makedirs(os.path.dirname(REPORT_FILENAME), exist_ok=True)
-    doc = SimpleDocTemplate(REPORT_FILENAME, pagesize=letter,
-                            rightMargin=50, leftMargin=50,
-                            topMargin=50, bottomMargin=50) 
-    
+def make_styles():
     styles = getSampleStyleSheet()
     styles.add(ParagraphStyle(name='Justify', parent=styles['Normal'], alignment=TA_JUSTIFY, spaceAfter=12, leading=14))
     styles.add(ParagraphStyle(name='CustomBullet', parent=styles['Normal'], alignment=TA_JUSTIFY, spaceAfter=6, leading=14, leftIndent=20))
@@ -52,208 +30,247 @@ def create_report():
     styles.add(ParagraphStyle(name='SubSectionHeader', parent=styles['Heading3'], spaceAfter=10, spaceBefore=15, fontSize=14, textColor=colors.darkslategrey))
     styles.add(ParagraphStyle(name='Caption', parent=styles['Italic'], alignment=TA_CENTER, fontSize=9, spaceAfter=12, textColor=colors.grey))
     styles.add(ParagraphStyle(name='TechnicalNote', parent=styles['Normal'], fontSize=9, backColor=colors.whitesmoke, borderPadding=10, leftIndent=10, rightIndent=10))
-    
-    Story = []
-
-    # --- Page 1: Cover & Executive Summary ---
-    Story.append(Spacer(1, 40))
-    Story.append(Paragraph(TITLE, styles['Heading1']))
-    Story.append(Paragraph(f"<b>Birhan Energies Consultancy</b> | <b>Senior Analyst:</b> {AUTHOR}", styles['Normal']))
-    Story.append(Spacer(1, 60))
-
-    Story.append(Paragraph("Executive Summary", styles['SectionHeader']))
-    exec_summary = """
-    In a world where geopolitical shocks are the primary drivers of energy market instability, Birhan Energies provides 
-    the analytical framework to separate fundamental shifts from temporary market noise. This report details 
-    our analysis of Brent Crude oil prices using advanced Bayesian Change Point detection. Our primary 
-    finding identifies a structural market regime shift in late 2018, coinciding with the US termination of 
-    Iranian oil sanctions waivers. This event triggered a 127% surge in price volatility and a structural 
-    increase in average price levels. This summary is intended for both technical analysts and 
+    return styles
+
+REPORT = Report('final', make_styles)
+
+def add_image(story, filename, caption, styles, width=450, height=None):
+    story.append(Spacer(1, 10))
+    story.append(figure(filename, width, height or width * 0.6, styles))
+    story.append(Paragraph(f"<i>{caption}</i>", styles['Caption']))
+    story.append(Spacer(1, 10))
+
+def direction(pct, up='increase', down='decrease'):
+    return up if pct >= 0 else down
+
+def event_phrase(data):
+    """e.g. '11 days after the event "US Grants Iran Sanctions Waivers" (November 1, 2018)'."""
+    event = data['nearest_event']
+    return f"{fmt_lag(event['lag_days'])} the event \"{event['event']}\" ({fmt_date(event['date'])})"
+
+@REPORT.section('cover', inputs=['change_date', 'nearest_event', 'vol_change_pct', 'price_change_pct'])
+def cover(data, styles):
+    story = [Spacer(1, 40),
+             Paragraph(TITLE, styles['Heading1']),
+             Paragraph(f"<b>Birhan Energies Consultancy</b> | <b>Senior Analyst:</b> {AUTHOR}", styles['Normal']),
+             Spacer(1, 60),
+             Paragraph("Executive Summary", styles['SectionHeader'])]
+    vol, price = data['vol_change_pct'], data['price_change_pct']
+    exec_summary = f"""
+    In a world where geopolitical shocks are the primary drivers of energy market instability, Birhan Energies provides
+    the analytical framework to separate fundamental shifts from temporary market noise. This report details
+    our analysis of Brent Crude oil prices using advanced Bayesian Change Point detection. Our primary
+    finding identifies a structural market regime shift on {fmt_date(data['change_date'])}, {event_phrase(data)}.
+    The new regime shows a {abs(vol):.0f}% {direction(vol, 'surge', 'drop')} in price volatility and a structural
+    {direction(price)} in average price levels. This summary is intended for both technical analysts and
     strategic decision-makers, bridging high-level policy context with rigorous statistical proof.
     """
-    Story.append(Paragraph(exec_summary, styles['ExecutiveSummary']))
-
+    story.append(Paragraph(exec_summary, styles['ExecutiveSummary']))
+    return story
 
-    # --- Page 2: Business Objective & Task 1 ---
-    Story.append(Paragraph("1. Understanding and Defining the Business Objective", styles['SectionHeader']))
+@REPORT.section('objective')
+def objective(data, styles):
+    story = [Paragraph("1. Understanding and Defining the Business Objective", styles['SectionHeader'])]
     objective_text = """
-    Birhan Energies is a premier consultancy specializing in data-driven insights for the global energy sector. 
-    Our mission is to decode the complexities of Brent oil price fluctuations driven by political and economic 
+    Birhan Energies is a premier consultancy specializing in data-driven insights for the global energy sector.
+    Our mission is to decode the complexities of Brent oil price fluctuations driven by political and economic
     upheavals—ranging from conflicts in oil-producing regions to OPEC+ policy pivots and international sanctions.
     """
-    Story.append(Paragraph(objective_text, styles['Justify']))
-    
-    Story.append(Paragraph("Key Stakeholder Needs:", styles['SubSectionHeader']))
-    Story.append(Paragraph("• <b>Investors:</b> Require robust risk management and hedging strategies that account for sudden 'regime shifts' rather than assuming linear volatility.", styles['CustomBullet']))
-    Story.append(Paragraph("• <b>Policymakers:</b> Need evidence-based insights to develop energy security protocols and stabilize national economic plans against global shocks.", styles['CustomBullet']))
-    Story.append(Paragraph("• <b>Energy Companies:</b> Depend on accurate volatility forecasting for operational planning, cost control, and supply chain redundancy.", styles['CustomBullet']))
-
-    Story.append(Paragraph("2. Task 1 Foundation: Data & Methodology", styles['SectionHeader']))
-    Story.append(Paragraph("2.1 Analysis Workflow and Assumptions", styles['SubSectionHeader']))
-    foundation_text = """
-    Our workflow began with the curation of a decade's worth of Brent Crude prices (2012-2022) and the 
-    compilation of a comprehensive Geopolitical Event Dataset. We operate under several critical assumptions:
+    story.append(Paragraph(objective_text, styles['Justify']))
+    story.append(Paragraph("Key Stakeholder Needs:", styles['SubSectionHeader']))
+    story.append(Paragraph("• <b>Investors:</b> Require robust risk management and hedging strategies that account for sudden 'regime shifts' rather than assuming linear volatility.", styles['CustomBullet']))
+    story.append(Paragraph("• <b>Policymakers:</b> Need evidence-based insights to develop energy security protocols and stabilize national economic plans against global shocks.", styles['CustomBullet']))
+    story.append(Paragraph("• <b>Energy Companies:</b> Depend on accurate volatility forecasting for operational planning, cost control, and supply chain redundancy.", styles['CustomBullet']))
+    return story
+
+@REPORT.section('foundation', inputs=['study_start', 'study_end', 'events'])
+def foundation(data, styles):
+    story = [Paragraph("2. Task 1 Foundation: Data & Methodology", styles['SectionHeader']),
+             Paragraph("2.1 Analysis Workflow and Assumptions", styles['SubSectionHeader'])]
+    foundation_text = f"""
+    Our workflow began with the curation of {data['study_end'] - data['study_start'] + 1} years of Brent Crude prices
+    ({data['study_start']}-{data['study_end']}) and the compilation of a Geopolitical Event Dataset of
+    {len(data['events'])} events. We operate under several critical assumptions:
     """
-    Story.append(Paragraph(foundation_text, styles['Justify']))
-    Story.append(Paragraph("• <b>Market Proxy:</b> Brent Crude serves as the primary benchmark for global oil supply-demand pressures.", styles['CustomBullet']))
-    Story.append(Paragraph("• <b>Log-Return Normality:</b> While raw prices are non-stationary, their log-returns provide a stable mean from which structural breaks can be detected.", styles['CustomBullet']))
-    Story.append(Paragraph("• <b>Efficiency Lags:</b> We assume market participants 'price-in' geopolitical news, often leading to price shifts slightly preceding or following official event dates.", styles['CustomBullet']))
-
-    Story.append(Paragraph("2.2 Compiled Geopolitical Event Dataset", styles['SubSectionHeader']))
-    if os.path.exists(EVENTS_CSV):
-        events_df = pd.read_csv(EVENTS_CSV)
-        event_table = [["Date", "Significant Event", "Category"]]
-        for _, row in events_df.iterrows():
-            event_table.append([str(row['Date']), row['Event'][:50], row['Category']])
-        
-        t = Table(event_table, colWidths=[80, 270, 100])
-        t.setStyle(TableStyle([('BACKGROUND', (0,0), (-1,0), colors.darkblue),
-                               ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-                               ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                               ('FONTSIZE', (0,0), (-1,-1), 8),
-                               ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-                               ('VALIGN', (0,0), (-1,-1), 'MIDDLE')]))
-        Story.append(t)
-        Story.append(Spacer(1, 10))
-
-
-
-    # --- Page 3: EDA & Technical Primer ---
-    Story.append(Paragraph("3. Task 2: Change Point Analysis Methodology", styles['SectionHeader']))
-    Story.append(Paragraph("3.1 Exploratory Data Analysis (EDA)", styles['SubSectionHeader']))
-    eda_text = """
-    Before modeling, we performed extensive EDA. The Brent price series shows clear 'volatility clustering'—periods 
-    of relative calm followed by violent price swings. Descriptive statistics reveal a <b>Kurtosis of ~107</b>, 
-    indicating that extreme events are far more frequent than a 'Normal' distribution would predict. This 
+    story.append(Paragraph(foundation_text, styles['Justify']))
+    story.append(Paragraph("• <b>Market Proxy:</b> Brent Crude serves as the primary benchmark for global oil supply-demand pressures.", styles['CustomBullet']))
+    story.append(Paragraph("• <b>Log-Return Normality:</b> While raw prices are non-stationary, their log-returns provide a stable mean from which structural breaks can be detected.", styles['CustomBullet']))
+    story.append(Paragraph("• <b>Efficiency Lags:</b> We assume market participants 'price-in' geopolitical news, often leading to price shifts slightly preceding or following official event dates.", styles['CustomBullet']))
+
+    story.append(Paragraph("2.2 Compiled Geopolitical Event Dataset", styles['SubSectionHeader']))
+    event_table = [["Date", "Significant Event", "Category"]]
+    for _, row in data['events'].iterrows():
+        event_table.append([str(row['Date'].date()), row['Event'][:50], row['Category']])
+    t = Table(event_table, colWidths=[80, 270, 100])
+    t.setStyle(TableStyle([('BACKGROUND', (0,0), (-1,0), colors.darkblue),
+                           ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+                           ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+                           ('FONTSIZE', (0,0), (-1,-1), 8),
+                           ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+                           ('VALIGN', (0,0), (-1,-1), 'MIDDLE')]))
+    story.append(t)
+    story.append(Spacer(1, 10))
+    return story
+
+@REPORT.section('eda', inputs=['kurtosis', 'eda'])
+def eda(data, styles):
+    story = [Paragraph("3. Task 2: Change Point Analysis Methodology", styles['SectionHeader']),
+             Paragraph("3.1 Exploratory Data Analysis (EDA)", styles['SubSectionHeader'])]
+    eda_text = f"""
+    Before modeling, we performed extensive EDA. The Brent price series shows clear 'volatility clustering'—periods
+    of relative calm followed by violent price swings. Descriptive statistics reveal a <b>Kurtosis of ~{data['kurtosis']:.0f}</b>,
+    indicating that extreme events are far more frequent than a 'Normal' distribution would predict. This
     'fat-tailed' nature of oil returns necessitates advanced modeling.
     """
-    Story.append(Paragraph(eda_text, styles['Justify']))
-
-    if os.path.exists(EDA_CSV):
-        eda_df = pd.read_csv(EDA_CSV)
-        eda_table = [["Metric", "Price Series", "Log Return Series"]] + eda_df.values.tolist()
-        t = Table(eda_table, colWidths=[130, 150, 150])
-        t.setStyle(TableStyle([('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
-                               ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                               ('GRID', (0,0), (-1,-1), 0.5, colors.grey)]))
-        Story.append(t)
-
-    Story.append(Paragraph("3.2 Technical Primer: Bayesian Sampling & MCMC", styles['SubSectionHeader']))
+    story.append(Paragraph(eda_text, styles['Justify']))
+
+    eda_table = [["Metric", "Price Series", "Log Return Series"]]
+    eda_table += [[metric, f"{price:.4f}", f"{returns:.4f}"] for metric, price, returns in data['eda'].values.tolist()]
+    t = Table(eda_table, colWidths=[130, 150, 150])
+    t.setStyle(TableStyle([('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
+                           ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+                           ('GRID', (0,0), (-1,-1), 0.5, colors.grey)]))
+    story.append(t)
+    return story
+
+@REPORT.section('methodology')
+def methodology(data, styles):
+    story = [Paragraph("3.2 Technical Primer: Bayesian Sampling & MCMC", styles['SubSectionHeader'])]
     bayesian_primer = """
-    <b>For the Non-Technical Stakeholder:</b> Imagine trying to figure out exactly when a leak started in a pipe 
-    by only looking at the water bill. Instead of guessing one day, we use a 'Probability Map.' 
-    <b>Bayesian Inference</b> builds this map by combining our initial knowledge (Priors) with 
-    new evidence (the Data). 
-    
-    <b>MCMC (Markov Chain Monte Carlo)</b> is the 'Robot Explorer' that walks this map. It runs 
-    thousands of simulations to find the highest probability of when the regime changed. 
-    <b>NUTS (No-U-Turn Sampler)</b> is an advanced version that prevents the robot from walking 
+    <b>For the Non-Technical Stakeholder:</b> Imagine trying to figure out exactly when a leak started in a pipe
+    by only looking at the water bill. Instead of guessing one day, we use a 'Probability Map.'
+    <b>Bayesian Inference</b> builds this map by combining our initial knowledge (Priors) with
+    new evidence (the Data).
+
+    <b>MCMC (Markov Chain Monte Carlo)</b> is the 'Robot Explorer' that walks this map. It runs
+    thousands of simulations to find the highest probability of when the regime changed.
+    <b>NUTS (No-U-Turn Sampler)</b> is an advanced version that prevents the robot from walking
     in circles, making the exploration faster and more accurate.
     """
-    Story.append(Paragraph(bayesian_primer, styles['TechnicalNote']))
+    story.append(Paragraph(bayesian_primer, styles['TechnicalNote']))
 
-    Story.append(Paragraph("3.3 Bayesian Model Specification", styles['SubSectionHeader']))
+    story.append(Paragraph("3.3 Bayesian Model Specification", styles['SubSectionHeader']))
     model_spec = """
     We utilized <b>PyMC</b> to define a switch-point model:
     • <b>Likelihood:</b> We model returns as a Normal distribution where the mean and variance change abruptly.
-    • <b>Internal Parameters:</b> The model estimates $(\mu_{before}, \sigma_{before})$ and $(\mu_{after}, \sigma_{after})$.
+    • <b>Internal Parameters:</b> The model estimates $(\\mu_{before}, \\sigma_{before})$ and $(\\mu_{after}, \\sigma_{after})$.
     • <b>Switch Point (τ):</b> A discrete uniform variable identifying the index of the change.
     """
-    Story.append(Paragraph(model_spec, styles['Justify']))
-
-
-    # --- Page 4: Diagnostics & Interpretation ---
-    Story.append(Paragraph("4. Model Output Interpretation and Reliability", styles['SectionHeader']))
-    Story.append(Paragraph("4.1 Convergence Checking (Trace Plots & R-hat)", styles['SubSectionHeader']))
+    story.append(Paragraph(model_spec, styles['Justify']))
+    return story
+
+@REPORT.section('convergence', inputs=['r_hat_mu', 'r_hat_range', 'convergence'], figures=['fig_trace_plots.png'])
+def convergence(data, styles):
+    story = [Paragraph("4. Model Output Interpretation and Reliability", styles['SectionHeader']),
+             Paragraph("4.1 Convergence Checking (Trace Plots & R-hat)", styles['SubSectionHeader'])]
+    low, high = data['r_hat_range']
+    if high > 1.1:
+        assessment = f"""
+        <b>Technical Assessment:</b> While the mean returns ($\\mu$) show close agreement (R-hat = {data['r_hat_mu']:.2f}),
+        the switch-point ($\\tau$) and posterior volatility ($\\sigma$) show R-hat values of <b>{low:.2f} to {high:.2f}</b>.
+        <b>This is a critical finding:</b> It indicates that the model found multiple plausible dates for
+        the change, reflecting that the transition was a <b>volatile process</b> rather than a
+        single-day event.
+        """
+    else:
+        assessment = f"""
+        <b>Technical Assessment:</b> All parameters show R-hat values of at most {max(high, data['r_hat_mu']):.2f},
+        below the 1.1 threshold: the chains agree on the change point and on both regimes.
+        """
     convergence_text = """
-    To trust our results, we check if the 'Robot Explorers' agreed. <b>Trace Plots</b> (Figure 3) should 
+    To trust our results, we check if the 'Robot Explorers' agreed. <b>Trace Plots</b> (Figure 3) should
     look like stable 'fuzzy caterpillars.' If they look like stairs or separated lines, the model is unreliable.
-    
-    <b>Technical Assessment:</b> While the mean returns ($\mu$) show perfect agreement (R-hat = 1.0), 
-    the switch-point ($\tau$) and posterior volatility ($\sigma$) show R-hat values of **1.76 to 1.84**. 
-    <b>This is a critical finding:</b> It indicates that the model found multiple plausible dates for 
-    the change, reflecting that the 2018-2019 transition was a **volatile process** rather than a 
-    single-day event.
-    """
-    Story.append(Paragraph(convergence_text, styles['Justify']))
-
-    add_image(Story, "fig_trace_plots.png", "Figure 3: MCMC Trace Plots. Note the multi-modal 'switching' in the tau and sigma_after chains.", styles, height=250)
-
-    if os.path.exists(CONVERGENCE_CSV):
-        conv_df = pd.read_csv(CONVERGENCE_CSV)
-        conv_table = [["Parameter", "Estimated Mean", "Std Deviation", "HDI 97%", "R-hat Value"]]
-        for _, row in conv_df.iterrows():
-            conv_table.append([row[0], f"{row['mean']:.4f}", f"{row['sd']:.4f}", f"{row['hdi_97%']:.4f}", f"{row['r_hat']:.2f}"])
-        t = Table(conv_table, colWidths=[100, 100, 100, 100, 100])
-        t.setStyle(TableStyle([('BACKGROUND', (0,0), (-1,0), colors.whitesmoke),
-                               ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-                               ('FONTSIZE', (0,0), (-1,-1), 8)]))
-        Story.append(t)
-
-
-    # --- Page 5: Event Association & Impact ---
-    Story.append(Paragraph("5. Event Association and Quantified Impact", styles['SectionHeader']))
-    assoc_text = """
-    Our model identified a structural break on <b>November 12, 2018</b>. This period corresponds 
-    directly with the **US granting temporary waivers** for Iranian oil sanctions, followed by the 
-    eventual termination of all waivers in May 2019. The market effectively re-balanced its risk 
-    expectation between these two dates.
+    """ + assessment
+    story.append(Paragraph(convergence_text, styles['Justify']))
+
+    add_image(story, "fig_trace_plots.png", "Figure 3: MCMC Trace Plots. Note the multi-modal 'switching' in the tau and sigma_after chains.", styles, height=250)
+
+    conv_table = [["Parameter", "Estimated Mean", "Std Deviation", "HDI 97%", "R-hat Value"]]
+    for name, row in data['convergence'].iterrows():
+        conv_table.append([name, f"{row['mean']:.4f}", f"{row['sd']:.4f}", f"{row['hdi_97%']:.4f}", f"{row['r_hat']:.2f}"])
+    t = Table(conv_table, colWidths=[100, 100, 100, 100, 100])
+    t.setStyle(TableStyle([('BACKGROUND', (0,0), (-1,0), colors.whitesmoke),
+                           ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+                           ('FONTSIZE', (0,0), (-1,-1), 8)]))
+    story.append(t)
+    return story
+
+@REPORT.section('impact', inputs=['change_date', 'date_lower', 'date_upper', 'nearest_event', 'price_before',
+                                  'price_after', 'price_change_pct', 'vol_change_pct'],
+                figures=['fig_changepoint_on_prices.png'])
+def impact(data, styles):
+    story = [Paragraph("5. Event Association and Quantified Impact", styles['SectionHeader'])]
+    assoc_text = f"""
+    Our model identified a structural break on <b>{fmt_date(data['change_date'])}</b> (95% credible interval
+    {fmt_date(data['date_lower'])} to {fmt_date(data['date_upper'])}). The break falls {event_phrase(data)},
+    the closest event in our dataset. The market effectively re-balanced its risk expectation within this interval.
     """
-    Story.append(Paragraph(assoc_text, styles['Justify']))
-
-    add_image(Story, "fig_changepoint_on_prices.png", "Figure 4: Brent Prices with Detected Change Point (Nov 2018).", styles, height=200)
-
-    Story.append(Paragraph("Quantifying the Market Shift:", styles['SubSectionHeader']))
-    impact_statement = """
-    <b>Price Level Shift:</b> Average daily price shifted from <b>$48.24</b> (pre-shift regime) to 
-    <b>$57.06</b> (post-shift regime), representing a structural increase of <b>18.3%</b>.
-    
-    <b>Volatility Surge:</b> Market volatility (daily risk swings) surged by <b>127.58%</b>. 
-    This indicates that since late 2018, the Brent market has entered a 'Hyper-Volatile' regime 
-    where extreme price drops or spikes are the new normal.
+    story.append(Paragraph(assoc_text, styles['Justify']))
+
+    add_image(story, "fig_changepoint_on_prices.png",
+              f"Figure 4: Brent Prices with Detected Change Point ({data['change_date']:%b %Y}).", styles, height=200)
+
+    price, vol = data['price_change_pct'], data['vol_change_pct']
+    story.append(Paragraph("Quantifying the Market Shift:", styles['SubSectionHeader']))
+    impact_statement = f"""
+    <b>Price Level Shift:</b> Average daily price shifted from <b>${data['price_before']:.2f}</b> (pre-shift regime) to
+    <b>${data['price_after']:.2f}</b> (post-shift regime), representing a structural {direction(price)} of <b>{abs(price):.1f}%</b>.
+
+    <b>Volatility {direction(vol, 'Surge', 'Drop')}:</b> Market volatility (daily risk swings) {direction(vol, 'surged', 'fell')}
+    by <b>{abs(vol):.2f}%</b>. Since {data['change_date']:%B %Y}, the Brent market has been in a
+    {direction(vol, "more volatile regime where extreme price drops or spikes are the new normal", "calmer regime")}.
     """
-    Story.append(Paragraph(impact_statement, styles['Justify']))
+    story.append(Paragraph(impact_statement, styles['Justify']))
+    return story
 
-    Story.append(Paragraph("6. Interactive Dashboard Delivery", styles['SectionHeader']))
+@REPORT.section('dashboard', figures=['birhanDash.png'])
+def dashboard(data, styles):
+    story = [Paragraph("6. Interactive Dashboard Delivery", styles['SectionHeader'])]
     dashboard_text = """
-    To empower Birhan Energies' clients, we deployed a full-stack interactive dashboard. 
-    Analysts can drill down into specific date ranges and visualize the regime shifts alongside 
+    To empower Birhan Energies' clients, we deployed a full-stack interactive dashboard.
+    Analysts can drill down into specific date ranges and visualize the regime shifts alongside
     geopolitical events in real-time.
     """
-    Story.append(Paragraph(dashboard_text, styles['Justify']))
-    add_image(Story, "birhanDash.png", "Figure 5: Birhan Energies Client Dashboard - Real-time Regime Explorer.", styles, height=200)
-
-
-    # --- Page 6: Recommendations & Limitations ---
-    Story.append(Paragraph("7. Strategic Recommendations", styles['SectionHeader']))
-    
-    Story.append(Paragraph("7.1 For Investors", styles['SubSectionHeader']))
-    Story.append(Paragraph("• <b>Dynamic Hedging:</b> Abandon static volatility models. The 127% volatility increase mandates a move toward 'regime-aware' hedging targets.", styles['CustomBullet']))
-    Story.append(Paragraph("• <b>Tail-Risk Protection:</b> Given the high Kurtosis identified, investors must prioritize insurance against 'Black Swan' events which are now statistically frequent.", styles['CustomBullet']))
-
-    Story.append(Paragraph("7.2 For Policymakers", styles['SubSectionHeader']))
-    Story.append(Paragraph("• <b>Strategic Buffers:</b> The 18.3% price floor increase suggests that energy subsidies or reserves need to be re-calibrated for a higher-cost baseline.", styles['CustomBullet']))
-    Story.append(Paragraph("• <b>Supply Redundancy:</b> Focus on energy source diversification to mitigate the impact of regional conflicts which provide permanent price floors.", styles['CustomBullet']))
-
-    Story.append(Paragraph("7.3 For Energy Companies", styles['SubSectionHeader']))
-    Story.append(Paragraph("• <b>Operational Flexibility:</b> Operations should shift focus from cost-efficiency to 'Crisis-Readiness.' Maintain higher liquidity buffers to absorb price shocks.", styles['CustomBullet']))
-
-    Story.append(Paragraph("8. Limitations and Future Roadmap", styles['SectionHeader']))
-    lim_text = """
+    story.append(Paragraph(dashboard_text, styles['Justify']))
+    add_image(story, "birhanDash.png", "Figure 5: Birhan Energies Client Dashboard - Real-time Regime Explorer.", styles, height=200)
+    return story
+
+@REPORT.section('recommendations', inputs=['vol_change_pct', 'price_change_pct'])
+def recommendations(data, styles):
+    price, vol = data['price_change_pct'], data['vol_change_pct']
+    story = [Paragraph("7. Strategic Recommendations", styles['SectionHeader'])]
+
+    story.append(Paragraph("7.1 For Investors", styles['SubSectionHeader']))
+    story.append(Paragraph(f"• <b>Dynamic Hedging:</b> Abandon static volatility models. The {abs(vol):.0f}% volatility {direction(vol)} mandates a move toward 'regime-aware' hedging targets.", styles['CustomBullet']))
+    story.append(Paragraph("• <b>Tail-Risk Protection:</b> Given the high Kurtosis identified, investors must prioritize insurance against 'Black Swan' events which are now statistically frequent.", styles['CustomBullet']))
+
+    story.append(Paragraph("7.2 For Policymakers", styles['SubSectionHeader']))
+    story.append(Paragraph(f"• <b>Strategic Buffers:</b> The {abs(price):.1f}% {direction(price)} in average price level suggests that energy subsidies or reserves need to be re-calibrated for a {direction(price, 'higher', 'lower')}-cost baseline.", styles['CustomBullet']))
+    story.append(Paragraph("• <b>Supply Redundancy:</b> Focus on energy source diversification to mitigate the impact of regional conflicts which provide permanent price floors.", styles['CustomBullet']))
+
+    story.append(Paragraph("7.3 For Energy Companies", styles['SubSectionHeader']))
+    story.append(Paragraph("• <b>Operational Flexibility:</b> Operations should shift focus from cost-efficiency to 'Crisis-Readiness.' Maintain higher liquidity buffers to absorb price shocks.", styles['CustomBullet']))
+    return story
+
+@REPORT.section('limitations', inputs=['history_start', 'history_end'])
+def limitations(data, styles):
+    story = [Paragraph("8. Limitations and Future Roadmap", styles['SectionHeader'])]
+    lim_text = f"""
     <b>8.1 Honest Assessment of Limitations:</b>
-    • <b>Correlation vs Causation:</b> Statistical breaks show *when* the market changed, not definitively *why*. 
+    • <b>Correlation vs Causation:</b> Statistical breaks show *when* the market changed, not definitively *why*.
     • <b>Single-Break Assumption:</b> Our model captures the *major* shift but omits secondary breaks (e.g., COVID-19 lockdowns).
-    • <b>Data Constraints:</b> Analysis is based on daily granularity from 1987-2022. It misses intra-day 'flash crashes' and intra-regional micro-events.
-    
+    • <b>Data Constraints:</b> Analysis is based on daily granularity from {data['history_start']}-{data['history_end']}. It misses intra-day 'flash crashes' and intra-regional micro-events.
+
     <b>8.2 Future Roadmap:</b>
     1. <b>Multi-Break Detection:</b> Expanding the model to detect 3-5 structural breaks simultaneously.
     2. <b>Macro Integration:</b> Incorporating GDP, Inflation, and Exchange rate covariates.
     3. <b>Markov-Switching Models:</b> Moving to models that can predict the *probability* of entering a new regime in real-time.
     """
-    Story.append(Paragraph(lim_text, styles['Justify']))
+    story.append(Paragraph(lim_text, styles['Justify']))
+    return story
 
-    doc.build(Story)
-    print(f"Rubric-Aligned Final Report generated: {REPORT_FILENAME}")
+def create_report(output=REPORT_FILENAME):
+    REPORT.build(output, load_report_data(), rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
 
 if __name__ == "__main__":
     create_report()
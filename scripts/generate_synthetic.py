@@ -0,0 +1,53 @@
+"""
+Writes synthetic regime-switching price series for scale and accuracy tests.
+
+The series follow backend/app/synthetic.py: planted drift/volatility
+regimes, clustered volatility and Student-t returns. Output is streamed in
+blocks, so sizes up to 100M rows only need memory for one block. CSV dates
+must end by 9999-12-31 (about 2.1M business days from 1987); larger CSVs
+need an earlier --start-date, or use the columnar store. The planted
+regimes are written alongside as <name>_regimes.csv.
+"""
+
+import argparse
+import os
+import time
+
+from _paths import DATA_DIR
+from app.synthetic import BLOCK_ROWS, SyntheticSpec, max_csv_rows, planted_regimes, write_csv, write_store
+
+OUTPUT_DIR = os.path.join(DATA_DIR, 'synthetic')
+
+def generate(rows, seed, fmt, output_dir, block_rows, start_date=SyntheticSpec.start_date):
+    spec = SyntheticSpec(rows, seed=seed, start_date=start_date)
+    name = f"synthetic_{rows}_s{seed}"
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    if fmt in ('csv', 'both'):
+        path = os.path.join(output_dir, name + '.csv')
+        write_csv(spec, path, block_rows)
+        print(f"Date,Price CSV: {path}")
+    if fmt in ('store', 'both'):
+        store = write_store(spec, os.path.join(output_dir, name), block_rows)
+        print(f"Columnar store: {store.path}")
+    regimes = planted_regimes(spec)
+    regimes.to_csv(os.path.join(output_dir, name + '_regimes.csv'), index=False)
+    print(f"{rows:,} rows with {len(regimes) - 1:,} planted change points "
+          f"written in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic Brent-like price series with known change points.")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="number of daily prices")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--start-date', default=SyntheticSpec.start_date, help="first business day (YYYY-MM-DD)")
+    parser.add_argument('--format', choices=['csv', 'store', 'both'], default='store',
+                        help="raw Date,Price CSV, columnar store (as read by the API), or both")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR)
+    parser.add_argument('--block-rows', type=int, default=BLOCK_ROWS, help="rows generated and written per block")
+    args = parser.parse_args()
+    if args.format in ('csv', 'both'):
+        limit = max_csv_rows(SyntheticSpec(1, start_date=args.start_date))
+        if args.rows > limit:
+            parser.error(f"a CSV starting {args.start_date} holds at most {limit:,} rows (dates end at 9999-12-31); "
+                         f"use --format store or an earlier --start-date")
+    generate(args.rows, args.seed, args.format, args.output_dir, args.block_rows, args.start_date)
@@ -0,0 +1,51 @@
+import argparse
+import os
+
+from _paths import DATA_DIR
+from app.services import DEFAULT_SERIES, PRICE_STORE_DIR, SERIES_REGISTRY
+from app.store import PriceStore, append_rows
+
+RAW_CSV = os.path.join(DATA_DIR, 'raw', 'BrentOilPrices.csv')
+
+def series_paths(ticker=DEFAULT_SERIES):
+    """(raw CSV, store directory) of a series; other tickers live under data/*/series/."""
+    if ticker == DEFAULT_SERIES:
+        return RAW_CSV, PRICE_STORE_DIR
+    entry = SERIES_REGISTRY.locate(ticker)
+    return entry.csv_path, entry.store_dir
+
+def ingest(csv_path=None, full=False, ticker=DEFAULT_SERIES):
+    default_csv, store_dir = series_paths(ticker)
+    csv_path = csv_path or default_csv
+    store = PriceStore(store_dir)
+    print(f"Ingesting {csv_path} into {store_dir}...")
+    changed = store.ingest_csv(csv_path, full=full)
+    meta = store.meta()
+    print(f"{changed} rows added or changed; store holds {meta['rows']} rows "
+          f"({meta['first_date']} to {meta['last_date']}).")
+
+def append(date, price, replace=False, ticker=DEFAULT_SERIES):
+    store = PriceStore(series_paths(ticker)[1])
+    changed = append_rows(store, [{'Date': date, 'Price': price}], replace=replace)
+    print(f"{changed} rows added or changed; last stored date: {store.meta()['last_date']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the columnar Brent price store used by all loaders.")
+    parser.add_argument('--ticker', default=DEFAULT_SERIES,
+                        help=f"series to maintain (default: {DEFAULT_SERIES}); others read data/raw/series/<ticker>.csv")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_ingest = sub.add_parser('ingest', help="normalize the raw CSV into the store (only new rows after the first run)")
+    p_ingest.add_argument('--csv', help="raw Date,Price CSV (default: the series' raw file)")
+    p_ingest.add_argument('--full', action='store_true', help="rebuild the store from scratch")
+
+    p_append = sub.add_parser('append', help="append one daily price")
+    p_append.add_argument('date', help="observation date, e.g. 2022-11-15")
+    p_append.add_argument('price', type=float, help="price in USD/barrel")
+    p_append.add_argument('--replace', action='store_true', help="overwrite a differing stored price")
+
+    args = parser.parse_args()
+    if args.command == 'ingest':
+        ingest(args.csv, args.full, args.ticker)
+    else:
+        append(args.date, args.price, args.replace, args.ticker)
@@ -0,0 +1,168 @@
+"""
+Incremental PDF report builder.
+
+A report is a list of sections, each a function registered on a Report
+with the report_data values it quotes and the figures it shows. Building
+a section turns those into ReportLab flowables. The flowables are pickled
+in CACHE_DIR under a hash of the section's inputs, figure files, drawing
+code and stylesheet. A rebuild only redraws the sections whose inputs
+changed; the PDF is then assembled from the cached flowables. Figures are
+embedded as copies downscaled to the size they are drawn at (also cached
+by content), not as the 300 dpi originals.
+"""
+
+import hashlib
+import inspect
+import os
+import pickle
+import time
+
+from PIL import Image as PILImage
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate
+
+from _paths import REPO_ROOT
+from app.figures import update_digest
+from app.prep import file_digest
+from report_data import FIGURES_DIR
+
+CACHE_DIR = os.path.join(REPO_ROOT, 'docs', '.report_cache')
+
+# Resolution of the embedded figure copies
+IMAGE_DPI = 150
+
+
+def _atomic_write(path, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def figure_digest(filename):
+    """Content hash of a figure in results/figures, or None if it does not exist."""
+    path = os.path.join(FIGURES_DIR, filename)
+    return file_digest(path) if os.path.exists(path) else None
+
+
+def scaled_image(filename, width, height):
+    """
+    Copy of a figure resized to width x height points at IMAGE_DPI.
+
+    Returns:
+        Path of the cached copy, named after the figure's content and size.
+    """
+    digest = figure_digest(filename)
+    stem = os.path.splitext(filename)[0]
+    path = os.path.join(CACHE_DIR, 'images', f"{stem}-{digest[:16]}-{int(width)}x{int(height)}.png")
+    if not os.path.exists(path):
+        size = (round(width / 72 * IMAGE_DPI), round(height / 72 * IMAGE_DPI))
+        with PILImage.open(os.path.join(FIGURES_DIR, filename)) as source:
+            scaled = source.convert('RGB').resize(size, PILImage.LANCZOS)
+        _atomic_write(path, lambda f: scaled.save(f, format='PNG', optimize=True))
+    return path
+
+
+def figure(filename, width, height, styles):
+    """Image flowable of a figure, or a placeholder paragraph if it is missing or unreadable."""
+    if figure_digest(filename) is None:
+        return Paragraph(f"[Image not found: {filename}]", styles['Normal'])
+    try:
+        return Image(scaled_image(filename, width, height), width=width, height=height)
+    except Exception as e:
+        return Paragraph(f"[Image error: {filename} - {e}]", styles['Normal'])
+
+
+class Report:
+    """
+    Sections of one PDF, built incrementally.
+
+    Args:
+        name: Report name; its sections are cached under CACHE_DIR/<name>/.
+        make_styles: Function returning the report's stylesheet. Its source
+            is part of every section's hash, so a style change rebuilds all.
+    """
+
+    def __init__(self, name, make_styles):
+        self.name = name
+        self.make_styles = make_styles
+        self.sections = []
+
+    def section(self, name, inputs=(), figures=()):
+        """
+        Decorator registering a section builder: fn(data, styles) -> list of flowables.
+
+        Args:
+            name: Section name, unique within the report.
+            inputs: report_data keys passed to the builder in `data`.
+            figures: Figure files the section shows.
+        """
+        def register(build):
+            self.sections.append((name, build, tuple(inputs), tuple(figures)))
+            return build
+        return register
+
+    def _key(self, build, values, figures):
+        digest = hashlib.sha256()
+        for part in (inspect.getsource(build), inspect.getsource(self.make_styles)):
+            digest.update(part.encode())
+        update_digest(digest, values)
+        update_digest(digest, {filename: figure_digest(filename) for filename in figures})
+        return digest.hexdigest()
+
+    def _flowables(self, name, build, inputs, figures, data, styles):
+        """Returns (flowables, status) for one section, from the cache when its key matches."""
+        missing = [key for key in inputs if key not in data]
+        if missing:
+            return [Paragraph(f"[{name}: missing {', '.join(missing)}]", styles['Normal'])], 'missing'
+
+        values = {key: data[key] for key in inputs}
+        key = self._key(build, values, figures)
+        path = os.path.join(CACHE_DIR, self.name, f"{name}.pkl")
+        try:
+            with open(path, 'rb') as f:
+                cached_key, flowables = pickle.load(f)
+            # Figures are referenced by their scaled copies, which must still exist
+            images = [f.filename for f in flowables if isinstance(f, Image)]
+            if cached_key == key and all(os.path.exists(image) for image in images):
+                return flowables, 'cached'
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+            pass
+
+        flowables = build(values, styles)
+        try:
+            payload = pickle.dumps((key, flowables))
+            _atomic_write(path, lambda f: f.write(payload))
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"  Section {name} not cached ({e})")
+        return flowables, 'built'
+
+    def build(self, output, data, **doc_kwargs):
+        """
+        Writes the PDF from cached or rebuilt sections.
+
+        Args:
+            output: PDF path.
+            data: Values from report_data.load_report_data().
+            doc_kwargs: SimpleDocTemplate options (margins etc.).
+
+        Returns:
+            Section name to 'cached', 'built' or 'missing'.
+        """
+        start = time.perf_counter()
+        styles = self.make_styles()
+        story, statuses = [], {}
+        for name, build, inputs, figures in self.sections:
+            flowables, statuses[name] = self._flowables(name, build, inputs, figures, data, styles)
+            story.extend(flowables)
+
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        doc = SimpleDocTemplate(output, pagesize=doc_kwargs.pop('pagesize', letter), **doc_kwargs)
+        doc.build(story)
+        built = sum(status == 'built' for status in statuses.values())
+        print(f"{output}: {built} of {len(statuses)} sections rebuilt in {time.perf_counter() - start:.1f}s")
+        for name, status in statuses.items():
+            if status != 'cached':
+                print(f"  {status:>7}: {name}")
+        return statuses
@@ -0,0 +1,117 @@
+"""
+Statistics and tables shown in the PDF reports, read from the results artifacts.
+
+Every number quoted in the report text comes from here, so a report
+regenerated after a new run always matches the data. Values are keyed by
+name; report sections declare the names they use (see report_builder.py).
+"""
+
+import os
+
+import pandas as pd
+
+from _paths import DATA_DIR, RESULTS_DIR
+from app.services import DataService
+
+STATS_DIR = os.path.join(RESULTS_DIR, 'statistics')
+FIGURES_DIR = os.path.join(RESULTS_DIR, 'figures')
+EVENTS_CSV = os.path.join(DATA_DIR, 'events', 'geopolitical_events.csv')
+IMPACT_CSV = os.path.join(STATS_DIR, 'stat_change_point_impact.csv')
+CONVERGENCE_CSV = os.path.join(STATS_DIR, 'stat_bayesian_convergence.csv')
+EDA_CSV = os.path.join(STATS_DIR, 'stat_descriptive_summary.csv')
+STATIONARITY_CSV = os.path.join(STATS_DIR, 'stat_stationarity_tests.csv')
+
+# First date of the modeled returns (as in bayesian_changepoint.py)
+START_DATE = '2012-01-01'
+
+
+def read_metrics(path):
+    """Metric/Value CSV as a dict of strings."""
+    df = pd.read_csv(path, dtype=str)
+    return dict(zip(df['Metric'], df['Value']))
+
+
+def nearest_event(events, date):
+    """Event closest to `date`, with its lag in days (positive: the event came first)."""
+    lags = (pd.Timestamp(date) - events['Date']).dt.days
+    row = events.loc[lags.abs().idxmin()]
+    return {'event': row['Event'], 'date': row['Date'], 'category': row['Category'],
+            'lag_days': int(lags[row.name])}
+
+
+def load_report_data():
+    """
+    Reads every artifact the reports quote.
+
+    Missing artifacts leave their values out, so sections that need them
+    report what is missing instead of stale numbers.
+    """
+    data = {'generated': pd.Timestamp.today().strftime('%B %Y')}
+
+    if os.path.exists(EVENTS_CSV):
+        events = pd.read_csv(EVENTS_CSV)
+        events['Date'] = pd.to_datetime(events['Date'], format='ISO8601')
+        data['events'] = events
+
+    prices = DataService.get_price_frame()
+    study = prices[prices['Date'] >= START_DATE]
+    data.update(
+        study_start=study['Date'].iloc[0].year,
+        study_end=study['Date'].iloc[-1].year,
+        history_start=prices['Date'].iloc[0].year,
+        history_end=prices['Date'].iloc[-1].year,
+    )
+
+    if os.path.exists(EDA_CSV):
+        eda = pd.read_csv(EDA_CSV)
+        data['eda'] = eda
+        returns = eda.set_index('Metric').iloc[:, 1]
+        data['kurtosis'] = float(returns['Kurtosis'])
+
+    if os.path.exists(STATIONARITY_CSV):
+        tests = pd.read_csv(STATIONARITY_CSV).set_index('Test')
+        data['adf_price_p'] = float(tests.loc['ADF (Price)', 'P_Value'])
+        data['adf_returns_p'] = float(tests.loc['ADF (Returns)', 'P_Value'])
+
+    if os.path.exists(CONVERGENCE_CSV):
+        convergence = pd.read_csv(CONVERGENCE_CSV, index_col=0)
+        data['convergence'] = convergence
+        r_hat = convergence['r_hat']
+        data['r_hat_mu'] = float(r_hat[[name for name in r_hat.index if name.startswith('mu_')]].max())
+        others = r_hat[[name for name in r_hat.index if not name.startswith('mu_')]]
+        data['r_hat_range'] = (float(others.min()), float(others.max()))
+
+    if os.path.exists(IMPACT_CSV):
+        impact = read_metrics(IMPACT_CSV)
+        change_date = pd.Timestamp(impact['Change Point Date'])
+        data.update(
+            change_date=change_date,
+            date_lower=pd.Timestamp(impact['Date Lower CI (2.5%)']),
+            date_upper=pd.Timestamp(impact['Date Upper CI (97.5%)']),
+            mean_before=float(impact['Mean Before']),
+            mean_after=float(impact['Mean After']),
+            prob_increase=float(impact['Prob(Mean Increased)']),
+            vol_before=float(impact['Volatility Before']),
+            vol_after=float(impact['Volatility After']),
+            vol_change_pct=float(impact['Volatility Change (%)'].rstrip('%')),
+        )
+        before = study.loc[study['Date'] < change_date, 'Price']
+        after = study.loc[study['Date'] >= change_date, 'Price']
+        data.update(price_before=float(before.mean()), price_after=float(after.mean()),
+                    price_change_pct=float((after.mean() / before.mean() - 1) * 100))
+        if 'events' in data:
+            data['nearest_event'] = nearest_event(data['events'], change_date)
+
+    return data
+
+
+def fmt_date(value):
+    """Report date format, e.g. November 12, 2018."""
+    return pd.Timestamp(value).strftime('%B %d, %Y').replace(' 0', ' ')
+
+
+def fmt_lag(days):
+    """'N days after <event>' phrasing of nearest_event's lag."""
+    if days == 0:
+        return "on the day of"
+    return f"{abs(days)} days {'after' if days > 0 else 'before'}"
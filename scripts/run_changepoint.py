@@ -1,38 +1,31 @@
+import argparse
 import pandas as pd
 import numpy as np
-import pymc as pm
-import arviz as az
 import os
 
+from _paths import DATA_DIR
+from app.analysis import fit_single_changepoint, summary_table
+from app.analysis.posterior import summarize
+from app.analysis.sampling import CONFIG_FILE, GibbsChangepointSampler, SamplerConfig, run_chains, to_inference_data
+from app.services import DataService, price_source
+from app.trace import save_summary
+
 # Paths
-DATA_PATH = '/home/karanos/kiam/week11/prod/data/raw/BrentOilPrices.csv'
-OUTPUT_TRACE = '/home/karanos/kiam/week11/prod/data/processed/change_point_trace.nc'
-OUTPUT_SUMMARY = '/home/karanos/kiam/week11/prod/data/processed/change_point_summary.csv'
+OUTPUT_TRACE = os.path.join(DATA_DIR, 'processed', 'change_point_trace.nc')
+TRACE_STORE_DIR = os.path.join(DATA_DIR, 'processed', 'change_point_chains')
+OUTPUT_SUMMARY = os.path.join(DATA_DIR, 'processed', 'change_point_summary.csv')
 
-def run_changepoint_model():
-    print("Loading data...")
-    if not os.path.exists(DATA_PATH):
-        # Fallback to absolute path or adjust
-        print(f"Error: Data file not found at {DATA_PATH}")
-        return
+def load_log_returns(start_date='2012-01-01'):
+    """Loads prices from start_date onward and returns (log_returns, dates)."""
+    # Same preparation the API uses, so scripts and endpoints agree
+    df = DataService.get_log_returns(start_date)
+    return df['Log_Return'].values, df['Date'].values
 
-    df = pd.read_csv(DATA_PATH)
-        
-    df['Date'] = pd.to_datetime(df['Date'], format='mixed', dayfirst=True)
-    df = df.sort_values('Date').reset_index(drop=True)
-    df_recent = df[df['Date'] >= '2012-01-01'].copy()
-    
-    # Check for Log_Return column
-    if 'Log_Return' not in df_recent.columns:
-        df_recent['Log_Return'] = np.log(df_recent['Price'] / df_recent['Price'].shift(1))
-    
-    df_recent = df_recent.dropna()
-    log_returns = df_recent['Log_Return'].values
-    n_obs = len(log_returns)
-    dates = df_recent['Date'].values
-    
-    print(f"Data loaded: {n_obs} observations.")
+def sample_changepoint_model(log_returns, config):
+    """Samples the switch-point model with PyMC and saves the trace."""
+    import pymc as pm
 
+    n_obs = len(log_returns)
     print("Building model...")
     with pm.Model() as model:
         tau = pm.DiscreteUniform('tau', lower=0, upper=n_obs - 1)
@@ -49,15 +42,54 @@ def run_changepoint_model():
         
     print("Sampling...")
     with model:
-        # Reduced samples for speed as per user preference in Task 3
-        # Saving trace to netcdf
-        trace = pm.sample(draws=1000, tune=1000, chains=2, return_inferencedata=True, random_seed=42)
+        trace = pm.sample(draws=config.draws, tune=config.tune, chains=config.chains,
+                          cores=config.cores or os.cpu_count(), return_inferencedata=True,
+                          random_seed=config.seed)
         trace.to_netcdf(OUTPUT_TRACE)
     
     print(f"Trace saved to {OUTPUT_TRACE}")
+    var_names = ['tau', 'mu_before', 'mu_after', 'sigma_before', 'sigma_after']
+    summary = summarize({name: trace.posterior[name].values for name in var_names}, var_names)
+    print(f"Posterior summary cached at {save_summary(OUTPUT_TRACE, summary)}")
+    return summary.table
+
+def sample_gibbs(log_returns, config, fresh=False):
+    """Runs the chunked Gibbs sampler across processes, resuming from TRACE_STORE_DIR."""
+    sampler = GibbsChangepointSampler(log_returns, collapse_tau=True)
+    print(f"Sampling {config.chains} chains x {config.draws} draws (checkpoints in {TRACE_STORE_DIR})...")
+    draws = run_chains(sampler, TRACE_STORE_DIR, config, fresh=fresh)
+    # One pass over all draws, cached next to the store for the API and reports
+    summary = summarize(draws, sampler.var_names)
+    save_summary(os.path.join(TRACE_STORE_DIR, CONFIG_FILE), summary)
+    try:
+        to_inference_data(draws).to_netcdf(OUTPUT_TRACE)
+        print(f"Trace saved to {OUTPUT_TRACE}")
+        save_summary(OUTPUT_TRACE, summary)
+    except RuntimeError as e:
+        print(f"Trace not exported to NetCDF ({e})")
+    return summary.table
+
+def run_changepoint_model(engine='analytic', config=None, fresh=False):
+    config = config or SamplerConfig()
+    print("Loading data...")
+    data_path = price_source()
+    if not os.path.exists(data_path):
+        print(f"Error: Data file not found at {data_path}")
+        return
+
+    log_returns, dates = load_log_returns()
+    print(f"Data loaded: {len(log_returns)} observations.")
+
+    if engine == 'mcmc':
+        summary = sample_changepoint_model(log_returns, config)
+    elif engine == 'gibbs':
+        summary = sample_gibbs(log_returns, config, fresh)
+    else:
+        # Exact posterior over every tau from prefix sums (milliseconds)
+        posterior = fit_single_changepoint(log_returns)
+        summary = summary_table(posterior)
     
     # Save summary
-    summary = az.summary(trace, var_names=['tau', 'mu_before', 'mu_after', 'sigma_before', 'sigma_after'])
     summary.to_csv(OUTPUT_SUMMARY)
     
     # Calculate expected date of change
@@ -81,4 +113,18 @@ def run_changepoint_model():
         print(f"Change Point index {idx_mean} out of bounds.")
 
 if __name__ == "__main__":
-    run_changepoint_model()
+    parser = argparse.ArgumentParser(description="Fit the single change point model to Brent log returns.")
+    parser.add_argument('--engine', choices=['analytic', 'gibbs', 'mcmc'], default='analytic',
+                        help="'analytic' computes the exact posterior; 'gibbs' runs resumable parallel chains; "
+                             "'mcmc' samples with PyMC and writes the trace")
+    parser.add_argument('--draws', type=int, default=1000, help="Kept draws per chain")
+    parser.add_argument('--tune', type=int, default=1000, help="Warm-up iterations per chain")
+    parser.add_argument('--chains', type=int, default=4, help="Number of chains")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    parser.add_argument('--chunk-size', type=int, default=250, help="Iterations per checkpoint (gibbs)")
+    parser.add_argument('--cores', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--fresh', action='store_true', help="Discard checkpointed draws instead of resuming (gibbs)")
+    args = parser.parse_args()
+    config = SamplerConfig(draws=args.draws, tune=args.tune, chains=args.chains, seed=args.seed,
+                           chunk_size=args.chunk_size, cores=args.cores)
+    run_changepoint_model(args.engine, config, args.fresh)
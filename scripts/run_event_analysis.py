@@ -1,25 +1,23 @@
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 from datetime import timedelta
 import os
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+from _paths import DATA_DIR, RESULTS_DIR
+from app.analysis import IntervalIndex, event_window_impact
+from app.services import DataService
+from figures import EVENT_FIGURES, FIGURES, report as report_figures
 
-def run_analysis():
-    print("Loading data...")
-    events_df = pd.read_csv('../data/events/geopolitical_events.csv')
-    events_df['Date'] = pd.to_datetime(events_df['Date'], format='mixed', dayfirst=True)
+def load_event_association(window_days=90):
+    """Reads the change point summary and events; returns the change point, nearby events and figure inputs."""
+    events_df = pd.read_csv(os.path.join(DATA_DIR, 'events', 'geopolitical_events.csv'))
+    events_df['Date'] = pd.to_datetime(events_df['Date'], format='ISO8601')
 
-    cp_summary = pd.read_csv('../data/processed/change_point_summary.csv', index_col=0)
+    cp_summary = pd.read_csv(os.path.join(DATA_DIR, 'processed', 'change_point_summary.csv'), index_col=0)
 
-    price_df = pd.read_csv('../data/raw/BrentOilPrices.csv')
-    price_df['Date'] = pd.to_datetime(price_df['Date'], format='mixed', dayfirst=True)
-    price_df = price_df.sort_values('Date').reset_index(drop=True)
+    # Sorted prices from the columnar store (or the raw CSV if not ingested)
+    price_df = DataService.get_price_frame()
     price_df_recent = price_df[price_df['Date'] >= '2012-01-01'].copy().reset_index(drop=True)
 
     # Extract Change Point Info
@@ -38,43 +36,50 @@ def run_analysis():
     cp_lower = get_date_from_index(tau_hdi_3, price_df_recent['Date'])
     cp_upper = get_date_from_index(tau_hdi_97, price_df_recent['Date'])
 
-    print(f"Change Point Date: {cp_date}")
-    
     # Filter events
-    window_days = 90
-    nearby_events = events_df[
-        (events_df['Date'] >= cp_date - timedelta(days=window_days)) &
-        (events_df['Date'] <= cp_date + timedelta(days=window_days))
-    ].copy()
+    cp_day = np.datetime64(cp_date, 'D').astype(np.int64)
+    event_days = events_df['Date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    event_pos, _ = IntervalIndex(np.array([cp_day]), np.array([cp_day])).stab(event_days, window_days)
+    nearby_events = events_df.iloc[np.sort(event_pos)].copy()
 
     nearby_events['Lag_Days'] = (cp_date - nearby_events['Date']).dt.days
-    
-    # Visualization
-    print("Generating visualization...")
-    plt.figure(figsize=(15, 8))
 
+    # Prices a year either side of the change point
     mask = (price_df_recent['Date'] >= cp_date - timedelta(days=365)) & (price_df_recent['Date'] <= cp_date + timedelta(days=365))
     subset = price_df_recent[mask]
 
-    plt.plot(subset['Date'], subset['Price'], label='Brent Price', color='blue', alpha=0.6)
+    return {
+        'events': events_df,
+        'cp_summary': cp_summary,
+        'cp_date': cp_date,
+        'nearby_events': nearby_events,
+        'figure_inputs': {
+            'event_dates': subset['Date'].to_numpy(),
+            'event_prices': subset['Price'].to_numpy(),
+            'cp_date': cp_date,
+            'cp_interval': (cp_lower, cp_upper) if cp_lower and cp_upper else None,
+            'nearby_events': nearby_events[['Date', 'Event']].reset_index(drop=True),
+        },
+    }
+
+def run_analysis():
+    print("Loading data...")
+    association = load_event_association()
+    events_df, cp_summary = association['events'], association['cp_summary']
+    cp_date, nearby_events = association['cp_date'], association['nearby_events']
 
-    plt.axvline(cp_date, color='red', linestyle='--', label=f'Detected Change Point ({cp_date.date()})')
-    if cp_lower and cp_upper:
-        plt.axvspan(cp_lower, cp_upper, color='red', alpha=0.1, label='Uncertainty (HDI)')
+    # Pre/post windowed returns, volatility and abnormal returns for every event
+    returns = DataService.get_returns_series(None)
+    impact = event_window_impact(returns.dates, returns.log_returns, events_df)
+    impact_path = os.path.join(RESULTS_DIR, 'statistics', 'stat_event_impact.csv')
+    impact.to_csv(impact_path, index=False)
+    print(f"Event impact table saved to {impact_path}")
 
-    for _, row in nearby_events.iterrows():
-        plt.axvline(row['Date'], color='green', linestyle=':', alpha=0.8)
-        plt.text(row['Date'], subset['Price'].max(), row['Event'], rotation=90, verticalalignment='top')
-
-    plt.title('Brent Oil Price: Change Points vs Geopolitical Events')
-    plt.xlabel('Date')
-    plt.ylabel('Price (USD)')
-    plt.legend()
-    plt.tight_layout()
-    
-    os.makedirs('../results/figures', exist_ok=True)
-    plt.savefig('../results/figures/event_association.png')
-    print("Figure saved to ../results/figures/event_association.png")
+    print(f"Change Point Date: {cp_date}")
+
+    # Visualization, skipped when its inputs are unchanged
+    print("Generating visualization...")
+    report_figures(FIGURES.render(association['figure_inputs'], EVENT_FIGURES))
 
     # Impact statements
     mu_before = cp_summary.loc['mu_before', 'mean']
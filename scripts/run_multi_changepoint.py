@@ -0,0 +1,50 @@
+import argparse
+import os
+
+import numpy as np
+
+from _paths import RESULTS_DIR
+from app.analysis.segmentation import crops, default_penalty, pelt, segment_table
+from run_changepoint import load_log_returns
+
+OUTPUT_SEGMENTS = os.path.join(RESULTS_DIR, 'statistics', 'stat_segments.csv')
+OUTPUT_PATH = os.path.join(RESULTS_DIR, 'statistics', 'stat_penalty_path.csv')
+
+def run_multi_changepoint(start_date='2012-01-01', penalty=None, min_size=5,
+                          penalty_min=None, penalty_max=None):
+    print("Loading data...")
+    log_returns, dates = load_log_returns(start_date)
+    print(f"Data loaded: {len(log_returns)} observations.")
+
+    penalty = penalty or default_penalty(len(log_returns))
+    print(f"Running PELT (penalty={penalty:.2f}, min_size={min_size})...")
+    result = pelt(log_returns, penalty, min_size)
+    print(f"Detected {result.n_changepoints} change points.")
+
+    segments = segment_table(log_returns, dates, result.changepoints)
+    os.makedirs(os.path.dirname(OUTPUT_SEGMENTS), exist_ok=True)
+    segments.to_csv(OUTPUT_SEGMENTS, index=False)
+    print(segments.to_string(index=False))
+    print(f"Segments saved to {OUTPUT_SEGMENTS}")
+
+    if penalty_min is not None and penalty_max is not None:
+        print(f"Running CROPS over penalties [{penalty_min}, {penalty_max}]...")
+        path = crops(log_returns, penalty_min, penalty_max, min_size)
+        date_strings = np.datetime_as_string(dates, unit='D')
+        with open(OUTPUT_PATH, 'w') as f:
+            f.write("Penalty,Change_Points,Cost,Dates\n")
+            for seg in path:
+                cp_dates = ' '.join(date_strings[i] for i in seg.changepoints)
+                f.write(f"{seg.penalty:.4f},{seg.n_changepoints},{seg.cost:.4f},{cp_dates}\n")
+        print(f"{len(path)} segmentations saved to {OUTPUT_PATH}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Detect multiple change points in Brent log returns with PELT.")
+    parser.add_argument('--start-date', default='2012-01-01', help="first date of the series; 'all' for the full history")
+    parser.add_argument('--penalty', type=float, help="penalty per change point (default: BIC, 3 log n)")
+    parser.add_argument('--min-size', type=int, default=5, help="minimum segment length in trading days")
+    parser.add_argument('--penalty-min', type=float, help="lower end of the CROPS penalty sweep")
+    parser.add_argument('--penalty-max', type=float, help="upper end of the CROPS penalty sweep")
+    args = parser.parse_args()
+    start_date = None if args.start_date == 'all' else args.start_date
+    run_multi_changepoint(start_date, args.penalty, args.min_size, args.penalty_min, args.penalty_max)
@@ -0,0 +1,150 @@
+"""
+End-to-end analysis pipeline: raw prices to PDF reports.
+
+The workflow scripts are declared as stages of a DAG (backend/app/pipeline.py)
+with the files each reads and writes:
+
+    ingest -> returns -> changepoint -> impact ------> report_final
+                     \             \                  /  report_interim
+                      \             -> events -------/
+                       -> volatility
+
+Stages that no longer need each other run concurrently, and a stage is
+skipped when the contents of its inputs, its outputs and its code are those
+of its last successful run. The scripts run as subprocesses from the
+repository root, each with its output in data/processed/pipeline_logs/.
+Statuses and timings of every run are appended to
+data/processed/pipeline_state_runs.jsonl.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from _paths import DATA_DIR, REPO_ROOT, SCRIPTS_DIR
+from app.pipeline import Pipeline
+from app.services import DataService
+
+STATE_FILE = os.path.join(DATA_DIR, 'processed', 'pipeline_state.json')
+LOG_DIR = os.path.join(DATA_DIR, 'processed', 'pipeline_logs')
+START_DATE = '2012-01-01'
+
+PIPELINE = Pipeline(REPO_ROOT, STATE_FILE)
+
+# Shared input groups (paths relative to the repository root)
+PRICES = 'data/processed/brent_store/meta.json'
+RETURNS = 'data/processed/brent_log_returns.csv'
+EVENTS = 'data/events/geopolitical_events.csv'
+CP_SUMMARY = 'data/processed/change_point_summary.csv'
+ANALYSIS = ['backend/app/analysis', 'backend/app/prep.py', 'backend/app/services.py']
+FIGURE_CODE = ['scripts/figures.py', 'backend/app/figures.py']
+STATS = ['results/statistics/stat_bayesian_convergence.csv', 'results/statistics/stat_change_point_impact.csv',
+         'results/statistics/stat_descriptive_summary.csv', 'results/statistics/stat_stationarity_tests.csv']
+REPORT_CODE = ['scripts/report_data.py', 'scripts/report_builder.py']
+
+
+def run_script(script, *args):
+    """Runs a workflow script from the repository root, keeping its output in LOG_DIR."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f"{os.path.splitext(script)[0]}.log")
+    with open(log_path, 'w') as log:
+        proc = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), *args],
+                              cwd=REPO_ROOT, stdout=log, stderr=subprocess.STDOUT)
+    if proc.returncode != 0:
+        with open(log_path) as log:
+            tail = log.read().strip().splitlines()[-5:]
+        raise RuntimeError(f"{script} exited with {proc.returncode} (see {log_path}):\n  " + "\n  ".join(tail))
+
+
+@PIPELINE.stage('ingest', inputs=['data/raw/BrentOilPrices.csv', 'scripts/ingest_prices.py', 'backend/app/store.py'],
+                outputs=[PRICES])
+def ingest():
+    run_script('ingest_prices.py', 'ingest')
+
+
+@PIPELINE.stage('returns', inputs=[PRICES, 'backend/app/prep.py'], outputs=[RETURNS])
+def returns():
+    # The models prepare returns through the same memo; this copy is the
+    # checkpoint they are keyed on, so price edits outside the modeled
+    # window (or a reformatted raw file) stop here
+    path = os.path.join(REPO_ROOT, RETURNS)
+    DataService.get_log_returns(START_DATE).to_csv(f"{path}.tmp", index=False)
+    os.replace(f"{path}.tmp", path)
+
+
+@PIPELINE.stage('changepoint', inputs=[RETURNS, 'scripts/run_changepoint.py'] + ANALYSIS, outputs=[CP_SUMMARY])
+def changepoint():
+    run_script('run_changepoint.py', '--engine', 'analytic')
+
+
+@PIPELINE.stage('impact', inputs=[RETURNS, 'scripts/bayesian_changepoint.py'] + ANALYSIS + FIGURE_CODE,
+                outputs=['results/statistics/stat_bayesian_convergence.csv',
+                         'results/statistics/stat_change_point_impact.csv',
+                         'results/statistics/stat_posterior_summary.json',
+                         'results/figures/fig_tau_posterior.png',
+                         'results/figures/fig_parameter_posteriors.png',
+                         'results/figures/fig_changepoint_on_prices.png'])
+def impact():
+    run_script('bayesian_changepoint.py')
+
+
+@PIPELINE.stage('events', inputs=[RETURNS, CP_SUMMARY, EVENTS, 'scripts/run_event_analysis.py'] + ANALYSIS + FIGURE_CODE,
+                outputs=['results/statistics/stat_event_impact.csv', 'results/figures/event_association.png'])
+def events():
+    run_script('run_event_analysis.py')
+
+
+@PIPELINE.stage('volatility', inputs=[RETURNS, 'scripts/run_volatility.py'] + ANALYSIS,
+                outputs=['data/processed/volatility_filter_estimates.csv'])
+def volatility():
+    run_script('run_volatility.py', '--start-date', START_DATE)
+
+
+@PIPELINE.stage('report_final', inputs=[RETURNS, EVENTS, 'scripts/generate_final_report.py'] + STATS + REPORT_CODE + [
+                    'results/figures/fig_trace_plots.png', 'results/figures/fig_changepoint_on_prices.png',
+                    'results/figures/birhanDash.png'],
+                outputs=['docs/Final_Report_Birhan_Energies.pdf'])
+def report_final():
+    run_script('generate_final_report.py')
+
+
+@PIPELINE.stage('report_interim', inputs=[RETURNS, EVENTS, 'scripts/generate_report.py'] + STATS + REPORT_CODE + [
+                    'results/figures/fig_brent_prices_2012_2022.png', 'results/figures/volatility_clustering.png',
+                    'results/figures/fig_changepoint_on_prices.png'],
+                outputs=['docs/Interim_Report_Task1.pdf'])
+def report_interim():
+    run_script('generate_report.py')
+
+
+def report(results):
+    """Prints one line per stage and returns the number that failed or were blocked."""
+    for name, result in results.items():
+        detail = f" ({result.seconds:.1f}s)" if result.status in ('ran', 'failed') else ''
+        print(f"  {result.status:>7}: {name}{detail}")
+        if result.error:
+            print(f"           {result.error}")
+    return sum(result.status in ('failed', 'blocked') for result in results.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bring the analysis outputs up to date, rerunning only what changed.")
+    parser.add_argument('stages', nargs='*', help=f"stages to update with their upstream stages "
+                                                  f"(default: all of {', '.join(PIPELINE.stages)})")
+    parser.add_argument('--force', action='store_true', help="rerun the named stages (default: all) even if fresh")
+    parser.add_argument('--workers', type=int, help="stages run at once (default: all cores)")
+    parser.add_argument('--dry-run', action='store_true', help="only list which stages are stale")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        for name, status in PIPELINE.status(args.stages).items():
+            print(f"  {status:>7}: {name}")
+        sys.exit(0)
+
+    start = time.perf_counter()
+    results = PIPELINE.run(args.stages, args.workers, args.force)
+    failed = report(results)
+    ran = sum(result.status == 'ran' for result in results.values())
+    print(f"Done in {time.perf_counter() - start:.1f}s: {ran} ran, {len(results) - ran - failed} fresh, {failed} not finished.")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,76 @@
+"""
+Fast daily volatility estimates for Brent log returns.
+
+Replaces the per-day GaussianRandomWalk model sampled with NUTS in
+notebooks/03_volatility_forecasting.ipynb with a Kalman filter/smoother or a
+GARCH(1,1) fit that run in well under a second, and writes a CSV in the
+same Date,Volatility layout next to the notebook's estimates (which it
+leaves alone); the API serves it as /api/volatility?source=filter. With
+--update, only days after the last run are filtered with the saved model,
+and appended to the CSV.
+"""
+
+import argparse
+import json
+import os
+
+import pandas as pd
+
+from _paths import DATA_DIR
+from app.analysis.volatility import VOLATILITY_METHODS, GarchModel, KalmanVolatility
+from app.services import DataService
+
+OUTPUT_FILE = os.path.join(DATA_DIR, 'processed', 'volatility_filter_estimates.csv')
+STATE_FILE = os.path.join(DATA_DIR, 'processed', 'volatility_state.json')
+MODELS = {'garch': GarchModel, 'kalman': KalmanVolatility}
+
+def fit(method, start_date):
+    """Fits the model on all returns from start_date and writes the CSV and state."""
+    series = DataService.get_returns_series(start_date)
+    if method == 'garch':
+        model = GarchModel.fit(series.log_returns)
+        volatility = model.volatility(series.log_returns)
+        print(f"GARCH(1,1): omega={model.omega:.3g}, alpha={model.alpha:.3f}, beta={model.beta:.3f}")
+    else:
+        model = KalmanVolatility()
+        volatility = model.fit(series.log_returns)
+        print(f"Kalman random-walk log volatility: q={model.q:.3g}")
+    pd.DataFrame({'Date': series.dates, 'Volatility': volatility}).to_csv(OUTPUT_FILE, index=False)
+    save_state(method, model, series.dates[-1])
+    print(f"Volatility for {len(volatility)} days saved to {OUTPUT_FILE}")
+
+def update(start_date):
+    """Filters days added since the last run with the saved model."""
+    if not os.path.exists(STATE_FILE):
+        print(f"No saved model at {STATE_FILE}; run without --update first.")
+        return
+    with open(STATE_FILE) as f:
+        saved = json.load(f)
+    model = MODELS[saved['method']].from_state(saved['state'])
+    series = DataService.get_returns_series(start_date)
+    new = series.dates > pd.Timestamp(saved['last_date']).to_datetime64().astype('datetime64[D]')
+    if not new.any():
+        print("Volatility estimates are up to date.")
+        return
+    volatility = model.update(series.log_returns[new])
+    rows = pd.DataFrame({'Date': series.dates[new], 'Volatility': volatility})
+    rows.to_csv(OUTPUT_FILE, mode='a', header=False, index=False)
+    save_state(saved['method'], model, series.dates[-1])
+    print(f"Appended {len(rows)} days to {OUTPUT_FILE}")
+
+def save_state(method, model, last_date):
+    with open(STATE_FILE, 'w') as f:
+        json.dump({'method': method, 'last_date': str(last_date), 'state': model.to_state()}, f, indent=2)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estimate daily volatility of Brent log returns.")
+    parser.add_argument('--method', choices=VOLATILITY_METHODS, default='kalman',
+                        help="'kalman' smooths the random-walk log volatility (closest to the notebook model); "
+                             "'garch' fits GARCH(1,1)")
+    parser.add_argument('--start-date', default='2012-01-01', help="First date of the modeled returns")
+    parser.add_argument('--update', action='store_true', help="Filter only new days with the saved model")
+    args = parser.parse_args()
+    if args.update:
+        update(args.start_date)
+    else:
+        fit(args.method, args.start_date)